@@ -11,11 +11,11 @@ Protocols for supporting classes in pathlib.
 
 
 from abc import ABC, abstractmethod
-from pathlib_abc._glob import _GlobberBase
+from errno import EBADF, EINVAL, EOPNOTSUPP, ETXTBSY, EXDEV
+from io import TextIOWrapper
 from pathlib_abc._os import (
-    copyfileobj, ensure_different_files,
+    _ficlone, _open_atomic_writer, copy_info, copyfileobj, ensure_different_files,
     ensure_distinct_paths, vfsopen, vfspath)
-from typing import Optional, Protocol, runtime_checkable
 try:
     from io import text_encoding
 except ImportError:
@@ -23,7 +23,51 @@ except ImportError:
         return encoding
 
 
-__all__ = ['PathParser', 'PathInfo', 'JoinablePath', 'ReadablePath', 'WritablePath', 'vfsopen', 'vfspath']
+__all__ = ['PathParser', 'PathInfo', 'JoinablePath', 'ReadablePath', 'WritablePath', 'vfsopen', 'vfspath',
+           'pattern_cache_info', 'set_pattern_cache_size', 'warm_pattern_cache', 'compile_pattern_set',
+           'save_pattern_cache', 'load_pattern_cache', 'InternedPath', 'PathTrie', 'MemoryPath', 'ZipPath',
+           'TarPath', 'OverlayPath', 'CopyProgress', 'RateLimiter', 'read_many']
+
+
+# These names are imported on first access. Importing the 'typing' and 're'
+# modules (needed by the protocols and the globbing machinery respectively)
+# takes far longer than everything else here, and many users need only the
+# lexical operations of JoinablePath.
+_lazy_names = {
+    'CopyProgress': ('pathlib_abc._progress', 'CopyProgress'),
+    'InternedPath': ('pathlib_abc._interned', 'InternedPath'),
+    'MemoryPath': ('pathlib_abc._memory', 'MemoryPath'),
+    'OverlayPath': ('pathlib_abc._overlay', 'OverlayPath'),
+    'PathParser': ('pathlib_abc._protocols', 'PathParser'),
+    'PathTrie': ('pathlib_abc._trie', 'PathTrie'),
+    'RateLimiter': ('pathlib_abc._throttle', 'RateLimiter'),
+    'TarPath': ('pathlib_abc._tar', 'TarPath'),
+    'ZipPath': ('pathlib_abc._zip', 'ZipPath'),
+    'PathInfo': ('pathlib_abc._protocols', 'PathInfo'),
+    'compile_pattern_set': ('pathlib_abc._glob', 'compile_pattern_set'),
+    'load_pattern_cache': ('pathlib_abc._glob', 'load_pattern_cache'),
+    'pattern_cache_info': ('pathlib_abc._glob', 'pattern_cache_info'),
+    'read_many': ('pathlib_abc._bulk', 'read_many'),
+    'save_pattern_cache': ('pathlib_abc._glob', 'save_pattern_cache'),
+    'set_pattern_cache_size': ('pathlib_abc._glob', 'set_pattern_cache_size'),
+    'warm_pattern_cache': ('pathlib_abc._glob', 'warm_pattern_cache'),
+    '_PathParser': ('pathlib_abc._protocols', 'PathParser'),  # For tests.
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr_name = _lazy_names[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    from importlib import import_module
+    value = getattr(import_module(module_name), attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
 
 
 def _explode_path(path, split):
@@ -41,52 +85,6 @@ def _explode_path(path, split):
     return path, names
 
 
-@runtime_checkable
-class PathParser(Protocol):
-    """Protocol for path parsers, which do low-level path manipulation.
-
-    Path parsers provide a subset of the os.path API, specifically those
-    functions needed to provide JoinablePath functionality. Each JoinablePath
-    subclass references its path parser via a 'parser' class attribute.
-    """
-
-    sep: str
-    altsep: Optional[str]
-    def split(self, path: str) -> tuple[str, str]: ...
-    def splitext(self, path: str) -> tuple[str, str]: ...
-    def normcase(self, path: str) -> str: ...
-
-
-@runtime_checkable
-class PathInfo(Protocol):
-    """Protocol for path info objects, which support querying the file type.
-    Methods may return cached results.
-    """
-    def exists(self, *, follow_symlinks: bool = True) -> bool: ...
-    def is_dir(self, *, follow_symlinks: bool = True) -> bool: ...
-    def is_file(self, *, follow_symlinks: bool = True) -> bool: ...
-    def is_symlink(self) -> bool: ...
-
-
-class _PathGlobber(_GlobberBase):
-    """Provides shell-style pattern matching and globbing for ReadablePath.
-    """
-
-    @staticmethod
-    def lexists(path):
-        return path.info.exists(follow_symlinks=False)
-
-    @staticmethod
-    def scandir(path):
-        return ((child.info, child.name, child) for child in path.iterdir())
-
-    @staticmethod
-    def concat_path(path, text):
-        return path.with_segments(vfspath(path) + text)
-
-    stringify_path = staticmethod(vfspath)
-
-
 class JoinablePath(ABC):
     """Abstract base class for pure path objects.
 
@@ -246,6 +244,8 @@ class JoinablePath(ABC):
         Return True if this path matches the given glob-style pattern. The
         pattern is matched against the entire path.
         """
+        from pathlib_abc._glob import _PathGlobber
+
         case_sensitive = self.parser.normcase('Aa') == 'Aa'
         globber = _PathGlobber(self.parser.sep, case_sensitive, recursive=True)
         match = globber.compile(pattern, altsep=self.parser.altsep)
@@ -278,12 +278,23 @@ class ReadablePath(JoinablePath):
         """
         raise NotImplementedError
 
-    def read_bytes(self):
+    def read_bytes(self, *, limiter=None):
         """
         Open the file in bytes mode, read it, and close the file.
+
+        If *limiter* is given, it's a RateLimiter that the file is read
+        through in chunks. One operation is acquired for the file.
         """
+        if limiter is not None:
+            limiter.acquire()
         with vfsopen(self, mode='rb') as f:
-            return f.read()
+            if limiter is None:
+                return f.read()
+            chunks = []
+            while chunk := f.read(1024 * 1024):
+                limiter.acquire(len(chunk), ops=0)
+                chunks.append(chunk)
+            return b''.join(chunks)
 
     def read_text(self, encoding=None, errors=None, newline=None):
         """
@@ -295,6 +306,29 @@ class ReadablePath(JoinablePath):
         with vfsopen(self, mode='r', encoding=encoding, errors=errors, newline=newline) as f:
             return f.read()
 
+    def iter_text(self, encoding=None, errors=None, newline=None, *,
+                  chunk_chars=1024 * 1024):
+        """
+        Open the file in text mode and yield its content in strings of up to
+        *chunk_chars* characters, decoding it incrementally.
+        """
+        # Call io.text_encoding() here, rather than in the generator, to
+        # ensure any warning is raised at an appropriate stack level.
+        encoding = text_encoding(encoding)
+        if chunk_chars <= 0:
+            raise ValueError(f"chunk_chars must be positive: {chunk_chars!r}")
+        return _iter_text(self, encoding, errors, newline, chunk_chars)
+
+    def iter_lines(self, encoding=None, errors=None, newline=None):
+        """
+        Open the file in text mode and yield its lines, including line
+        endings, decoding it incrementally.
+        """
+        # Call io.text_encoding() here, rather than in the generator, to
+        # ensure any warning is raised at an appropriate stack level.
+        encoding = text_encoding(encoding)
+        return _iter_lines(self, encoding, errors, newline)
+
     @abstractmethod
     def iterdir(self):
         """Yield path objects of the directory contents.
@@ -304,9 +338,17 @@ class ReadablePath(JoinablePath):
         """
         raise NotImplementedError
 
-    def glob(self, pattern, *, recurse_symlinks=True):
+    def glob(self, pattern, *, recurse_symlinks=True, max_open_dirs=None,
+             sort=False):
         """Iterate over this subtree and yield all existing files (of any
         kind, including directories) matching the given relative pattern.
+
+        If *max_open_dirs* is given, directories are scanned lazily and at
+        most this many directory iterators are held open at once, which
+        keeps memory bounded when globbing very wide directories.
+
+        If *sort* is true, each directory's children are sorted by name as
+        it's scanned, and results are yielded in a deterministic order.
         """
         anchor, parts = _explode_path(pattern, self.parser.split)
         if anchor:
@@ -315,13 +357,24 @@ class ReadablePath(JoinablePath):
             raise ValueError(f"Unacceptable pattern: {pattern!r}")
         elif not recurse_symlinks:
             raise NotImplementedError("recurse_symlinks=False is unsupported")
+        from pathlib_abc._glob import _PathGlobber
+
         case_sensitive = self.parser.normcase('Aa') == 'Aa'
-        globber = _PathGlobber(self.parser.sep, case_sensitive, recursive=True)
+        globber = _PathGlobber(self.parser.sep, case_sensitive, recursive=True,
+                               max_open_dirs=max_open_dirs, sort=sort)
         select = globber.selector(parts)
         return select(self.joinpath(''))
 
-    def walk(self, top_down=True, on_error=None, follow_symlinks=False):
-        """Walk the directory tree from this directory, similar to os.walk()."""
+    def walk(self, top_down=True, on_error=None, follow_symlinks=False, *,
+             sort=False, limiter=None):
+        """Walk the directory tree from this directory, similar to os.walk().
+
+        If *sort* is true, directory and file names are sorted, and
+        subdirectories are visited in that order.
+
+        If *limiter* is given, it's a RateLimiter from which one operation is
+        acquired before each directory is listed.
+        """
         paths = [self]
         while paths:
             path = paths.pop()
@@ -333,6 +386,8 @@ class ReadablePath(JoinablePath):
             if not top_down:
                 paths.append((path, dirnames, filenames))
             try:
+                if limiter is not None:
+                    limiter.acquire()
                 for child in path.iterdir():
                     if child.info.is_dir(follow_symlinks=follow_symlinks):
                         if not top_down:
@@ -347,6 +402,11 @@ class ReadablePath(JoinablePath):
                     while not isinstance(paths.pop(), tuple):
                         pass
                 continue
+            if sort:
+                dirnames.sort()
+                filenames.sort()
+                if not top_down and dirnames:
+                    paths[-len(dirnames):] = [path.joinpath(d) for d in reversed(dirnames)]
             if top_down:
                 yield path, dirnames, filenames
                 paths += [path.joinpath(d) for d in reversed(dirnames)]
@@ -366,6 +426,15 @@ class ReadablePath(JoinablePath):
         target._copy_from(self, **kwargs)
         return target.joinpath()  # Empty join to ensure fresh metadata.
 
+    def sync(self, target, **kwargs):
+        """
+        Recursively update the given destination to match this file or
+        directory tree, copying only new and changed files. Return a named
+        tuple with the numbers of paths copied, skipped and deleted.
+        """
+        ensure_distinct_paths(self, target)
+        return target._sync_from(self, **kwargs)
+
     def copy_into(self, target_dir, **kwargs):
         """
         Copy this file or directory tree into the given existing directory.
@@ -408,18 +477,29 @@ class WritablePath(JoinablePath):
         """
         raise NotImplementedError
 
-    def write_bytes(self, data):
+    def write_bytes(self, data, *, atomic=False):
         """
         Open the file in bytes mode, write to it, and close the file.
+
+        If *atomic* is true, the data is written to a temporary file that
+        then replaces this file, so that readers never see partial data.
         """
         # type-check for the buffer interface before truncating the file
         view = memoryview(data)
-        with vfsopen(self, mode='wb') as f:
+        if atomic:
+            f = _open_atomic_writer(self)
+        else:
+            f = vfsopen(self, mode='wb')
+        with f:
             return f.write(view)
 
-    def write_text(self, data, encoding=None, errors=None, newline=None):
+    def write_text(self, data, encoding=None, errors=None, newline=None, *,
+                   atomic=False):
         """
         Open the file in text mode, write to it, and close the file.
+
+        If *atomic* is true, the data is written to a temporary file that
+        then replaces this file, so that readers never see partial data.
         """
         # Call io.text_encoding() here to ensure any warning is raised at an
         # appropriate stack level.
@@ -427,32 +507,361 @@ class WritablePath(JoinablePath):
         if not isinstance(data, str):
             raise TypeError('data must be str, not %s' %
                             data.__class__.__name__)
-        with vfsopen(self, mode='w', encoding=encoding, errors=errors, newline=newline) as f:
-            return f.write(data)
-
-    def _copy_from(self, source, follow_symlinks=True):
+        if not atomic:
+            with vfsopen(self, mode='w', encoding=encoding, errors=errors, newline=newline) as f:
+                return f.write(data)
+        with _open_atomic_writer(self) as f:
+            # The wrapper is detached rather than closed, so that the atomic
+            # writer sees any exception and discards the data.
+            text_f = TextIOWrapper(f, encoding, errors, newline)
+            result = text_f.write(data)
+            text_f.flush()
+            text_f.detach()
+            return result
+
+    def _copy_from(self, source, follow_symlinks=True, *, max_workers=None,
+                   dedup=None, dedup_link='reflink', journal=None, verify='size',
+                   progress=None, limiter=None, preserve_metadata=False,
+                   preserve_hardlinks=False):
         """
         Recursively copy the given path to this path.
-        """
-        stack = [(source, self)]
-        while stack:
-            src, dst = stack.pop()
-            if not follow_symlinks and src.info.is_symlink():
-                dst.symlink_to(vfspath(src.readlink()), src.info.is_dir())
-            elif src.info.is_dir():
-                children = src.iterdir()
-                dst.mkdir()
-                for child in children:
-                    stack.append((child, dst.joinpath(child.name)))
-            else:
-                ensure_different_files(src, dst)
-                with vfsopen(src, 'rb') as source_f:
-                    with vfsopen(dst, 'wb') as target_f:
-                        copyfileobj(source_f, target_f)
+
+        If *preserve_hardlinks* is true, source files that share a file ID
+        are copied once, and the other paths are made hard links to the
+        copy. Targets that can't be hard-linked are copied instead.
+
+        If *preserve_metadata* is true, times, extended attributes and
+        permissions are copied from the source's info to local targets.
+        Regular files are updated through their open file descriptors, and
+        directories once their contents have been copied.
+
+        If *max_workers* is given, regular files are copied concurrently in
+        a pool of this many threads. Directories are still created in order
+        by the calling thread.
+
+        If *dedup* is given, it's a mutable mapping from the SHA-256 digests
+        of files' contents to the paths they were copied to. Files whose
+        content was copied before are reflinked or hard-linked to the earlier
+        copy, as chosen by *dedup_link* ('reflink', 'hardlink' or None), or
+        skipped if the earlier copy is at the same path. The mapping is
+        updated with the files that are copied.
+
+        If *journal* is given, it's the local path of a journal file that
+        records the progress of the copy. If the copy is interrupted, running
+        it again with the same journal skips the directories and files that
+        were copied, after checking that files are unchanged (by *verify*:
+        'size' or 'checksum'), and resumes partially copied large files. The
+        journal is removed when the copy completes.
+
+        If *progress* is given, it's a CopyProgress object, or a callback
+        that's wrapped in one. It's notified as files are started and
+        finished and as bytes are copied, and calls its callback at a
+        limited rate.
+
+        If *limiter* is given, it's a RateLimiter from which byte tokens are
+        acquired for each chunk of data copied, and one operation for each
+        file copied, directory listed and path created.
+        """
+        if journal is not None:
+            if dedup is not None:
+                raise ValueError("journal and dedup can't be used together")
+            from pathlib_abc._journal import CopyJournal
+            journal = CopyJournal(journal, verify)
+            copy_file = journal.copy_file
+        elif dedup is None:
+            copy_file = _copy_file
+        elif dedup_link in ('reflink', 'hardlink', None):
+            def copy_file(source, target, progress=None, limiter=None,
+                          preserve_metadata=False):
+                _copy_file_dedup(source, target, dedup, dedup_link, progress,
+                                 limiter, preserve_metadata)
+        else:
+            raise ValueError(f"invalid dedup_link: {dedup_link!r}")
+        if progress is not None:
+            from pathlib_abc._progress import CopyProgress
+            if not isinstance(progress, CopyProgress):
+                progress = CopyProgress(progress)
+        if progress is not None or limiter is not None or preserve_metadata:
+            copy_file = _bind_copy_file(copy_file, progress, limiter, preserve_metadata)
+        dirs = []
+        hardlinks = {} if preserve_hardlinks else None
+        links = []
+        if max_workers is None:
+            executor = None
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            executor = ThreadPoolExecutor(max_workers)
+            pending = set()
+        completed = False
+        try:
+            stack = [(source, self)]
+            while stack:
+                src, dst = stack.pop()
+                if not follow_symlinks and src.info.is_symlink():
+                    if limiter is not None:
+                        limiter.acquire()
+                    link_target = vfspath(src.readlink())
+                    if journal is None:
+                        dst.symlink_to(link_target, src.info.is_dir())
+                    else:
+                        journal.symlink_to(dst, link_target, src.info.is_dir())
+                    if preserve_metadata:
+                        _copy_info_path(src.info, dst, follow_symlinks=False)
+                elif src.info.is_dir():
+                    if limiter is not None:
+                        limiter.acquire(ops=2)
+                    children = src.iterdir()
+                    if journal is None:
+                        dst.mkdir()
+                    else:
+                        journal.mkdir(dst)
+                    for child in children:
+                        stack.append((child, dst.joinpath(child.name)))
+                    if preserve_metadata:
+                        dirs.append((src.info, dst))
+                else:
+                    if hardlinks is not None:
+                        file_id = _hardlink_id(src.info)
+                        if file_id is not None:
+                            first = hardlinks.setdefault(file_id, dst)
+                            if first is not dst:
+                                # Linked once the first copy is complete.
+                                links.append((first, src, dst))
+                                continue
+                    if executor is None:
+                        copy_file(src, dst)
+                    else:
+                        # Limit the number of queued copies, so that walking
+                        # a large tree doesn't outpace the workers.
+                        if len(pending) >= 2 * max_workers:
+                            pending = _wait_futures(pending, all_completed=False)
+                        pending.add(executor.submit(copy_file, src, dst))
+            if executor is not None:
+                _wait_futures(pending, all_completed=True)
+            for first, src, dst in links:
+                if limiter is not None:
+                    limiter.acquire()
+                if _link_file(first, dst, 'hardlink'):
+                    if progress is not None:
+                        progress.update(0, 'hardlink')
+                else:
+                    copy_file(src, dst)
+            # Directories are updated after their contents, and children
+            # before their parents, so that their times stick.
+            for info, dst in reversed(dirs):
+                _copy_info_path(info, dst)
+            completed = True
+            if progress is not None:
+                progress.finish()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if journal is not None:
+                journal.close(remove=completed)
+
+    def _sync_from(self, source, follow_symlinks=True, *, delete=False, checksum=False):
+        """
+        Recursively update this path to match the given path, copying only
+        new and changed files.
+
+        Files are compared by size and modification time: a target file is
+        up to date if it's the same size as the source file and was modified
+        at the same time, give or take a second. Copied files are given the
+        source file's metadata, where supported, and changed target files are
+        replaced rather than rewritten. If *checksum* is true, files of the
+        same size are compared by content instead. If *delete* is true,
+        target paths that don't exist in the source are deleted.
+        """
+        from pathlib_abc._sync import sync
+        return sync(source, self, follow_symlinks, delete, checksum)
+
+
+def _iter_text(path, encoding, errors, newline, chunk_chars):
+    """Yield the content of the given file in strings of up to the given
+    number of characters."""
+    with vfsopen(path, mode='r', encoding=encoding, errors=errors, newline=newline) as f:
+        while chunk := f.read(chunk_chars):
+            yield chunk
+
+
+def _iter_lines(path, encoding, errors, newline):
+    """Yield the lines of the given file."""
+    with vfsopen(path, mode='r', encoding=encoding, errors=errors, newline=newline) as f:
+        yield from f
+
+
+def _copy_file(source, target, progress=None, limiter=None, preserve_metadata=False):
+    """Copy the contents of the given source file to the given target."""
+    ensure_different_files(source, target)
+    with vfsopen(source, 'rb') as source_f:
+        with vfsopen(target, 'wb') as target_f:
+            copyfileobj(source_f, target_f, progress, limiter)
+            if preserve_metadata:
+                _copy_info_file(source.info, target_f)
+
+
+def _copy_info_file(info, target_f):
+    """Copy metadata from the given PathInfo to the given open file, if it
+    has a file descriptor."""
+    try:
+        fd = target_f.fileno()
+    except (AttributeError, OSError, ValueError):
+        return
+    target_f.flush()
+    copy_info(info, fd)
+
+
+def _copy_info_path(info, target, follow_symlinks=True):
+    """Copy metadata from the given PathInfo to the given path, if it's a
+    local path."""
+    if hasattr(target, '__fspath__'):
+        copy_info(info, target.__fspath__(), follow_symlinks)
+
+
+def _hardlink_id(info):
+    """Return the identifier of the given file for matching hard links, or
+    None if it's unknown or the file has no other links."""
+    try:
+        if info._link_count() < 2:
+            return None
+    except AttributeError:
+        pass
+    except (OSError, ValueError):
+        return None
+    try:
+        return info._file_id()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _bind_copy_file(copy_file, progress, limiter, preserve_metadata):
+    """Wrap the given file copy function so that it reports to the given
+    CopyProgress object, is throttled by the given RateLimiter, and
+    preserves metadata if requested."""
+    def bound_copy_file(source, target):
+        if limiter is not None:
+            limiter.acquire()
+        if progress is not None:
+            progress.file_started(source, target)
+        copy_file(source, target, progress, limiter, preserve_metadata)
+        if progress is not None:
+            progress.file_finished(source, target)
+    return bound_copy_file
+
+
+# Size of the buffer used to hash files when copying with deduplication.
+_DEDUP_BUFFER_SIZE = 1024 * 1024
+
+
+def _copy_file_dedup(source, target, dedup, link, progress=None, limiter=None,
+                     preserve_metadata=False):
+    """Copy the contents of the given source file to the given target, unless
+    *dedup* shows that the same content was copied before. The source is
+    read once: its content is hashed as it's written to the target, and the
+    target is then replaced with a link to any earlier copy."""
+    import hashlib
+
+    ensure_different_files(source, target)
+    buf = bytearray(_DEDUP_BUFFER_SIZE)
+    view = memoryview(buf)
+
+    def hash_source(target_f=None):
+        digest = hashlib.sha256()
+        with vfsopen(source, 'rb') as source_f:
+            while size := source_f.readinto(buf):
+                if limiter is not None:
+                    limiter.acquire(size, ops=0)
+                digest.update(view[:size])
+                if target_f is not None:
+                    target_f.write(view[:size])
+                    if progress is not None:
+                        progress.update(size, 'read_write')
+        return digest.hexdigest()
+
+    # An empty join ensures fresh metadata.
+    info = getattr(target.joinpath(), 'info', None)
+    if info is None or info.exists(follow_symlinks=False):
+        # The target may be the earlier copy, which is left alone. This is
+        # checked only if the target may exist, as it reads the source twice.
+        if dedup.get(hash_source()) == target:
+            return
+    with vfsopen(target, 'wb') as target_f:
+        digest = hash_source(target_f)
+        if preserve_metadata:
+            _copy_info_file(source.info, target_f)
+    existing = dedup.setdefault(digest, target)
+    if existing != target and link is not None:
+        if _relink_file(existing, target, link,
+                        source.info if preserve_metadata else None):
+            if progress is not None:
+                progress.update(0, link)
+
+
+def _relink_file(existing, target, link, info=None):
+    """Replace the given target, a copy of an existing file, with a reflink
+    or hard link to it. Return true on success, or false if the paths don't
+    support it or linking fails, in which case the target is left a copy,
+    with metadata from the given PathInfo, if any."""
+    if link == 'hardlink':
+        if not hasattr(target, 'hardlink_to'):
+            return False
+        elif hasattr(target, 'unlink'):
+            target.unlink()
+        elif hasattr(target, '__fspath__'):
+            from os import remove
+            remove(target.__fspath__())
+        else:
+            return False
+    elif not (_ficlone and hasattr(existing, '__fspath__') and hasattr(target, '__fspath__')):
+        return False
+    if _link_file(existing, target, link):
+        return True
+    # The target was removed or truncated, so it's copied again.
+    with vfsopen(existing, 'rb') as existing_f, vfsopen(target, 'wb') as target_f:
+        copyfileobj(existing_f, target_f)
+        if info is not None:
+            _copy_info_file(info, target_f)
+    return False
+
+
+def _link_file(existing, target, link):
+    """Make the given target a reflink or a hard link to an existing file.
+    Return true on success, or false if the paths don't support it."""
+    if link == 'hardlink':
+        hardlink_to = getattr(target, 'hardlink_to', None)
+        if hardlink_to is None:
+            return False
+        try:
+            hardlink_to(existing)
+        except OSError:
+            # The target exists, or is on another filesystem.
+            return False
+        return True
+    elif _ficlone and hasattr(existing, '__fspath__') and hasattr(target, '__fspath__'):
+        with open(existing, 'rb') as existing_f, open(target, 'wb') as target_f:
+            try:
+                _ficlone(existing_f.fileno(), target_f.fileno())
+            except OSError as err:
+                if err.errno not in (EBADF, EINVAL, EOPNOTSUPP, ETXTBSY, EXDEV):
+                    raise
+                return False
+        return True
+    return False
+
+
+def _wait_futures(futures, all_completed):
+    """Wait for the first (or all) of the given futures to complete, raise
+    any exception they raised, and return the set of pending futures."""
+    from concurrent.futures import wait, ALL_COMPLETED, FIRST_COMPLETED
+
+    return_when = ALL_COMPLETED if all_completed else FIRST_COMPLETED
+    done, pending = wait(futures, return_when=return_when)
+    for future in done:
+        future.result()
+    return pending
 
 
 # For tests.
-_PathParser = PathParser
 _JoinablePath = JoinablePath
 _ReadablePath = ReadablePath
 _WritablePath = WritablePath
@@ -0,0 +1,62 @@
+"""
+Concurrent reading of many files, as done by read_many().
+"""
+
+import os
+
+
+def _get_size(path):
+    """Return the size of the given file, or 0 if it's unknown."""
+    try:
+        return path.info._size()
+    except (AttributeError, OSError):
+        return 0
+
+
+def _read(path):
+    return path, path.read_bytes()
+
+
+def read_many(paths, *, max_workers=None, max_bytes=64 * 1024 * 1024):
+    """Read the given files concurrently, and yield (path, data) tuples in
+    the order that the reads complete.
+
+    Files are read in a pool of *max_workers* threads. Reads aren't started
+    while the files being read and not yet yielded total more than
+    *max_bytes* bytes, unless no other reads are in flight; files of unknown
+    size count as empty. Paths whose class has a __read_many__() method are
+    instead passed to it in one list, after the other files are read.
+    """
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    elif max_workers <= 0:
+        raise ValueError(f"max_workers must be positive: {max_workers!r}")
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    batches = {}
+    executor = ThreadPoolExecutor(max_workers)
+    try:
+        pending = {}
+        in_flight = 0
+        for path in paths:
+            cls = type(path)
+            if hasattr(cls, '__read_many__'):
+                batches.setdefault(cls, []).append(path)
+                continue
+            size = _get_size(path)
+            while pending and (len(pending) >= 2 * max_workers or in_flight + size > max_bytes):
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight -= pending.pop(future)
+                    yield future.result()
+            pending[executor.submit(_read, path)] = size
+            in_flight += size
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    for cls, batch in batches.items():
+        yield from cls.__read_many__(batch)
@@ -1,9 +1,11 @@
 """Filename globbing utility."""
 
+import collections
 import contextlib
 import os
 import re
 from pathlib_abc import _fnmatch as fnmatch
+from pathlib_abc._os import vfspath
 import functools
 import itertools
 import operator
@@ -309,19 +311,320 @@ def _compile_pattern(pat, seps, case_sensitive, recursive=True):
     """Compile given glob pattern to a re.Pattern object (observing case
     sensitivity)."""
     flags = 0 if case_sensitive else re.IGNORECASE
-    regex = translate(pat, recursive=recursive, include_hidden=True, seps=seps)
+    try:
+        regex = _translations[pat, seps, case_sensitive, recursive]
+    except KeyError:
+        regex = translate(pat, recursive=recursive, include_hidden=True, seps=seps)
     return re.compile(regex, flags=flags).match
 
 
+# Regular expressions loaded by load_pattern_cache(), keyed by the arguments
+# to _compile_pattern(). The format number must be incremented whenever the
+# output of translate() changes.
+_translations = {}
+_translations_format = 1
+
+
+_PatternCacheInfo = collections.namedtuple(
+    '_PatternCacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+_pattern_cache_names = ('glob', 'fnmatch', 'escape')
+
+
+def _pattern_cache_location(name):
+    """Return a (module, attribute name) pair locating the named cache."""
+    if name == 'glob':
+        return sys.modules[__name__], '_compile_pattern'
+    elif name == 'fnmatch':
+        return fnmatch, '_compile_pattern'
+    elif name == 'escape':
+        return fnmatch, '_re_escape'
+    raise ValueError(f"Unknown pattern cache: {name!r}")
+
+
+def pattern_cache_info():
+    """Return a dict mapping pattern cache names ('glob', 'fnmatch' and
+    'escape') to named tuples of (hits, misses, evictions, maxsize,
+    currsize). Statistics are reset when a cache is resized.
+    """
+    result = {}
+    for name in _pattern_cache_names:
+        module, attr = _pattern_cache_location(name)
+        info = getattr(module, attr).cache_info()
+        evictions = info.misses - info.currsize
+        result[name] = _PatternCacheInfo(
+            info.hits, info.misses, evictions, info.maxsize, info.currsize)
+    return result
+
+
+def set_pattern_cache_size(name, maxsize):
+    """Set the maximum size of the named pattern cache ('glob', 'fnmatch' or
+    'escape'). If *maxsize* is None, the cache can grow without bound. The
+    cache is emptied.
+    """
+    module, attr = _pattern_cache_location(name)
+    cache = getattr(module, attr)
+    typed = cache.cache_parameters()['typed']
+    setattr(module, attr, functools.lru_cache(maxsize, typed)(cache.__wrapped__))
+
+
+def _pattern_cache_keys(patterns, parser, case_sensitive):
+    """Yield the arguments to _compile_pattern() used when the given patterns
+    are passed to JoinablePath.full_match() and ReadablePath.glob().
+    """
+    from pathlib_abc import _explode_path
+
+    if case_sensitive is None:
+        case_sensitive = parser.normcase('Aa') == 'Aa'
+    keys = []
+
+    class _RecordingGlobber(_StringGlobber):
+        def compile(self, pat, altsep=None):
+            seps = (self.sep, altsep) if altsep else self.sep
+            keys.append((pat, seps, self.case_sensitive, self.recursive))
+
+    globber = _RecordingGlobber(parser.sep, case_sensitive, recursive=True)
+    for pattern in patterns:
+        globber.compile(pattern, altsep=parser.altsep)
+        anchor, parts = _explode_path(pattern, parser.split)
+        if parts and not anchor:
+            # Building a selector compiles its wildcard segments, but doesn't
+            # perform any I/O.
+            globber.selector(parts)
+    return keys
+
+
+def warm_pattern_cache(patterns, parser, case_sensitive=None):
+    """Compile the given glob-style patterns ahead of time, as they would be
+    compiled by JoinablePath.full_match() and ReadablePath.glob() for paths
+    using the given PathParser.
+    """
+    for key in _pattern_cache_keys(patterns, parser, case_sensitive):
+        _compile_pattern(*key)
+
+
+def compile_pattern_set(patterns, parser, case_sensitive=None):
+    """Compile the given glob-style patterns into a function that takes a
+    path object (or string) and returns a sorted list of the indices of the
+    patterns it matches, as JoinablePath.full_match() would match them. The
+    path is matched against all the patterns in a single pass.
+    """
+    if case_sensitive is None:
+        case_sensitive = parser.normcase('Aa') == 'Aa'
+    globber = _StringGlobber(parser.sep, case_sensitive, recursive=True)
+    match_set = globber.compile_set(patterns, altsep=parser.altsep)
+
+    def match(path):
+        if not isinstance(path, str):
+            path = vfspath(path)
+        return match_set(path)
+    return match
+
+
+def save_pattern_cache(file, patterns, parser, case_sensitive=None):
+    """Translate the given glob-style patterns to regular expressions, as
+    warm_pattern_cache() does, and save the results to the given file.
+    """
+    import json
+
+    entries = []
+    for pat, seps, case_sensitive, recursive in _pattern_cache_keys(
+            patterns, parser, case_sensitive):
+        regex = translate(pat, recursive=recursive, include_hidden=True, seps=seps)
+        entries.append([pat, seps, case_sensitive, recursive, regex])
+    data = {
+        'format': _translations_format,
+        'python': list(sys.version_info[:2]),
+        'patterns': entries,
+    }
+    with open(file, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def load_pattern_cache(file):
+    """Load regular expressions saved by save_pattern_cache(), so that the
+    patterns needn't be translated again when they're compiled. Return the
+    number of patterns loaded, which is zero if the file was saved by an
+    incompatible version.
+    """
+    import json
+
+    with open(file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format') != _translations_format:
+        return 0
+    if data.get('python') != list(sys.version_info[:2]):
+        return 0
+    entries = data['patterns']
+    for pat, seps, case_sensitive, recursive, regex in entries:
+        if isinstance(seps, list):
+            seps = tuple(seps)
+        _translations[pat, seps, case_sensitive, recursive] = regex
+    return len(entries)
+
+
+class _PatternTrieNode:
+    """Node in a _PatternSet trie. Each node represents a position between
+    two pattern segments.
+    """
+    __slots__ = ('literals', 'suffixes', 'wildcards', 'recursive', 'loop',
+                 'accepts')
+
+    def __init__(self, loop=False):
+        self.literals = {}  # segment -> node
+        self.suffixes = {}  # length -> {suffix -> node}
+        self.wildcards = []  # [(match, node), ...]
+        self.recursive = None  # node reached via '**'
+        self.loop = loop  # true if this node was reached via '**'
+        self.accepts = []  # indices of patterns ending here
+
+
+class _PatternSet:
+    """Matches paths against many glob-style patterns at once.
+
+    The patterns are compiled into a trie of path segments, which is walked
+    once per path. Literal segments are looked up in dicts, segments like
+    '*.py' are looked up by suffix, and other wildcard segments are matched
+    with a small regex. A '**' segment becomes a node that loops on any
+    segment. Patterns that the trie can't match exactly (those containing
+    '**' or matched case-insensitively) are confirmed with their full regex,
+    but only when the trie reports a candidate match.
+
+    Some patterns can't be split into segments at all, and are always
+    matched with their full regex: those with a negated or ranged character
+    class, which may match a separator, and case-insensitive patterns with
+    non-ASCII characters, whose case folding by the re module differs from
+    str.lower(). For the same reason, paths with non-ASCII characters are
+    matched case-insensitively against every pattern's full regex.
+    """
+
+    def __init__(self, pats, seps, case_sensitive, recursive=True):
+        pats = list(pats)
+        self.case_sensitive = case_sensitive
+        split_seps = (seps,) if isinstance(seps, str) else seps
+        self.split = re.compile('|'.join(map(re.escape, split_seps))).split
+        self.root = _PatternTrieNode()
+        self.confirm = {}  # index -> match function
+        self.fallback = []  # [(index, match function), ...]
+        for idx, pat in enumerate(pats):
+            parts = self.split(pat)
+            if not all(map(self.is_splittable, parts)):
+                match = _compile_pattern(pat, seps, case_sensitive, recursive)
+                self.fallback.append((idx, match))
+                continue
+            node = self.root
+            exact = case_sensitive
+            for part in parts:
+                if recursive and part == '**':
+                    exact = False
+                    if not node.loop:
+                        if node.recursive is None:
+                            node.recursive = _PatternTrieNode(loop=True)
+                        node = node.recursive
+                    continue
+                if not case_sensitive:
+                    part = part.lower()
+                if magic_check.search(part) is None:
+                    node = node.literals.setdefault(part, _PatternTrieNode())
+                elif part[0] == '*' and magic_check.search(part, 1) is None and len(part) > 1:
+                    suffix = part[1:]
+                    children = node.suffixes.setdefault(len(suffix), {})
+                    node = children.setdefault(suffix, _PatternTrieNode())
+                else:
+                    if part == '*':
+                        # Any segment, except an empty segment.
+                        match = len
+                    else:
+                        match = _compile_pattern(part, seps, case_sensitive, False)
+                    for other_part, other_match, child in node.wildcards:
+                        if other_part == part:
+                            node = child
+                            break
+                    else:
+                        child = _PatternTrieNode()
+                        node.wildcards.append((part, match, child))
+                        node = child
+            node.accepts.append(idx)
+            if not exact:
+                self.confirm[idx] = _compile_pattern(pat, seps, case_sensitive, recursive)
+        # Case-insensitive patterns are never exact, so each one has a full
+        # matcher, which is used for non-ASCII paths. They're kept here, as
+        # the pattern cache may be too small to hold them all.
+        if not case_sensitive:
+            matches = dict(self.fallback)
+            matches.update(self.confirm)
+            self.matches = [matches[idx] for idx in range(len(pats))]
+
+    def is_splittable(self, part):
+        """Return true if the given pattern segment can't match a separator,
+        and (if matching case-insensitively) is folded by str.lower() as the
+        re module folds it.
+        """
+        if '[' in part and ('[!' in part or '[^' in part or '-' in part):
+            return False
+        return self.case_sensitive or part.isascii()
+
+    def match(self, path):
+        """Return a sorted list of indices of patterns matching the path.
+        """
+        case_sensitive = self.case_sensitive
+        if not case_sensitive and not path.isascii():
+            return [idx for idx, match in enumerate(self.matches) if match(path)]
+        result = [idx for idx, match in self.fallback if match(path)]
+        states = self.closure([self.root])
+        for part in self.split(path):
+            if not case_sensitive:
+                part = part.lower()
+            next_states = []
+            for node in states:
+                if node.loop:
+                    next_states.append(node)
+                child = node.literals.get(part)
+                if child is not None:
+                    next_states.append(child)
+                for length, children in node.suffixes.items():
+                    child = children.get(part[-length:])
+                    if child is not None:
+                        next_states.append(child)
+                for _part, match, child in node.wildcards:
+                    if match(part):
+                        next_states.append(child)
+            if not next_states:
+                return result
+            states = self.closure(next_states)
+        confirm = self.confirm
+        result.extend(
+            idx
+            for node in states
+            for idx in node.accepts
+            if idx not in confirm or confirm[idx](path))
+        result.sort()
+        return result
+
+    @staticmethod
+    def closure(nodes):
+        """Return the given nodes (without duplicates) plus those reachable
+        by matching '**' against zero segments.
+        """
+        seen = {}
+        for node in nodes:
+            seen[id(node)] = node
+            if node.recursive is not None:
+                seen[id(node.recursive)] = node.recursive
+        return seen.values()
+
+
 class _GlobberBase:
     """Abstract class providing shell-style pattern matching and globbing.
     """
 
-    def __init__(self, sep, case_sensitive, case_pedantic=False, recursive=False):
+    def __init__(self, sep, case_sensitive, case_pedantic=False, recursive=False,
+                 max_open_dirs=None, sort=False):
         self.sep = sep
         self.case_sensitive = case_sensitive
         self.case_pedantic = case_pedantic
         self.recursive = recursive
+        self.max_open_dirs = max_open_dirs
+        self.sort = sort
 
     # Abstract methods
 
@@ -343,6 +646,23 @@ class _GlobberBase:
         """
         raise NotImplementedError
 
+    def iterscandir(self, path):
+        """Like scandir(), but the result may hold the directory open until
+        it's exhausted or closed. Used only when max_open_dirs is set.
+        """
+        return self.scandir(path)
+
+    def scandir_list(self, path):
+        """Like scandir(), but returns a list, so that the directory isn't
+        held open while the entries are processed.
+        """
+        return list(self.scandir(path))
+
+    def scandir_sorted(self, path):
+        """Like scandir(), but returns a list of entries sorted by name.
+        """
+        return sorted(self.scandir(path), key=operator.itemgetter(1))
+
     @staticmethod
     def stringify_path(path):
         """Converts the path to a string object
@@ -355,6 +675,14 @@ class _GlobberBase:
         seps = (self.sep, altsep) if altsep else self.sep
         return _compile_pattern(pat, seps, self.case_sensitive, self.recursive)
 
+    def compile_set(self, pats, altsep=None):
+        """Returns a function that matches a path against all the given
+        patterns in a single pass, and returns a sorted list of the indices
+        of matching patterns.
+        """
+        seps = (self.sep, altsep) if altsep else self.sep
+        return _PatternSet(pats, seps, self.case_sensitive, self.recursive).match
+
     def selector(self, parts):
         """Returns a function that selects from a given path, walking and
         filtering according to the glob-style pattern parts in *parts*.
@@ -413,12 +741,23 @@ class _GlobberBase:
         if dir_only:
             select_next = self.selector(parts)
 
+        # Optimization: stream the final path component's entries rather than
+        # listing the directory up-front. The directory stays open only while
+        # this selector is being consumed, as nothing is nested beneath it.
+        # Other directories are listed up-front, so that they aren't held
+        # open while the selectors nested beneath them run.
+        if self.sort:
+            scandir = self.scandir_sorted
+        elif not self.max_open_dirs:
+            scandir = self.scandir
+        elif dir_only:
+            scandir = self.scandir_list
+        else:
+            scandir = self.iterscandir
+
         def select_wildcard(path, exists=False):
             try:
-                entries = self.scandir(path)
-            except OSError:
-                pass
-            else:
+                entries = scandir(path)
                 for entry, entry_name, entry_path in entries:
                     if match is None or match(entry_name):
                         if dir_only:
@@ -431,6 +770,8 @@ class _GlobberBase:
                             yield from select_next(entry_path, exists=True)
                         else:
                             yield entry_path
+            except OSError:
+                pass
         return select_wildcard
 
     def recursive_selector(self, part, parts):
@@ -461,17 +802,44 @@ class _GlobberBase:
             match_pos = len(path_str)
             if match is None or match(path_str, match_pos):
                 yield from select_next(path, exists)
+            scans = []
             stack = [path]
-            while stack:
-                yield from select_recursive_step(stack, match_pos)
-
-        def select_recursive_step(stack, match_pos):
-            path = stack.pop()
             try:
-                entries = self.scandir(path)
-            except OSError:
-                pass
-            else:
+                while scans or stack:
+                    yield from select_recursive_step(scans, stack, match_pos)
+            finally:
+                for entries in scans:
+                    close = getattr(entries, 'close', None)
+                    if close is not None:
+                        close()
+
+        # When max_open_dirs is set, the walk is depth-first over open
+        # directory iterators, so a wide directory is never materialized in
+        # full. Once the budget of open directories is spent, subdirectories
+        # are pushed onto the stack of pending paths and scanned later.
+        max_open_dirs = self.max_open_dirs or 0
+        scandir = self.iterscandir if max_open_dirs else self.scandir
+        if self.sort:
+            # Each directory is listed and sorted before it's walked, which
+            # releases it immediately, so we can always descend straight away.
+            # This yields results in order, with siblings sorted by name.
+            max_open_dirs = sys.maxsize
+            scandir = self.scandir_sorted
+        elif max_open_dirs and dir_only:
+            # The selectors nested beneath this one may open directories of
+            # their own while the walk is suspended, so each directory is
+            # listed up-front, like in wildcard_selector().
+            max_open_dirs = sys.maxsize
+            scandir = self.scandir_list
+
+        def select_recursive_step(scans, stack, match_pos):
+            if not scans:
+                try:
+                    scans.append(iter(scandir(stack.pop())))
+                except OSError:
+                    return
+            entries = scans[-1]
+            try:
                 for entry, _entry_name, entry_path in entries:
                     is_dir = False
                     try:
@@ -492,7 +860,20 @@ class _GlobberBase:
                                 # last pattern part.
                                 yield entry_path
                         if is_dir:
+                            if len(scans) < max_open_dirs:
+                                try:
+                                    scans.append(iter(scandir(entry_path)))
+                                except OSError:
+                                    continue
+                                # Descend now; this directory is resumed later.
+                                return
                             stack.append(entry_path)
+            except OSError:
+                pass
+            scans.pop()
+            close = getattr(entries, 'close', None)
+            if close is not None:
+                close()
 
         return select_recursive
 
@@ -524,3 +905,35 @@ class _StringGlobber(_GlobberBase):
     @staticmethod
     def stringify_path(path):
         return path  # Already a string.
+
+
+class _PathGlobber(_GlobberBase):
+    """Provides shell-style pattern matching and globbing for ReadablePath.
+    """
+
+    @staticmethod
+    def lexists(path):
+        return path.info.exists(follow_symlinks=False)
+
+    @staticmethod
+    def scandir(path):
+        return ((child.info, child.name, child) for child in path.iterdir())
+
+    @staticmethod
+    def iterscandir(path):
+        # Close the directory iterator as soon as this generator is closed,
+        # rather than when it's garbage collected.
+        children = path.iterdir()
+        try:
+            for child in children:
+                yield child.info, child.name, child
+        finally:
+            close = getattr(children, 'close', None)
+            if close is not None:
+                close()
+
+    @staticmethod
+    def concat_path(path, text):
+        return path.with_segments(vfspath(path) + text)
+
+    stringify_path = staticmethod(vfspath)
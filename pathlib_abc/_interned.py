@@ -0,0 +1,87 @@
+"""
+Compact JoinablePath implementation for large collections of paths.
+"""
+
+import posixpath
+import sys
+
+from pathlib_abc import JoinablePath
+
+
+class InternedPath(JoinablePath):
+    """A pure path object that stores its path as a single interned string.
+
+    The string is built once when the path is constructed. Its hash and the
+    offsets of the parent and name within it are computed at the same time,
+    so vfspath(), hashing, equality, and the *name* and *parent* attributes
+    don't need to re-parse the path. Because the strings are interned, equal
+    paths (and the parents of sibling paths) share a single string object.
+
+    The default parser is posixpath; subclasses may set *parser* to use a
+    different flavour.
+    """
+    __slots__ = ('_str', '_hash', '_head', '_tail')
+    parser = posixpath
+
+    def __init__(self, *pathsegments):
+        if pathsegments:
+            path = sys.intern(self.parser.join(*pathsegments))
+        else:
+            path = ''
+        head, tail = self.parser.split(path)
+        self._str = path
+        self._hash = hash(path)
+        if path.startswith(head) and path.endswith(tail):
+            self._head = len(head)
+            self._tail = len(path) - len(tail)
+        else:
+            # The parser doesn't split paths into a prefix and a suffix.
+            self._head = self._tail = -1
+
+    def __reduce__(self):
+        return type(self), (self._str,)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, InternedPath):
+            return NotImplemented
+        return self._str == other._str and self.parser is other.parser
+
+    def __vfspath__(self):
+        return self._str
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self._str!r})'
+
+    def with_segments(self, *pathsegments):
+        return type(self)(*pathsegments)
+
+    @property
+    def name(self):
+        """The final path component, if any."""
+        if self._tail < 0:
+            return super().name
+        return self._str[self._tail:]
+
+    @property
+    def parent(self):
+        """The logical parent of the path."""
+        if self._head < 0:
+            return super().parent
+        elif self._head == len(self._str):
+            return self
+        return self.with_segments(self._str[:self._head])
+
+    @property
+    def parents(self):
+        """A sequence of this path's logical parents."""
+        parents = []
+        path = self
+        parent = path.parent
+        while parent is not path:
+            parents.append(parent)
+            path = parent
+            parent = path.parent
+        return tuple(parents)
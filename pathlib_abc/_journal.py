@@ -0,0 +1,193 @@
+"""
+Journal of a resumable copy, as done by ReadablePath.copy(journal=...).
+"""
+
+import json
+import os
+import threading
+
+from pathlib_abc import _copy_file, _copy_info_file
+from pathlib_abc._os import ensure_different_files, vfsopen, vfspath
+
+
+# Number of bytes copied between progress records for a file. Files smaller
+# than this are copied in one go, without progress records.
+_progress_interval = 64 * 1024 * 1024
+_chunk_size = 1024 * 1024
+
+
+def _get_size(path):
+    """Return the size of the given file, or None if it's unknown."""
+    try:
+        return path.info._size()
+    except (AttributeError, OSError):
+        return None
+
+
+class CopyJournal:
+    """Journal file recording the progress of a copy, so that an interrupted
+    copy can be resumed.
+
+    Each line of the file is a JSON array: ["dir", path] and
+    ["symlink", path] record created directories and symlinks, ["file",
+    path, size] records a copied file, and ["part", path, offset] records
+    that the first *offset* bytes of a file were copied. Paths are target
+    paths. A truncated last line, as left by a crash, is ignored.
+    """
+
+    def __init__(self, path, verify='size'):
+        if verify not in ('size', 'checksum'):
+            raise ValueError(f"invalid verify: {verify!r}")
+        self.path = path
+        self.verify = verify
+        self.created = set()
+        self.files = {}
+        self.parts = {}
+        self.lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            try:
+                kind, key, *args = json.loads(line)
+            except ValueError:
+                continue
+            if kind == 'file':
+                self.files[key] = args[0]
+                self.parts.pop(key, None)
+            elif kind == 'part':
+                self.parts[key] = args[0]
+            else:
+                self.created.add(key)
+        self.file = open(path, 'a', encoding='utf-8')
+        if lines and not lines[-1].endswith('\n'):
+            # End the truncated last line, so that it doesn't swallow the
+            # next entry.
+            self.file.write('\n')
+            self.file.flush()
+
+    def close(self, remove=False):
+        """Close the journal file, and remove it if *remove* is true."""
+        self.file.close()
+        if remove:
+            os.remove(self.path)
+
+    def record(self, *entry):
+        """Append an entry to the journal."""
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+
+    def mkdir(self, target):
+        """Create the given directory, unless it was created before."""
+        key = vfspath(target)
+        if key in self.created:
+            return
+        try:
+            target.mkdir()
+        except FileExistsError:
+            # The directory may have been created before it was recorded.
+            info = getattr(target, 'info', None)
+            if info is None or not info.is_dir(follow_symlinks=False):
+                raise
+        self.record('dir', key)
+
+    def symlink_to(self, target, link_target, target_is_directory):
+        """Create the given symlink, unless it was created before."""
+        key = vfspath(target)
+        if key in self.created:
+            return
+        try:
+            target.symlink_to(link_target, target_is_directory)
+        except FileExistsError:
+            info = getattr(target, 'info', None)
+            if info is None or not info.is_symlink():
+                raise
+        self.record('symlink', key)
+
+    def _is_copied(self, source, target, size):
+        """Return true if the given target was completely copied from the
+        given source, which had the given size."""
+        if self.verify == 'checksum':
+            from pathlib_abc._sync import _digest
+            try:
+                return _digest(source) == _digest(target)
+            except OSError:
+                return False
+        source_size = _get_size(source)
+        target_size = _get_size(target)
+        return (source_size is None or source_size == size) and \
+               (target_size is None or target_size == size)
+
+    def _open_resumed(self, target, offset):
+        """Open the given partially-copied target for writing at the given
+        offset, or return None if it can't be resumed."""
+        try:
+            target_f = vfsopen(target, 'r+b')
+        except (TypeError, OSError):
+            pass
+        else:
+            try:
+                target_f.seek(offset)
+                target_f.truncate()
+            except BaseException:
+                target_f.close()
+                raise
+            return target_f
+        # Appending is only safe if nothing was written after the offset.
+        if _get_size(target) != offset:
+            return None
+        try:
+            return vfsopen(target, 'ab')
+        except (TypeError, OSError):
+            return None
+
+    def copy_file(self, source, target, progress=None, limiter=None,
+                  preserve_metadata=False):
+        """Copy the given source file to the given target, skipping or
+        resuming it if it was copied before."""
+        key = vfspath(target)
+        size = self.files.get(key)
+        if size is not None and self._is_copied(source, target, size):
+            return
+        offset = self.parts.get(key, 0)
+        source_size = _get_size(source)
+        if not offset and source_size is not None and source_size < _progress_interval:
+            _copy_file(source, target, progress, limiter, preserve_metadata)
+            self.record('file', key, source_size)
+            return
+        ensure_different_files(source, target)
+        with vfsopen(source, 'rb') as source_f:
+            target_f = None
+            if offset:
+                target_f = self._open_resumed(target, offset)
+            if target_f is None:
+                offset = 0
+                target_f = vfsopen(target, 'wb')
+            with target_f:
+                if offset:
+                    try:
+                        source_f.seek(offset)
+                    except (AttributeError, OSError):
+                        # Skip over the copied data.
+                        remaining = offset
+                        while remaining and (buf := source_f.read(min(remaining, _chunk_size))):
+                            remaining -= len(buf)
+                next_record = offset + _progress_interval
+                while buf := source_f.read(_chunk_size):
+                    if limiter is not None:
+                        limiter.acquire(len(buf), ops=0)
+                    target_f.write(buf)
+                    offset += len(buf)
+                    if progress is not None:
+                        progress.update(len(buf), 'read_write')
+                    if offset >= next_record:
+                        target_f.flush()
+                        self.record('part', key, offset)
+                        next_record = offset + _progress_interval
+                if preserve_metadata:
+                    _copy_info_file(source.info, target_f)
+        self.record('file', key, offset)
@@ -0,0 +1,384 @@
+"""
+In-memory implementation of ReadablePath and WritablePath.
+"""
+
+import errno
+import functools
+import io
+import threading
+
+from pathlib_abc import ReadablePath, WritablePath
+from pathlib_abc._interned import InternedPath
+from pathlib_abc._os import vfspath
+from pathlib_abc._resolve import resolve_path
+
+
+class _MemoryDir(dict):
+    """A directory, mapping names to entries. Entries are _MemoryDir objects
+    for directories, bytes objects for regular files, and str objects (the
+    link target) for symlinks.
+
+    The *owner* is the token of the filesystem that may modify the directory
+    in place. Other filesystems sharing the directory copy it first.
+    """
+    __slots__ = ('owner',)
+
+    def __init__(self, entries=(), owner=None):
+        super().__init__(entries)
+        self.owner = owner
+
+
+def _lookup(chain, name):
+    return chain[-1][1].get(name)
+
+
+def _is_dir(entry):
+    return isinstance(entry, _MemoryDir)
+
+
+def _readlink(entry):
+    return entry if isinstance(entry, str) else None
+
+
+class _MemoryFileSystem:
+    """A tree of _MemoryDir objects. Directories are shared between a
+    filesystem and its snapshots, and copied on first write. Modifications
+    are made while holding the lock.
+    """
+    __slots__ = ('root', 'token', 'lock')
+
+    def __init__(self, root=None):
+        self.token = object()
+        self.lock = threading.Lock()
+        if root is None:
+            root = _MemoryDir(owner=self.token)
+        self.root = root
+
+    def __reduce__(self):
+        return type(self), (self.root,)
+
+    def snapshot(self):
+        """Return a new filesystem that shares this filesystem's entries.
+        Neither filesystem owns the shared directories afterwards, so both
+        copy them on write."""
+        with self.lock:
+            self.token = object()
+            return _MemoryFileSystem(self.root)
+
+    def lookup(self, path, follow_symlinks=True):
+        """Resolve the given path string. Return a (chain, name) tuple, where
+        *chain* is a list of (name, directory) pairs from the root to the
+        directory containing the entry, and *name* is the entry's name in
+        that directory, or None if the path resolves to the last directory
+        in the chain. Return (None, None) if a parent isn't a directory or
+        too many symlinks are encountered."""
+        chain, name, _ = resolve_path(path, self.root, _lookup, _is_dir, _readlink,
+                                      follow_symlinks)
+        return chain, name
+
+    def get(self, path, follow_symlinks=True):
+        """Return the entry at the given path, or None."""
+        return resolve_path(path, self.root, _lookup, _is_dir, _readlink,
+                            follow_symlinks)[2]
+
+    def mutable_dir(self, chain):
+        """Return the last directory in the chain, copying any directories
+        owned by other filesystems along the way."""
+        token = self.token
+        parent = None
+        for name, directory in chain:
+            if directory.owner is not token:
+                directory = _MemoryDir(directory, token)
+                if parent is None:
+                    self.root = directory
+                else:
+                    parent[name] = directory
+            parent = directory
+        return parent
+
+
+class _MemoryPathInfo:
+    """Implementation of pathlib_abc.PathInfo for in-memory paths."""
+    __slots__ = ('_fs', '_path', '_entry', '_lentry')
+
+    def __init__(self, fs, path):
+        self._fs = fs
+        self._path = path
+
+    def __repr__(self):
+        return "<MemoryPath.info>"
+
+    def _get(self, follow_symlinks=True):
+        if follow_symlinks:
+            try:
+                return self._entry
+            except AttributeError:
+                self._entry = self._fs.get(self._path)
+                return self._entry
+        else:
+            try:
+                return self._lentry
+            except AttributeError:
+                self._lentry = self._fs.get(self._path, follow_symlinks=False)
+                return self._lentry
+
+    def exists(self, *, follow_symlinks=True):
+        """Whether this path exists."""
+        return self._get(follow_symlinks) is not None
+
+    def is_dir(self, *, follow_symlinks=True):
+        """Whether this path is a directory."""
+        return isinstance(self._get(follow_symlinks), _MemoryDir)
+
+    def is_file(self, *, follow_symlinks=True):
+        """Whether this path is a regular file."""
+        return isinstance(self._get(follow_symlinks), bytes)
+
+    def is_symlink(self):
+        """Whether this path is a symbolic link."""
+        return isinstance(self._get(follow_symlinks=False), str)
+
+    def _size(self, *, follow_symlinks=True):
+        """Return the size in bytes."""
+        entry = self._get(follow_symlinks)
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", self._path)
+        elif isinstance(entry, _MemoryDir):
+            return 0
+        return len(entry)
+
+
+class _MemoryWriter(io.BytesIO):
+    """Binary file object that stores its content in the filesystem when
+    it's closed."""
+
+    def __init__(self, path, initial_bytes=b''):
+        super().__init__(initial_bytes)
+        self._path = path
+
+    def close(self):
+        if not self.closed:
+            data = self.getvalue()
+            super().close()
+            self._path._store(data)
+        else:
+            super().close()
+
+
+class _MemoryAtomicWriter(_MemoryWriter):
+    """Binary file object that stores its content in the filesystem when
+    it's closed, unless it's closed by an exception in a 'with' block, or
+    by discard()."""
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.discard()
+        return super().__exit__(exc_type, exc_value, traceback)
+
+    def discard(self):
+        """Close the file without storing its content."""
+        io.BytesIO.close(self)
+
+
+class MemoryPath(InternedPath, ReadablePath, WritablePath):
+    """Path object for a file or directory in an in-memory filesystem.
+
+    Directories are dictionaries, so looking up a child takes constant time.
+    File contents are stored as immutable bytes objects, which read_bytes()
+    returns without copying. snapshot() returns a path in a copy of the
+    filesystem in constant time; directories are shared until either
+    filesystem modifies them.
+
+    Paths are resolved from the root of the filesystem, whether or not they
+    begin with a slash. The *fs* argument gives the filesystem; if omitted, a
+    new empty filesystem is created.
+    """
+    __slots__ = ('fs', '_info')
+
+    def __init__(self, *pathsegments, fs=None):
+        super().__init__(*pathsegments)
+        self.fs = _MemoryFileSystem() if fs is None else fs
+        self._info = None
+
+    def __reduce__(self):
+        return functools.partial(type(self), fs=self.fs), (vfspath(self),)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, MemoryPath):
+            return NotImplemented
+        return vfspath(self) == vfspath(other) and self.fs is other.fs
+
+    def with_segments(self, *pathsegments):
+        return type(self)(*pathsegments, fs=self.fs)
+
+    def snapshot(self):
+        """Return this path in a copy of the filesystem. Later changes to
+        either filesystem aren't visible in the other."""
+        return type(self)(vfspath(self), fs=self.fs.snapshot())
+
+    @property
+    def info(self):
+        info = self._info
+        if info is None:
+            info = self._info = _MemoryPathInfo(self.fs, vfspath(self))
+        return info
+
+    def _get(self, follow_symlinks=True):
+        entry = self.fs.get(vfspath(self), follow_symlinks)
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        return entry
+
+    def _get_file(self):
+        entry = self._get()
+        if isinstance(entry, _MemoryDir):
+            raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+        return entry
+
+    def _lookup_parent(self):
+        """Return the mutable directory that contains this path (following
+        symlinks) and the path's name within it."""
+        path = vfspath(self)
+        chain, name = self.fs.lookup(path)
+        if chain is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", path)
+        elif name is None:
+            raise IsADirectoryError(errno.EISDIR, "Is a directory", path)
+        return self.fs.mutable_dir(chain), name
+
+    def _store(self, data):
+        with self.fs.lock:
+            directory, name = self._lookup_parent()
+            if isinstance(directory.get(name), _MemoryDir):
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+            directory[name] = data
+
+    def __open_reader__(self):
+        return io.BytesIO(self._get_file())
+
+    def read_bytes(self, *, limiter=None):
+        """
+        Return the binary contents of the file. The file's own bytes object
+        is returned, without copying.
+        """
+        data = self._get_file()
+        if limiter is not None:
+            limiter.acquire(len(data))
+        return data
+
+    @classmethod
+    def __read_many__(cls, paths):
+        """
+        Yield (path, data) tuples for the given files, as read_many() does.
+        Reads never block, so they're done in the calling thread.
+        """
+        for path in paths:
+            yield path, path.read_bytes()
+
+    def iterdir(self):
+        entry = self._get()
+        if not isinstance(entry, _MemoryDir):
+            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", vfspath(self))
+        children = []
+        for name, child_entry in list(entry.items()):
+            child = self / name
+            child._info = info = _MemoryPathInfo(self.fs, vfspath(child))
+            info._lentry = child_entry
+            children.append(child)
+        return iter(children)
+
+    def readlink(self):
+        entry = self._get(follow_symlinks=False)
+        if not isinstance(entry, str):
+            raise OSError(errno.EINVAL, "Not a symlink", vfspath(self))
+        return self.with_segments(entry)
+
+    def __open_writer__(self, mode):
+        with self.fs.lock:
+            directory, name = self._lookup_parent()
+            entry = directory.get(name)
+            if isinstance(entry, _MemoryDir):
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+            elif mode == 'x' and entry is not None:
+                raise FileExistsError(errno.EEXIST, "File exists", vfspath(self))
+            elif mode == 'a' and entry is not None:
+                writer = _MemoryWriter(self, entry)
+                writer.seek(0, io.SEEK_END)
+                return writer
+            directory[name] = b''
+        return _MemoryWriter(self)
+
+    def __open_atomic_writer__(self):
+        with self.fs.lock:
+            directory, name = self._lookup_parent()
+            if isinstance(directory.get(name), _MemoryDir):
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+        return _MemoryAtomicWriter(self)
+
+    def write_bytes(self, data, *, atomic=False):
+        """
+        Write the given binary data to the file. Immutable bytes objects are
+        stored without copying. The data is always stored in one step, so
+        *atomic* makes no difference.
+        """
+        if type(data) is not bytes:
+            data = bytes(memoryview(data))
+        self._store(data)
+        return len(data)
+
+    def mkdir(self):
+        """
+        Create a new directory at this given path.
+        """
+        with self.fs.lock:
+            chain, name = self.fs.lookup(vfspath(self), follow_symlinks=False)
+            if chain is None:
+                raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+            elif name is None or name in chain[-1][1]:
+                raise FileExistsError(errno.EEXIST, "File exists", vfspath(self))
+            directory = self.fs.mutable_dir(chain)
+            directory[name] = _MemoryDir(owner=self.fs.token)
+
+    def symlink_to(self, target, target_is_directory=False):
+        """
+        Make this path a symlink pointing to the target path.
+        """
+        if not isinstance(target, str):
+            target = vfspath(target)
+        with self.fs.lock:
+            chain, name = self.fs.lookup(vfspath(self), follow_symlinks=False)
+            if chain is None:
+                raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+            elif name is None or name in chain[-1][1]:
+                raise FileExistsError(errno.EEXIST, "File exists", vfspath(self))
+            directory = self.fs.mutable_dir(chain)
+            directory[name] = target
+
+    def _remove(self, is_dir):
+        with self.fs.lock:
+            chain, name = self.fs.lookup(vfspath(self), follow_symlinks=False)
+            entry = None if chain is None or name is None else chain[-1][1].get(name)
+            if entry is None:
+                raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+            elif is_dir and not isinstance(entry, _MemoryDir):
+                raise NotADirectoryError(errno.ENOTDIR, "Not a directory", vfspath(self))
+            elif is_dir and entry:
+                raise OSError(errno.ENOTEMPTY, "Directory not empty", vfspath(self))
+            elif not is_dir and isinstance(entry, _MemoryDir):
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+            del self.fs.mutable_dir(chain)[name]
+
+    def unlink(self):
+        """
+        Remove this file or symbolic link.
+        """
+        self._remove(is_dir=False)
+
+    def rmdir(self):
+        """
+        Remove this empty directory.
+        """
+        self._remove(is_dir=True)
@@ -3,7 +3,9 @@ Low-level OS functionality wrappers used by pathlib.
 """
 
 from errno import *
-from io import TextIOWrapper
+from io import (
+    DEFAULT_BUFFER_SIZE, BufferedRandom, BufferedReader, BufferedWriter,
+    FileIO, RawIOBase, TextIOWrapper)
 from stat import S_ISDIR, S_ISREG, S_ISLNK, S_IMODE
 import os
 import sys
@@ -74,7 +76,7 @@ if hasattr(os, 'copy_file_range'):
         Copy data from one regular mmap-like fd to another by using a
         high-performance copy_file_range(2) syscall that gives filesystems
         an opportunity to implement the use of reflinks or server-side
-        copy.
+        copy. Return the number of bytes copied.
         This should work on Linux >= 4.5 only.
         """
         blocksize = _get_copy_blocksize(source_fd)
@@ -85,6 +87,7 @@ if hasattr(os, 'copy_file_range'):
             if sent == 0:
                 break  # EOF
             offset += sent
+        return offset
 else:
     _copy_file_range = None
 
@@ -92,7 +95,8 @@ else:
 if hasattr(os, 'sendfile'):
     def _sendfile(source_fd, target_fd):
         """Copy data from one regular mmap-like fd to another by using
-        high-performance sendfile(2) syscall.
+        high-performance sendfile(2) syscall. Return the number of bytes
+        copied.
         This should work on Linux >= 2.6.33 only.
         """
         blocksize = _get_copy_blocksize(source_fd)
@@ -102,10 +106,68 @@ if hasattr(os, 'sendfile'):
             if sent == 0:
                 break  # EOF
             offset += sent
+        return offset
 else:
     _sendfile = None
 
 
+if hasattr(os, 'SEEK_DATA'):
+    def _is_sparse(fd):
+        """Return true if the given fd is a regular file with fewer blocks
+        allocated than its size needs."""
+        st = os.fstat(fd)
+        return S_ISREG(st.st_mode) and st.st_blocks * 512 < st.st_size
+
+    def _copy_sparse(source_f, target_f, progress=None, limiter=None):
+        """
+        Copy only the data extents of a file object, as found by seeking
+        with SEEK_DATA and SEEK_HOLE, and seek over the holes in the target,
+        which is then extended to the size of the source. Return false
+        without copying anything if the source can't find its extents, or
+        either file object isn't at its start.
+        """
+        try:
+            if source_f.tell() or target_f.tell() or not target_f.seekable():
+                return False
+            pos = source_f.seek(0, os.SEEK_DATA)
+        except OSError as err:
+            if err.errno != ENXIO:
+                return False
+            pos = None  # The file is one hole.
+        except (AttributeError, ValueError):
+            return False
+        size = source_f.seek(0, os.SEEK_END)
+        read_source = source_f.read
+        write_target = target_f.write
+        while pos is not None and pos < size:
+            end = source_f.seek(pos, os.SEEK_HOLE)
+            source_f.seek(pos)
+            target_f.seek(pos)
+            while pos < end and (buf := read_source(min(end - pos, 1024 * 1024))):
+                if limiter is not None:
+                    limiter.acquire(len(buf), ops=0)
+                write_target(buf)
+                if progress is not None:
+                    progress.update(len(buf), 'sparse')
+                pos += len(buf)
+            try:
+                pos = source_f.seek(pos, os.SEEK_DATA)
+            except OSError as err:
+                if err.errno != ENXIO:
+                    raise
+                break  # Only a hole remains.
+        # Recreate the trailing hole. Some file objects, such as BytesIO,
+        # can't be extended by truncating, and need their last byte written.
+        target_f.truncate(size)
+        if target_f.seek(0, os.SEEK_END) < size:
+            target_f.seek(size - 1)
+            write_target(b'\0')
+        return True
+else:
+    _is_sparse = None
+    _copy_sparse = None
+
+
 if _winapi and hasattr(_winapi, 'CopyFile2'):
     def copyfile2(source, target):
         """
@@ -116,59 +178,98 @@ else:
     copyfile2 = None
 
 
-def copyfileobj(source_f, target_f):
+def copyfileobj(source_f, target_f, progress=None, limiter=None):
     """
     Copy data from file-like object source_f to file-like object target_f.
+
+    If *progress* is given, its update() method is called with the number of
+    bytes copied and the name of the copy strategy used. If *limiter* is
+    given, its acquire() method is called with the size of each chunk
+    copied, and no operations; the OS copy functions are bypassed, as they
+    can't be throttled.
     """
-    try:
-        source_fd = source_f.fileno()
-        target_fd = target_f.fileno()
-    except Exception:
-        pass  # Fall through to generic code.
-    else:
+    # The OS copy functions can't be throttled.
+    if limiter is None:
         try:
-            # Use OS copy-on-write where available.
-            if _ficlone:
-                try:
-                    _ficlone(source_fd, target_fd)
-                    return
-                except OSError as err:
-                    if err.errno not in (EBADF, EOPNOTSUPP, ETXTBSY, EXDEV):
-                        raise err
-
-            # Use OS copy where available.
-            if _fcopyfile:
-                try:
-                    _fcopyfile(source_fd, target_fd)
-                    return
-                except OSError as err:
-                    if err.errno not in (EINVAL, ENOTSUP):
-                        raise err
-            if _copy_file_range:
-                try:
-                    _copy_file_range(source_fd, target_fd)
-                    return
-                except OSError as err:
-                    if err.errno not in (ETXTBSY, EXDEV):
-                        raise err
-            if _sendfile:
-                try:
-                    _sendfile(source_fd, target_fd)
-                    return
-                except OSError as err:
-                    if err.errno != ENOTSOCK:
-                        raise err
-        except OSError as err:
-            # Produce more useful error messages.
-            err.filename = source_f.name
-            err.filename2 = target_f.name
-            raise err
+            source_fd = source_f.fileno()
+            target_fd = target_f.fileno()
+        except Exception:
+            pass  # Fall through to generic code.
+        else:
+            try:
+                # Use OS copy-on-write where available.
+                if _ficlone:
+                    try:
+                        _ficlone(source_fd, target_fd)
+                        if progress is not None:
+                            progress.update(os.fstat(source_fd).st_size, 'ficlone')
+                        return
+                    except OSError as err:
+                        if err.errno not in (EBADF, EOPNOTSUPP, ETXTBSY, EXDEV):
+                            raise err
+
+                # Use OS copy where available.
+                if _fcopyfile:
+                    try:
+                        _fcopyfile(source_fd, target_fd)
+                        if progress is not None:
+                            progress.update(os.fstat(source_fd).st_size, 'fcopyfile')
+                        return
+                    except OSError as err:
+                        if err.errno not in (EINVAL, ENOTSUP):
+                            raise err
+
+                # Copy only the data in sparse files, rather than
+                # materialising their holes.
+                if _copy_sparse and _is_sparse(source_fd):
+                    if _copy_sparse(source_f, target_f, progress):
+                        return
+                if _copy_file_range:
+                    try:
+                        size = _copy_file_range(source_fd, target_fd)
+                        if progress is not None:
+                            progress.update(size, 'copy_file_range')
+                        return
+                    except OSError as err:
+                        if err.errno not in (ETXTBSY, EXDEV):
+                            raise err
+                if _sendfile:
+                    try:
+                        size = _sendfile(source_fd, target_fd)
+                        if progress is not None:
+                            progress.update(size, 'sendfile')
+                        return
+                    except OSError as err:
+                        if err.errno != ENOTSOCK:
+                            raise err
+            except OSError as err:
+                # Produce more useful error messages.
+                err.filename = source_f.name
+                err.filename2 = target_f.name
+                raise err
+
+    # Copy only the data in sparse files, if the source can find it.
+    if _copy_sparse:
+        try:
+            sparse = _is_sparse(source_f.fileno())
+        except Exception:
+            sparse = False
+        if sparse and _copy_sparse(source_f, target_f, progress, limiter):
+            return
 
     # Last resort: copy with fileobj read() and write().
     read_source = source_f.read
     write_target = target_f.write
-    while buf := read_source(1024 * 1024):
-        write_target(buf)
+    if progress is None and limiter is None:
+        while buf := read_source(1024 * 1024):
+            write_target(buf)
+    else:
+        while buf := read_source(1024 * 1024):
+            if limiter is not None:
+                limiter.acquire(len(buf), ops=0)
+            write_target(buf)
+            if progress is not None:
+                progress.update(len(buf), 'read_write')
 
 
 def _open_reader(obj):
@@ -204,6 +305,105 @@ def _open_updater(obj, mode):
         return open_updater(obj, mode)
 
 
+class _AtomicWriter(BufferedWriter):
+    """
+    Binary file object that writes to a temporary file beside the given
+    local path. When closed, the temporary file is flushed to disk and
+    renamed over the path. If closed by an exception in a 'with' block, or
+    by discard(), the temporary file is removed instead.
+    """
+
+    def __init__(self, path):
+        # Write through symlinks, as open() does.
+        path = os.path.realpath(path)
+        dirname, name = os.path.split(path)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        while True:
+            tmp_path = os.path.join(dirname, f'.{name}.{os.urandom(4).hex()}.tmp')
+            try:
+                # Created with the usual mode, as modified by the umask.
+                fd = os.open(tmp_path, flags, 0o666)
+                break
+            except FileExistsError:
+                continue
+        try:
+            try:
+                mode = os.stat(path).st_mode
+            except FileNotFoundError:
+                pass
+            else:
+                if S_ISDIR(mode):
+                    raise IsADirectoryError(EISDIR, "Is a directory", path)
+                os.chmod(fd if os.chmod in os.supports_fd else tmp_path, S_IMODE(mode))
+            super().__init__(FileIO(fd, 'w'))
+        except BaseException:
+            os.close(fd)
+            os.remove(tmp_path)
+            raise
+        self._path = path
+        self._tmp_path = tmp_path
+        self._discarded = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.discard()
+        return super().__exit__(exc_type, exc_value, traceback)
+
+    def discard(self):
+        """Close the file without replacing the path."""
+        self._discarded = True
+        self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        publish = not self._discarded
+        try:
+            if publish:
+                self.flush()
+                os.fsync(self.fileno())
+            super().close()
+            if publish:
+                os.replace(self._tmp_path, self._path)
+        except BaseException:
+            publish = False
+            raise
+        finally:
+            if not publish:
+                super().close()
+                os.remove(self._tmp_path)
+        if publish:
+            _fsync_dir(os.path.dirname(self._path))
+
+
+def _fsync_dir(path):
+    """Flush the given directory to disk, so that a rename in it survives a
+    crash. Platforms that can't open directories are skipped."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _open_atomic_writer(obj):
+    cls = type(obj)
+    try:
+        open_atomic_writer = cls.__open_atomic_writer__
+    except AttributeError:
+        if hasattr(obj, '__fspath__'):
+            return _AtomicWriter(os.fspath(obj))
+        cls_name = cls.__name__
+        raise TypeError(f"{cls_name} can't be opened for atomic writing") from None
+    else:
+        return open_atomic_writer(obj)
+
+
 def vfsopen(obj, mode='r', buffering=-1, encoding=None, errors=None,
             newline=None):
     """
@@ -218,13 +418,16 @@ def vfsopen(obj, mode='r', buffering=-1, encoding=None, errors=None,
         __open_updater__(mode)
 
     '__open_reader__' is called for 'r' mode; '__open_writer__' for 'a', 'w'
-    and 'x' modes; and '__open_updater__' for 'r+' and 'w+' modes. If text
-    mode is requested, the result is wrapped in an io.TextIOWrapper object.
+    and 'x' modes; and '__open_updater__' for 'r+' and 'w+' modes. If the
+    result is a raw stream, it's wrapped in a buffered stream, unless
+    buffering is 0; a buffering greater than 1 gives the buffer size. If text
+    mode is requested, the result is wrapped in an io.TextIOWrapper object,
+    which is line buffered if buffering is 1.
     """
-    if buffering != -1:
-        raise ValueError("buffer size can't be customized")
     text = 'b' not in mode
     if text:
+        if buffering == 0:
+            raise ValueError("can't have unbuffered text I/O")
         # Call io.text_encoding() here to ensure any warning is raised at an
         # appropriate stack level.
         encoding = text_encoding(encoding)
@@ -232,6 +435,16 @@ def vfsopen(obj, mode='r', buffering=-1, encoding=None, errors=None,
         return open(obj, mode, buffering, encoding, errors, newline)
     except TypeError:
         pass
+    line_buffering = False
+    if buffering == 1:
+        if text:
+            line_buffering = True
+        else:
+            import warnings
+            warnings.warn("line buffering (buffering=1) isn't supported in "
+                          "binary mode, the default buffer size will be used",
+                          RuntimeWarning, 2)
+        buffering = -1
     if not text:
         if encoding is not None:
             raise ValueError("binary mode doesn't take an encoding argument")
@@ -248,8 +461,21 @@ def vfsopen(obj, mode='r', buffering=-1, encoding=None, errors=None,
         stream = _open_updater(obj, mode[1])
     else:
         raise ValueError(f'invalid mode: {mode}')
+    if buffering != 0 and isinstance(stream, RawIOBase):
+        # Buffer raw streams, as open() does, so that reads and writes
+        # aren't made in small chunks.
+        size = DEFAULT_BUFFER_SIZE if buffering < 0 else buffering
+        if mode == 'r':
+            stream = BufferedReader(stream, size)
+        elif mode in ('a', 'w', 'x'):
+            stream = BufferedWriter(stream, size)
+        else:
+            stream = BufferedRandom(stream, size)
     if text:
-        stream = TextIOWrapper(stream, encoding, errors, newline)
+        stream = TextIOWrapper(stream, encoding, errors, newline, line_buffering)
+        if buffering > 1:
+            # TextIOWrapper reads and encodes in chunks of this size.
+            stream._CHUNK_SIZE = buffering
     return stream
 
 
@@ -310,11 +536,21 @@ def ensure_different_files(source, target):
 
 
 def copy_info(info, target, follow_symlinks=True):
-    """Copy metadata from the given PathInfo to the given local path."""
+    """Copy metadata from the given PathInfo to the given local path, or to
+    the open file with the given file descriptor. BSD flags can't be set
+    through a file descriptor, and are skipped in that case."""
+    if isinstance(target, int):
+        supported = os.supports_fd
+        if not follow_symlinks:
+            raise ValueError("follow_symlinks=False is unsupported for file descriptors")
+    elif follow_symlinks:
+        supported = None
+    else:
+        supported = os.supports_follow_symlinks
     copy_times_ns = (
         hasattr(info, '_access_time_ns') and
         hasattr(info, '_mod_time_ns') and
-        (follow_symlinks or os.utime in os.supports_follow_symlinks))
+        (supported is None or os.utime in supported))
     if copy_times_ns:
         t0 = info._access_time_ns(follow_symlinks=follow_symlinks)
         t1 = info._mod_time_ns(follow_symlinks=follow_symlinks)
@@ -322,6 +558,7 @@ def copy_info(info, target, follow_symlinks=True):
 
     # We must copy extended attributes before the file is (potentially)
     # chmod()'ed read-only, otherwise setxattr() will error with -EACCES.
+    # os.setxattr() accepts file descriptors, but isn't in os.supports_fd.
     copy_xattrs = (
         hasattr(info, '_xattrs') and
         hasattr(os, 'setxattr') and
@@ -337,7 +574,7 @@ def copy_info(info, target, follow_symlinks=True):
 
     copy_posix_permissions = (
         hasattr(info, '_posix_permissions') and
-        (follow_symlinks or os.chmod in os.supports_follow_symlinks))
+        (supported is None or os.chmod in supported))
     if copy_posix_permissions:
         posix_permissions = info._posix_permissions(follow_symlinks=follow_symlinks)
         try:
@@ -358,7 +595,7 @@ def copy_info(info, target, follow_symlinks=True):
     copy_bsd_flags = (
         hasattr(info, '_bsd_flags') and
         hasattr(os, 'chflags') and
-        (follow_symlinks or os.chflags in os.supports_follow_symlinks))
+        (supported is None or os.chflags in supported))
     if copy_bsd_flags:
         bsd_flags = info._bsd_flags(follow_symlinks=follow_symlinks)
         try:
@@ -421,6 +658,14 @@ class _PathInfoBase:
         st = self._stat(follow_symlinks=follow_symlinks)
         return st.st_dev, st.st_ino
 
+    def _size(self, *, follow_symlinks=True):
+        """Return the size in bytes."""
+        return self._stat(follow_symlinks=follow_symlinks).st_size
+
+    def _link_count(self, *, follow_symlinks=True):
+        """Return the number of hard links to the file."""
+        return self._stat(follow_symlinks=follow_symlinks).st_nlink
+
     def _access_time_ns(self, *, follow_symlinks=True):
         """Return the access time in nanoseconds."""
         return self._stat(follow_symlinks=follow_symlinks).st_atime_ns
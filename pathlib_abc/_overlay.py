@@ -0,0 +1,270 @@
+"""
+Implementation of ReadablePath that merges several layers of paths.
+"""
+
+import errno
+import functools
+
+from pathlib_abc import ReadablePath
+from pathlib_abc._interned import InternedPath
+from pathlib_abc._os import vfsopen, vfspath
+from pathlib_abc._resolve import chain_path, resolve_path
+
+
+# Prefix of whiteout files, which hide entries in lower layers, and the name
+# of the marker file that hides the contents of a directory in lower layers.
+_WHITEOUT_PREFIX = '.wh.'
+_OPAQUE_MARKER = '.wh..wh..opq'
+
+
+class _Overlay:
+    """A stack of layers, and a cache of their merged directory listings.
+
+    Each listing maps names to entries. The entry for a directory is a list
+    of the directory's paths in the layers that contribute to it, topmost
+    first. The entry for anything else (including a symlink) is its path in
+    the topmost layer that has it.
+    """
+    __slots__ = ('layers', 'listings', 'links')
+
+    def __init__(self, layers):
+        self.layers = tuple(layers)
+        self.listings = {}
+        self.links = {}
+
+    def __reduce__(self):
+        return type(self), (self.layers,)
+
+    def root(self):
+        """Return the entry for the root directory."""
+        return list(self.layers)
+
+    def listdir(self, name, entry):
+        """Return the merged listing of the given directory, given its name
+        and entry."""
+        try:
+            return self.listings[name]
+        except KeyError:
+            pass
+        listing = {}
+        hidden = set()
+        for layer_dir in entry:
+            whiteouts = []
+            opaque = False
+            for child in layer_dir.iterdir():
+                child_name = child.name
+                if child_name == _OPAQUE_MARKER:
+                    opaque = True
+                elif child_name.startswith(_WHITEOUT_PREFIX):
+                    whiteouts.append(child_name[len(_WHITEOUT_PREFIX):])
+                elif child_name in hidden:
+                    continue
+                elif child_name not in listing:
+                    if child.info.is_dir(follow_symlinks=False):
+                        listing[child_name] = [child]
+                    else:
+                        listing[child_name] = child
+                else:
+                    upper = listing[child_name]
+                    if not isinstance(upper, list):
+                        continue
+                    elif child.info.is_dir(follow_symlinks=False):
+                        upper.append(child)
+                    else:
+                        # A non-directory hides the name in lower layers.
+                        hidden.add(child_name)
+            if opaque:
+                break
+            hidden.update(whiteouts)
+        self.listings[name] = listing
+        return listing
+
+    def readlink(self, entry):
+        """Return the target of the given symlink entry as a string."""
+        target = self.links.get(entry)
+        if target is None:
+            target = self.links[entry] = vfspath(entry.readlink())
+        return target
+
+    def resolve(self, path, follow_symlinks=True):
+        """Resolve the given path. Return a (name, entry) tuple, where name
+        is the resolved path and entry is its entry, or (None, None) if it's
+        missing."""
+        chain, name, entry = resolve_path(path, self.root(), self._lookup, _is_dir,
+                                          self._readlink, follow_symlinks)
+        if entry is None:
+            return None, None
+        return chain_path(chain, name), entry
+
+    def _lookup(self, chain, name):
+        return self.listdir(chain_path(chain), chain[-1][1]).get(name)
+
+    def _readlink(self, entry):
+        if isinstance(entry, list) or not entry.info.is_symlink():
+            return None
+        return self.readlink(entry)
+
+
+def _is_dir(entry):
+    return isinstance(entry, list)
+
+
+class _OverlayPathInfo:
+    """Implementation of pathlib_abc.PathInfo for overlay paths."""
+    __slots__ = ('_overlay', '_path', '_entry', '_lentry')
+
+    def __init__(self, overlay, path):
+        self._overlay = overlay
+        self._path = path
+
+    def __repr__(self):
+        return "<OverlayPath.info>"
+
+    def _get(self, follow_symlinks=True):
+        if follow_symlinks:
+            try:
+                return self._entry
+            except AttributeError:
+                pass
+            try:
+                entry = self._lentry
+            except AttributeError:
+                entry = None
+            if entry is None or not isinstance(entry, list) and entry.info.is_symlink():
+                entry = self._overlay.resolve(self._path)[1]
+            self._entry = entry
+            return entry
+        else:
+            try:
+                return self._lentry
+            except AttributeError:
+                self._lentry = self._overlay.resolve(self._path, False)[1]
+                return self._lentry
+
+    def exists(self, *, follow_symlinks=True):
+        """Whether this path exists."""
+        return self._get(follow_symlinks) is not None
+
+    def is_dir(self, *, follow_symlinks=True):
+        """Whether this path is a directory."""
+        return isinstance(self._get(follow_symlinks), list)
+
+    def is_file(self, *, follow_symlinks=True):
+        """Whether this path is a regular file."""
+        entry = self._get(follow_symlinks)
+        return (entry is not None and not isinstance(entry, list)
+                and entry.info.is_file(follow_symlinks=False))
+
+    def is_symlink(self):
+        """Whether this path is a symbolic link."""
+        entry = self._get(follow_symlinks=False)
+        return (entry is not None and not isinstance(entry, list)
+                and entry.info.is_symlink())
+
+    def _size(self, *, follow_symlinks=True):
+        """Return the size in bytes, if the layer provides it."""
+        entry = self._get(follow_symlinks)
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", self._path)
+        elif isinstance(entry, list):
+            entry = entry[0]
+        return entry.info._size(follow_symlinks=False)
+
+
+class OverlayPath(InternedPath, ReadablePath):
+    """Path object for a file or directory in a union of layers.
+
+    The *layers* argument is a sequence of ReadablePath objects, each the
+    root of a layer, topmost first. A path refers to the entry in the
+    topmost layer that has it, and the contents of a directory are merged
+    from all layers in which it's a directory. An empty file named '.wh.'
+    followed by a name hides that name in lower layers, and an empty file
+    named '.wh..wh..opq' hides the whole contents of its directory in lower
+    layers. Symlinks are resolved in the merged tree.
+
+    The merged listing of each directory is built when the directory is
+    first looked into, and cached. The cache is shared by all OverlayPath
+    objects derived from one another; clear_cache() discards it.
+    """
+    __slots__ = ('_overlay', '_info')
+
+    def __init__(self, *pathsegments, layers):
+        super().__init__(*pathsegments)
+        if not isinstance(layers, _Overlay):
+            layers = _Overlay(layers)
+        self._overlay = layers
+        self._info = None
+
+    def __reduce__(self):
+        return functools.partial(type(self), layers=self.layers), (vfspath(self),)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, OverlayPath):
+            return NotImplemented
+        return vfspath(self) == vfspath(other) and self._overlay is other._overlay
+
+    @property
+    def layers(self):
+        """The roots of the layers, topmost first."""
+        return self._overlay.layers
+
+    def with_segments(self, *pathsegments):
+        return type(self)(*pathsegments, layers=self._overlay)
+
+    def clear_cache(self):
+        """Discard the cached directory listings and symlink targets, so that
+        changes to the layers become visible."""
+        self._overlay.listings.clear()
+        self._overlay.links.clear()
+
+    @property
+    def info(self):
+        info = self._info
+        if info is None:
+            info = self._info = _OverlayPathInfo(self._overlay, vfspath(self))
+        return info
+
+    def _get_file(self):
+        entry = self._overlay.resolve(vfspath(self))[1]
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif isinstance(entry, list):
+            raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+        return entry
+
+    def __open_reader__(self):
+        return vfsopen(self._get_file(), 'rb')
+
+    def read_bytes(self, *, limiter=None):
+        """
+        Return the binary contents of the file.
+        """
+        if limiter is not None:
+            # Layers' read_bytes() methods may not accept a limiter.
+            return super().read_bytes(limiter=limiter)
+        return self._get_file().read_bytes()
+
+    def iterdir(self):
+        name, entry = self._overlay.resolve(vfspath(self))
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif not isinstance(entry, list):
+            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", vfspath(self))
+        children = []
+        for child_name, child_entry in list(self._overlay.listdir(name, entry).items()):
+            child = self / child_name
+            child._info = info = _OverlayPathInfo(self._overlay, vfspath(child))
+            info._lentry = child_entry
+            children.append(child)
+        return iter(children)
+
+    def readlink(self):
+        entry = self._overlay.resolve(vfspath(self), False)[1]
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif isinstance(entry, list) or not entry.info.is_symlink():
+            raise OSError(errno.EINVAL, "Not a symlink", vfspath(self))
+        return self.with_segments(self._overlay.readlink(entry))
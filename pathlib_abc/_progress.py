@@ -0,0 +1,107 @@
+"""
+Progress reporting for ReadablePath.copy().
+"""
+
+import copy
+import threading
+import time
+
+
+class CopyProgress:
+    """Progress of a copy, reported to a callback.
+
+    The callback is called with a snapshot of this object as its only
+    argument, at most once every *interval* seconds while the copy
+    progresses, and once more when it finishes. It's called in the thread
+    that made progress, without holding any lock, so it can slow down that
+    thread's copying by sleeping, or abort the copy by raising an exception.
+    """
+
+    def __init__(self, callback=None, interval=0.1):
+        self.callback = callback
+        self.interval = interval
+        self.files_started = 0
+        self.files_finished = 0
+        self.bytes_copied = 0
+        self.strategy = None
+        self.source = None
+        self.target = None
+        self.finished = False
+        self.start_time = time.monotonic()
+        self.last_progress_time = self.start_time
+        self._next_report_time = self.start_time + interval
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (f"<{type(self).__name__} files={self.files_finished}/{self.files_started} "
+                f"bytes={self.bytes_copied} strategy={self.strategy!r}>")
+
+    @property
+    def elapsed(self):
+        """Seconds since the copy started, or until it finished."""
+        return self.last_progress_time - self.start_time
+
+    @property
+    def throughput(self):
+        """Average number of bytes copied per second."""
+        elapsed = self.elapsed
+        return self.bytes_copied / elapsed if elapsed > 0 else 0.0
+
+    def file_started(self, source, target):
+        """Record that copying the given source file to the given target
+        has started."""
+        with self._lock:
+            self.files_started += 1
+            self.source = source
+            self.target = target
+            snapshot = self._progressed()
+        if snapshot is not None:
+            self.callback(snapshot)
+
+    def file_finished(self, source, target):
+        """Record that copying the given source file to the given target
+        has finished."""
+        with self._lock:
+            self.files_finished += 1
+            snapshot = self._progressed()
+        if snapshot is not None:
+            self.callback(snapshot)
+
+    def update(self, nbytes, strategy=None):
+        """Record that *nbytes* more bytes were copied, using the given
+        strategy, such as 'read_write' or 'copy_file_range'."""
+        with self._lock:
+            self.bytes_copied += nbytes
+            if strategy is not None:
+                self.strategy = strategy
+            snapshot = self._progressed()
+        if snapshot is not None:
+            self.callback(snapshot)
+
+    def finish(self):
+        """Record that the copy has finished, and report it."""
+        with self._lock:
+            self.finished = True
+            self.last_progress_time = time.monotonic()
+            snapshot = self._snapshot()
+        if snapshot is not None:
+            self.callback(snapshot)
+
+    def _progressed(self):
+        """Record the time of progress, and return a snapshot to report if
+        it's time to call the callback, or None otherwise. The lock must be
+        held."""
+        now = self.last_progress_time = time.monotonic()
+        if now >= self._next_report_time:
+            self._next_report_time = now + self.interval
+            return self._snapshot()
+        return None
+
+    def _snapshot(self):
+        """Return a copy of this object to pass to the callback, or None if
+        there's no callback. The lock must be held."""
+        if self.callback is None:
+            return None
+        snapshot = copy.copy(self)
+        snapshot.callback = None
+        return snapshot
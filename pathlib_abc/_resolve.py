@@ -0,0 +1,71 @@
+"""
+Resolution of path strings in trees of entries, with symlinks, as done by
+the virtual path implementations.
+"""
+
+
+# Maximum number of symlinks followed when resolving a path.
+_MAX_SYMLINKS = 40
+
+
+def chain_path(chain, name=None):
+    """Return the path string of the given name in the last directory of the
+    given chain, or of the directory itself if *name* is None."""
+    names = [part for part, _ in chain[1:]]
+    if name is not None:
+        names.append(name)
+    return '/'.join(names)
+
+
+def resolve_path(path, root, lookup, is_dir, readlink, follow_symlinks=True):
+    """Resolve the given path string, which uses '/' separators, in a tree
+    whose root directory has the entry *root*.
+
+    lookup(chain, name) returns the entry for the given name in the last
+    directory of the given chain, or None if it's missing. is_dir(entry)
+    returns whether the entry is a directory, and readlink(entry) returns
+    its target as a string if it's a symlink, or None otherwise.
+
+    Return a (chain, name, entry) tuple. The chain is a list of (name,
+    entry) pairs for directories from the root, whose name is None, to the
+    directory containing the resolved path; *name* is the path's name in
+    that directory, or None if the path resolves to the directory itself,
+    and *entry* is its entry, or None if it's missing. Return (None, None,
+    None) if a parent isn't a directory or too many symlinks are
+    encountered.
+    """
+    chain = [(None, root)]
+    name = None
+    parts = path.split('/')[::-1]
+    link_count = 0
+    while True:
+        if name is not None:
+            entry = lookup(chain, name)
+            if entry is None:
+                if parts:
+                    return None, None, None
+                return chain, name, None
+            target = readlink(entry) if parts or follow_symlinks else None
+            if target is not None:
+                link_count += 1
+                if link_count > _MAX_SYMLINKS:
+                    return None, None, None
+                if target.startswith('/'):
+                    del chain[1:]
+                parts += target.split('/')[::-1]
+                name = None
+            elif parts:
+                if not is_dir(entry):
+                    return None, None, None
+                chain.append((name, entry))
+                name = None
+            else:
+                return chain, name, entry
+        if not parts:
+            return chain, None, chain[-1][1]
+        part = parts.pop()
+        if part == '..':
+            if len(chain) > 1:
+                chain.pop()
+        elif part and part != '.':
+            name = part
@@ -0,0 +1,121 @@
+"""
+Incremental copying of directory trees, as done by ReadablePath.sync().
+"""
+
+import collections
+import hashlib
+
+from pathlib_abc import _copy_file
+from pathlib_abc._os import vfsopen, vfspath
+
+
+SyncResult = collections.namedtuple('SyncResult', ['copied', 'skipped', 'deleted'])
+SyncResult.__doc__ = """Summary of a sync: the number of files and symlinks
+copied and skipped, and the number of target paths deleted."""
+
+# Modification times within this many nanoseconds of each other are
+# considered equal, as filesystems such as FAT store them coarsely.
+_mod_time_tolerance_ns = 10**9
+
+
+def _digest(path):
+    """Return the SHA-256 digest of the given file's content."""
+    digest = hashlib.sha256()
+    with vfsopen(path, 'rb') as f:
+        while buf := f.read(1024 * 1024):
+            digest.update(buf)
+    return digest.digest()
+
+
+def _is_unchanged(source, target, checksum):
+    """Return true if the given target file is up to date with the given
+    source file."""
+    source_info = source.info
+    target_info = target.info
+    try:
+        if source_info._size() != target_info._size():
+            return False
+    except AttributeError:
+        if not checksum:
+            return False
+    if checksum:
+        return _digest(source) == _digest(target)
+    try:
+        delta = target_info._mod_time_ns() - source_info._mod_time_ns()
+    except AttributeError:
+        return False
+    return abs(delta) <= _mod_time_tolerance_ns
+
+
+def _remove(path):
+    """Remove the given path, along with its contents if it's a directory.
+    Return the number of paths removed."""
+    try:
+        unlink = type(path).unlink
+        rmdir = type(path).rmdir
+    except AttributeError:
+        cls_name = type(path).__name__
+        raise TypeError(f"{cls_name} can't be deleted") from None
+    count = 0
+    stack = [(path, False)]
+    while stack:
+        path, listed = stack.pop()
+        if listed:
+            rmdir(path)
+        elif path.info.is_dir(follow_symlinks=False):
+            stack.append((path, True))
+            stack.extend((child, False) for child in path.iterdir())
+            continue
+        else:
+            unlink(path)
+        count += 1
+    return count
+
+
+def sync(source, target, follow_symlinks=True, delete=False, checksum=False):
+    """Update the target tree to match the source tree, copying only files
+    that are new or changed. Return a SyncResult."""
+    copied = skipped = deleted = 0
+    # Empty joins ensure fresh metadata.
+    stack = [(source.joinpath(), target.joinpath())]
+    while stack:
+        src, dst = stack.pop()
+        dst_info = dst.info
+        if not follow_symlinks and src.info.is_symlink():
+            link_target = vfspath(src.readlink())
+            if dst_info.is_symlink() and vfspath(dst.readlink()) == link_target:
+                skipped += 1
+                continue
+            if dst_info.exists(follow_symlinks=False):
+                deleted += _remove(dst)
+            dst.symlink_to(link_target, src.info.is_dir())
+            copied += 1
+        elif src.info.is_dir():
+            children = list(src.iterdir())
+            if dst_info.is_dir(follow_symlinks=follow_symlinks):
+                if delete:
+                    names = {child.name for child in children}
+                    for dst_child in dst.iterdir():
+                        if dst_child.name not in names:
+                            deleted += _remove(dst_child)
+            else:
+                if dst_info.exists(follow_symlinks=False):
+                    deleted += _remove(dst)
+                dst.mkdir()
+            for child in children:
+                stack.append((child, dst.joinpath(child.name)))
+        elif dst_info.is_file(follow_symlinks=follow_symlinks) and _is_unchanged(src, dst, checksum):
+            skipped += 1
+        else:
+            if dst_info.exists(follow_symlinks=False):
+                if not dst_info.is_file(follow_symlinks=follow_symlinks):
+                    deleted += _remove(dst)
+                elif not dst_info.is_symlink() and hasattr(type(dst), 'unlink'):
+                    # The changed file is replaced rather than rewritten, as
+                    # it may have been given the source's read-only mode.
+                    dst.unlink()
+            # The source's modification time is copied, where the target
+            # supports it, so that the files compare equal next time.
+            _copy_file(src, dst, preserve_metadata=True)
+            copied += 1
+    return SyncResult(copied, skipped, deleted)
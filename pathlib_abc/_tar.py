@@ -0,0 +1,518 @@
+"""
+Implementation of ReadablePath for tar archive members.
+"""
+
+import errno
+import io
+import json
+import os
+import posixpath
+import tarfile
+import threading
+import weakref
+import zlib
+from bisect import bisect_right
+
+from pathlib_abc import ReadablePath
+from pathlib_abc._interned import InternedPath
+from pathlib_abc._os import vfspath
+from pathlib_abc._resolve import chain_path, resolve_path
+
+
+# Version of the index file format written by TarPath.save_index().
+_index_format = 1
+
+# Indexes of tar archives, keyed by file object.
+_indexes = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+# Amount of uncompressed data between checkpoints in gzip streams, and the
+# amount of data read or decompressed at a time.
+_checkpoint_interval = 1 << 23
+_chunk_size = 1 << 16
+
+# Index entry for directories without a member of their own.
+_implied_dir = ('dir', 0, 0, None)
+
+
+class _FileSource:
+    """Random access to an uncompressed archive."""
+    __slots__ = ('fileobj', 'lock')
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.lock = threading.Lock()
+
+    def pread(self, offset, size):
+        """Return up to *size* bytes from the given offset."""
+        with self.lock:
+            self.fileobj.seek(offset)
+            return self.fileobj.read(size)
+
+
+class _GzipSource:
+    """Random access to a gzip-compressed archive.
+
+    A copy of the decompressor is saved every _checkpoint_interval bytes of
+    output, along with the offsets of the compressed and uncompressed data.
+    Reads decompress from the nearest checkpoint before the requested
+    offset, rather than from the start of the stream. The decompressor left
+    by the last read is kept too, so that sequential reads continue where
+    the previous read stopped.
+    """
+    __slots__ = ('fileobj', 'lock', 'offsets', 'checkpoints', 'current')
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.lock = threading.Lock()
+        self.offsets = [0]
+        self.checkpoints = [(0, 0, zlib.decompressobj(zlib.MAX_WBITS | 16))]
+        self.current = None
+
+    def pread(self, offset, size):
+        """Return up to *size* bytes of uncompressed data from the given
+        offset."""
+        with self.lock:
+            checkpoint = self.checkpoints[bisect_right(self.offsets, offset) - 1]
+            current = self.current
+            if current is None or current[0] > offset or current[0] < checkpoint[0]:
+                uoffset, coffset, decompressor = checkpoint
+                decompressor = decompressor.copy()
+            else:
+                uoffset, coffset, decompressor = current
+            fileobj = self.fileobj
+            end = offset + size
+            chunks = []
+            while uoffset < end:
+                fileobj.seek(coffset)
+                data = fileobj.read(_chunk_size)
+                if decompressor.eof:
+                    # Start of another gzip member, or trailing padding.
+                    if not data.startswith(b'\x1f\x8b'):
+                        break
+                    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                max_length = min(end - uoffset, _chunk_size * 4)
+                output = decompressor.decompress(data, max_length)
+                if not data and not output:
+                    raise EOFError("Compressed file ended before the "
+                                   "end-of-stream marker was reached")
+                if decompressor.eof:
+                    coffset += len(data) - len(decompressor.unused_data)
+                else:
+                    coffset += len(data) - len(decompressor.unconsumed_tail)
+                if uoffset + len(output) > offset:
+                    chunks.append(output[max(offset - uoffset, 0):])
+                uoffset += len(output)
+                if uoffset >= self.offsets[-1] + _checkpoint_interval:
+                    self.offsets.append(uoffset)
+                    self.checkpoints.append((uoffset, coffset, decompressor.copy()))
+            self.current = (uoffset, coffset, decompressor)
+            return b''.join(chunks)
+
+
+class _SourceReader(io.RawIOBase):
+    """Raw binary file object for a region of an archive. If *size* is
+    None, the region extends to the end of the archive."""
+
+    def __init__(self, source, start=0, size=None):
+        self._source = source
+        self._start = start
+        self._size = size
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            if self._size is None:
+                raise io.UnsupportedOperation("can't seek from end of archive")
+            pos = self._size + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        size = len(buffer)
+        if self._size is not None:
+            size = min(size, self._size - self._pos)
+        if size <= 0:
+            return 0
+        data = self._source.pread(self._start + self._pos, size)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+class _TarIndex:
+    """Index of the members of a tar archive.
+
+    Each member name (without leading './' or trailing slashes) is mapped to
+    a (kind, offset, size, link) tuple, where kind is one of 'file', 'dir',
+    'symlink' or 'other', offset and size locate the member's data in the
+    uncompressed archive, and link is a symlink's target. Hard links are
+    recorded as copies of their target's entry. Directory listings, including
+    those of implied directories, are built when the index is created.
+    """
+    __slots__ = ('source', 'members', 'children')
+
+    def __init__(self, source, members):
+        self.source = source
+        self.members = members
+        children = {'': {}}
+        for name, entry in members.items():
+            if entry[0] == 'dir':
+                children.setdefault(name, {})
+            while name:
+                parent, _, child = name.rpartition('/')
+                listing = children.get(parent)
+                if listing is None:
+                    listing = children[parent] = {child: None}
+                    name = parent
+                else:
+                    listing[child] = None
+                    break
+        self.children = children
+
+    def get(self, name):
+        """Return the entry for the given member name, or None."""
+        entry = self.members.get(name)
+        if entry is None and name in self.children:
+            return _implied_dir
+        return entry
+
+
+def _normalize_name(name):
+    """Return the given member name relative to the archive root, or None
+    if it names the root. Names can't point outside the root."""
+    name = posixpath.normpath('/' + name).lstrip('/')
+    return name or None
+
+
+def _open_source(fileobj):
+    """Return a source for the given archive file object, detecting gzip
+    compression from its first bytes."""
+    fileobj.seek(0)
+    if fileobj.read(2) == b'\x1f\x8b':
+        return _GzipSource(fileobj)
+    return _FileSource(fileobj)
+
+
+def _build_index(fileobj):
+    """Read the headers of all members in the given archive, and return an
+    index of them."""
+    source = _open_source(fileobj)
+    members = {}
+    stream = io.BufferedReader(_SourceReader(source), _chunk_size)
+    with tarfile.open(fileobj=stream, mode='r:') as tar:
+        for tarinfo in tar:
+            name = _normalize_name(tarinfo.name)
+            if name is None:
+                continue
+            if tarinfo.islnk():
+                link_name = _normalize_name(tarinfo.linkname)
+                entry = members.get(link_name)
+                if entry is None:
+                    continue
+            elif tarinfo.isreg() and not tarinfo.issparse():
+                entry = ('file', tarinfo.offset_data, tarinfo.size, None)
+            elif tarinfo.isdir():
+                entry = ('dir', 0, 0, None)
+            elif tarinfo.issym():
+                entry = ('symlink', 0, 0, tarinfo.linkname)
+            else:
+                entry = ('other', 0, 0, None)
+            members[name] = entry
+        # Don't keep the TarInfo objects alive with the index.
+        tar.members = []
+    return _TarIndex(source, members)
+
+
+def _get_index(fileobj):
+    """Return the index for the given archive file object."""
+    index = _indexes.get(fileobj)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(fileobj)
+            if index is None:
+                index = _indexes[fileobj] = _build_index(fileobj)
+    return index
+
+
+def _archive_key(fileobj):
+    """Return a key that identifies the contents of the given archive file
+    object, for validating saved indexes."""
+    try:
+        st = os.fstat(fileobj.fileno())
+    except (AttributeError, OSError):
+        return [fileobj.seek(0, io.SEEK_END), None]
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _check_index(source, members):
+    """Return true if the header of each regular file in the given index
+    entries is found just before its data in the given source, with the
+    recorded name and size. This rejects indexes saved for other archives
+    that happen to have the same size."""
+    files = {}
+    for name, (kind, offset, size, _) in members.items():
+        if kind == 'file':
+            # Hard links share their target's entry, and so its header.
+            files.setdefault((offset, size), []).append(name)
+    for (offset, size), names in sorted(files.items()):
+        if offset < tarfile.BLOCKSIZE:
+            return False
+        buf = source.pread(offset - tarfile.BLOCKSIZE, tarfile.BLOCKSIZE)
+        try:
+            tarinfo = tarfile.TarInfo.frombuf(buf, tarfile.ENCODING, 'surrogateescape')
+        except tarfile.HeaderError:
+            return False
+        # Sizes of 8 GiB and more are stored in pax headers instead.
+        if not tarinfo.isreg() or (tarinfo.size != size and size < 8 ** 11):
+            return False
+        # Long names are truncated in the header, and stored in a preceding
+        # pax or GNU header instead.
+        header_name = _normalize_name(tarinfo.name)
+        if header_name is None or not any(name.startswith(header_name) for name in names):
+            return False
+    return True
+
+
+def _resolve(index, path, follow_symlinks=True):
+    """Resolve the given path within the archive. Return a (name, entry)
+    tuple, where name is the resolved member name and entry is its index
+    entry, or (None, None) if it's missing."""
+    def lookup(chain, name):
+        return index.get(chain_path(chain, name))
+
+    chain, name, entry = resolve_path(path, _implied_dir, lookup, _is_dir, _readlink,
+                                      follow_symlinks)
+    if entry is None:
+        return None, None
+    return chain_path(chain, name), entry
+
+
+def _is_dir(entry):
+    return entry[0] == 'dir'
+
+
+def _readlink(entry):
+    return entry[3] if entry[0] == 'symlink' else None
+
+
+class _TarPathInfo:
+    """Implementation of pathlib_abc.PathInfo for tar archive members."""
+    __slots__ = ('_fileobj', '_path', '_kind', '_lkind')
+
+    def __init__(self, fileobj, path):
+        self._fileobj = fileobj
+        self._path = path
+
+    def __repr__(self):
+        return "<TarPath.info>"
+
+    def _get_kind(self, follow_symlinks=True):
+        if follow_symlinks:
+            try:
+                return self._kind
+            except AttributeError:
+                entry = _resolve(_get_index(self._fileobj), self._path)[1]
+                self._kind = entry and entry[0]
+                return self._kind
+        else:
+            try:
+                return self._lkind
+            except AttributeError:
+                entry = _resolve(_get_index(self._fileobj), self._path, False)[1]
+                self._lkind = entry and entry[0]
+                return self._lkind
+
+    def exists(self, *, follow_symlinks=True):
+        """Whether this path exists."""
+        return self._get_kind(follow_symlinks) is not None
+
+    def is_dir(self, *, follow_symlinks=True):
+        """Whether this path is a directory."""
+        return self._get_kind(follow_symlinks) == 'dir'
+
+    def is_file(self, *, follow_symlinks=True):
+        """Whether this path is a regular file."""
+        return self._get_kind(follow_symlinks) == 'file'
+
+    def is_symlink(self):
+        """Whether this path is a symbolic link."""
+        return self._get_kind(follow_symlinks=False) == 'symlink'
+
+    def _size(self, *, follow_symlinks=True):
+        """Return the size in bytes."""
+        entry = _resolve(_get_index(self._fileobj), self._path, follow_symlinks)[1]
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", self._path)
+        return entry[2]
+
+    def _file_id(self, *, follow_symlinks=True):
+        """Return the identifier of the file. Hard links to a member share
+        its data offset."""
+        name, entry = _resolve(_get_index(self._fileobj), self._path, follow_symlinks)
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", self._path)
+        elif entry[0] == 'file':
+            return id(self._fileobj), entry[1]
+        return id(self._fileobj), name
+
+
+class TarPath(InternedPath, ReadablePath):
+    """Path object for a member of a tar archive.
+
+    The *fileobj* argument is a seekable binary file object for the archive,
+    which may be uncompressed or gzip-compressed. The archive's member
+    headers are read once, on first use, into an index that records where
+    each member's data begins; lookups and listings then use the index, and
+    reads seek directly to the member's data. In gzip-compressed archives,
+    the state of the decompressor is saved at intervals, so that reads
+    resume decompression from the nearest saved state rather than from the
+    start of the archive.
+
+    The index is shared by all TarPath objects for the same file object. The
+    archive must not be modified while it's in use.
+    """
+    __slots__ = ('fileobj', '_info')
+
+    def __init__(self, *pathsegments, fileobj):
+        super().__init__(*pathsegments)
+        self.fileobj = fileobj
+        self._info = None
+
+    def __reduce__(self):
+        raise TypeError(f"cannot pickle {type(self).__name__!r} object")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, TarPath):
+            return NotImplemented
+        return vfspath(self) == vfspath(other) and self.fileobj is other.fileobj
+
+    def __repr__(self):
+        return f'{type(self).__name__}({vfspath(self)!r}, fileobj={self.fileobj!r})'
+
+    def with_segments(self, *pathsegments):
+        return type(self)(*pathsegments, fileobj=self.fileobj)
+
+    @property
+    def info(self):
+        info = self._info
+        if info is None:
+            info = self._info = _TarPathInfo(self.fileobj, vfspath(self))
+        return info
+
+    def _get_file(self):
+        """Return the index and the index entry of this file."""
+        index = _get_index(self.fileobj)
+        entry = _resolve(index, vfspath(self))[1]
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif entry[0] == 'dir':
+            raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+        return index, entry
+
+    def __open_reader__(self):
+        index, (_, offset, size, _) = self._get_file()
+        return io.BufferedReader(_SourceReader(index.source, offset, size))
+
+    def read_bytes(self, *, limiter=None):
+        """
+        Return the binary contents of the file.
+        """
+        index, (_, offset, size, _) = self._get_file()
+        if limiter is not None:
+            limiter.acquire(size)
+        return index.source.pread(offset, size)
+
+    @classmethod
+    def __read_many__(cls, paths):
+        """
+        Yield (path, data) tuples for the given files, as read_many() does.
+        Files are read one at a time in order of their offsets in the
+        archive, so that gzip-compressed archives are decompressed once.
+        """
+        files = [(path, *path._get_file()) for path in paths]
+        files.sort(key=lambda file: (id(file[1]), file[2][1]))
+        for path, index, (_, offset, size, _) in files:
+            yield path, index.source.pread(offset, size)
+
+    def iterdir(self):
+        index = _get_index(self.fileobj)
+        name, entry = _resolve(index, vfspath(self))
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif entry[0] != 'dir':
+            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", vfspath(self))
+        return (self / child for child in tuple(index.children.get(name, ())))
+
+    def readlink(self):
+        index = _get_index(self.fileobj)
+        entry = _resolve(index, vfspath(self), False)[1]
+        if entry is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif entry[0] != 'symlink':
+            raise OSError(errno.EINVAL, "Not a symlink", vfspath(self))
+        return self.with_segments(entry[3])
+
+    def save_index(self, file):
+        """
+        Write the index of this path's archive to the given file, so that
+        load_index() can skip reading the member headers when the archive is
+        next opened.
+        """
+        index = _get_index(self.fileobj)
+        with index.source.lock:
+            key = _archive_key(self.fileobj)
+        data = {
+            'format': _index_format,
+            'key': key,
+            'gzip': isinstance(index.source, _GzipSource),
+            'members': [[name, *entry] for name, entry in index.members.items()],
+        }
+        with open(file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    def load_index(self, file):
+        """
+        Load an index of this path's archive from the given file, which was
+        written by save_index(). Return true if the index was loaded, or
+        false if it was written for a different archive.
+
+        The header of each regular file is checked against the index, so
+        that an index saved for a different archive isn't used. Saved states
+        of the decompressor in gzip-compressed archives aren't included in
+        the index, and are rebuilt as the archive is read.
+        """
+        with open(file, encoding='utf-8') as f:
+            data = json.load(f)
+        fileobj = self.fileobj
+        if data.get('format') != _index_format or data.get('key') != _archive_key(fileobj):
+            return False
+        source = _open_source(fileobj)
+        if isinstance(source, _GzipSource) != data['gzip']:
+            return False
+        members = {name: tuple(entry) for name, *entry in data['members']}
+        if not _check_index(source, members):
+            return False
+        with _indexes_lock:
+            _indexes[fileobj] = _TarIndex(source, members)
+        return True
@@ -0,0 +1,59 @@
+"""
+Rate limiting for copying, reading and walking paths.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of bytes and operations.
+
+    Either rate may be None, meaning unlimited. Each bucket holds up to
+    *burst* seconds' worth of tokens. A caller that takes more tokens than
+    the bucket holds takes them on credit and sleeps until they would have
+    accrued, so that later callers in any thread wait for the debt too.
+    """
+
+    def __init__(self, bytes_per_second=None, ops_per_second=None, *, burst=1.0):
+        for rate in (bytes_per_second, ops_per_second):
+            if rate is not None and rate <= 0:
+                raise ValueError(f"rate must be positive: {rate!r}")
+        if burst <= 0:
+            raise ValueError(f"burst must be positive: {burst!r}")
+        self.bytes_per_second = bytes_per_second
+        self.ops_per_second = ops_per_second
+        self.burst = burst
+        self._clock = time.monotonic
+        self._sleep = time.sleep
+        self._lock = threading.Lock()
+        self._last_time = self._clock()
+        self._bytes = 0 if bytes_per_second is None else bytes_per_second * burst
+        self._ops = 0 if ops_per_second is None else ops_per_second * burst
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(bytes_per_second={self.bytes_per_second!r}, "
+                f"ops_per_second={self.ops_per_second!r}, burst={self.burst!r})")
+
+    def acquire(self, nbytes=0, ops=1):
+        """Take tokens for *nbytes* bytes and *ops* operations, sleeping
+        until they're available."""
+        bytes_rate = self.bytes_per_second
+        ops_rate = self.ops_per_second
+        delay = 0
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._last_time
+            self._last_time = now
+            if bytes_rate is not None:
+                level = min(self._bytes + elapsed * bytes_rate, bytes_rate * self.burst)
+                self._bytes = level = level - nbytes
+                if level < 0:
+                    delay = -level / bytes_rate
+            if ops_rate is not None:
+                level = min(self._ops + elapsed * ops_rate, ops_rate * self.burst)
+                self._ops = level = level - ops
+                if level < 0:
+                    delay = max(delay, -level / ops_rate)
+        if delay > 0:
+            self._sleep(delay)
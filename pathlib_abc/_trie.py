@@ -0,0 +1,244 @@
+"""
+Prefix index over collections of JoinablePath objects.
+"""
+
+from collections.abc import MutableSet
+
+from pathlib_abc import JoinablePath, _explode_path
+from pathlib_abc._glob import _GlobberBase
+from pathlib_abc._os import vfspath
+
+
+class _PathTrieNode:
+    """A node in a PathTrie. The *path* attribute is the member path that
+    ends at this node, or None if the node is only an ancestor of members.
+    """
+    __slots__ = ('children', 'path')
+
+    def __init__(self):
+        self.children = None
+        self.path = None
+
+    def is_dir(self, follow_symlinks=True):
+        return bool(self.children)
+
+
+class _PathTrieGlobber(_GlobberBase):
+    """Provides shell-style globbing over the nodes of a PathTrie. Paths are
+    (node, string) tuples, where node is None if no such node exists.
+    """
+
+    @staticmethod
+    def lexists(path):
+        return path[0] is not None
+
+    @staticmethod
+    def scandir(path):
+        node, path_str = path
+        if node is None or not node.children:
+            return ()
+        return ((child, name, (child, path_str + name))
+                for name, child in node.children.items())
+
+    def concat_path(self, path, text):
+        node, path_str = path
+        for name in text.split(self.sep):
+            if name and node is not None:
+                node = node.children.get(name) if node.children else None
+        return node, path_str + text
+
+    @staticmethod
+    def stringify_path(path):
+        return path[1]
+
+
+class PathTrie(MutableSet):
+    """A set of JoinablePath objects, indexed by their parts.
+
+    Membership tests and prefix queries take time proportional to the depth
+    of the path, rather than to the number of paths in the trie. Paths are
+    compared by their parts alone, so all paths in a trie should share the
+    same flavour.
+    """
+    __slots__ = ('_root', '_len', '_parser')
+
+    def __init__(self, paths=()):
+        self._root = _PathTrieNode()
+        self._len = 0
+        self._parser = None
+        for path in paths:
+            self.add(path)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({list(self)!r})'
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return self._iter_node(self._root)
+
+    def __contains__(self, path):
+        if not isinstance(path, JoinablePath):
+            return False
+        node = self._find(path)
+        return node is not None and node.path is not None
+
+    def _find(self, path):
+        """Return the node for the given path, or None."""
+        node = self._root
+        for part in path.parts:
+            if not node.children:
+                return None
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _find_anchor(self, anchor, normcase):
+        """Return the node for the given anchor, or None. Anchors are
+        compared after case normalization."""
+        children = self._root.children
+        if not children:
+            return None
+        elif anchor in children:
+            return children[anchor]
+        anchor = normcase(anchor)
+        for name, node in children.items():
+            if normcase(name) == anchor:
+                return node
+        return None
+
+    def _relative_root(self, parser):
+        """Return a node whose children are the root's children, less any
+        anchors, so that relative patterns only match relative paths."""
+        node = _PathTrieNode()
+        node.path = self._root.path
+        if self._root.children:
+            node.children = {
+                name: child for name, child in self._root.children.items()
+                if not parser.split(name)[0]}
+        return node
+
+    @staticmethod
+    def _iter_node(node):
+        """Yield member paths at and beneath the given node."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.path is not None:
+                yield node.path
+            if node.children:
+                stack.extend(reversed(node.children.values()))
+
+    def add(self, path):
+        """Add a path to the trie. Nothing happens if an equal path is
+        already present."""
+        if not isinstance(path, JoinablePath):
+            raise TypeError(f"expected JoinablePath, not {type(path).__name__}")
+        node = self._root
+        for part in path.parts:
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _PathTrieNode()
+            node = child
+        if node.path is None:
+            node.path = path
+            self._len += 1
+            if self._parser is None:
+                self._parser = path.parser
+
+    def discard(self, path):
+        """Remove a path from the trie, if present."""
+        if not isinstance(path, JoinablePath):
+            return
+        nodes = [(None, self._root)]
+        for part in path.parts:
+            children = nodes[-1][1].children
+            if not children or part not in children:
+                return
+            nodes.append((part, children[part]))
+        if nodes[-1][1].path is None:
+            return
+        nodes[-1][1].path = None
+        self._len -= 1
+        # Prune nodes that no longer lead to any member.
+        while len(nodes) > 1:
+            part, node = nodes.pop()
+            if node.path is not None or node.children:
+                break
+            parent = nodes[-1][1]
+            del parent.children[part]
+            if not parent.children:
+                parent.children = None
+
+    def clear(self):
+        """Remove all paths from the trie."""
+        self._root = _PathTrieNode()
+        self._len = 0
+
+    def subtree(self, path):
+        """Yield the paths in the trie that are equal to or beneath the given
+        path."""
+        node = self._find(path)
+        if node is not None:
+            yield from self._iter_node(node)
+
+    def children(self, path):
+        """Yield the immediate children of the given path. This includes
+        children that aren't members themselves, but have members beneath
+        them."""
+        node = self._find(path)
+        if node is not None and node.children:
+            for name, child in node.children.items():
+                if child.path is not None:
+                    yield child.path
+                else:
+                    yield path.joinpath(name)
+
+    def longest_prefix(self, path):
+        """Return the longest path in the trie that is equal to or an
+        ancestor of the given path, or None if there is no such path."""
+        node = self._root
+        result = node.path
+        for part in path.parts:
+            if not node.children:
+                break
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.path is not None:
+                result = node.path
+        return result
+
+    def glob(self, pattern):
+        """Yield the paths in the trie that match the given glob-style
+        pattern. The pattern may be a JoinablePath, or a string using the
+        flavour of the paths in the trie. Unlike ReadablePath.glob(),
+        absolute patterns are supported; relative patterns are matched
+        against relative paths.
+        """
+        if isinstance(pattern, JoinablePath):
+            parser = pattern.parser
+            pattern = vfspath(pattern)
+        elif self._parser is None:
+            return iter(())
+        else:
+            parser = self._parser
+        anchor, parts = _explode_path(pattern, parser.split)
+        if not parts:
+            raise ValueError(f"Unacceptable pattern: {pattern!r}")
+        case_sensitive = parser.normcase('Aa') == 'Aa'
+        globber = _PathTrieGlobber(parser.sep, case_sensitive,
+                                   case_pedantic=not case_sensitive,
+                                   recursive=True)
+        select = globber.selector(parts)
+        if anchor:
+            node = self._find_anchor(anchor, parser.normcase)
+        else:
+            node = self._relative_root(parser)
+        paths = select((node, anchor))
+        return (node.path for node, _ in paths
+                if node is not None and node.path is not None)
@@ -0,0 +1,435 @@
+"""
+Implementation of ReadablePath and WritablePath for zip file members.
+"""
+
+import errno
+import hashlib
+import io
+import json
+import os
+import stat
+import threading
+import weakref
+import zipfile
+from bisect import bisect_left
+
+from pathlib_abc import ReadablePath, WritablePath
+from pathlib_abc._interned import InternedPath
+from pathlib_abc._os import vfspath
+from pathlib_abc._resolve import chain_path, resolve_path
+
+
+# Version of the index file format written by ZipPath.save_index().
+_index_format = 2
+
+# Indexes of zip files, keyed by ZipFile object.
+_indexes = weakref.WeakKeyDictionary()
+
+# Locks that serialize writes to zip files, keyed by ZipFile object. zipfile
+# allows only one member to be written at a time.
+_write_locks = weakref.WeakKeyDictionary()
+_write_locks_lock = threading.Lock()
+
+# Indexes of zip files opened for reading, keyed by the file's identity, so
+# that separate ZipFile objects for the same archive share an index.
+_shared_indexes = {}
+_shared_indexes_maxsize = 16
+_shared_indexes_lock = threading.Lock()
+
+
+class _ZipIndex:
+    """Index of the members of a zip file.
+
+    Member names (without trailing slashes) are kept in a sorted list, which
+    makes it possible to find implied directories and the children of a
+    directory by bisection. Directory listings are built on first use and
+    cached.
+    """
+    __slots__ = ('names', 'count', 'listings', 'links')
+
+    def __init__(self, names=(), count=0):
+        self.names = list(names)
+        self.count = count
+        self.listings = {}
+        self.links = {}
+
+    def update(self, filelist):
+        """Add members appended to the zip file since the last update."""
+        new_names = [info.filename.rstrip('/') for info in filelist[self.count:]]
+        self.count = len(filelist)
+        if len(new_names) > len(self.names) // 16:
+            self.names = sorted(set(self.names).union(new_names))
+            self.listings.clear()
+        else:
+            names = self.names
+            listings = self.listings
+            for name in new_names:
+                i = bisect_left(names, name)
+                if i == len(names) or names[i] != name:
+                    names.insert(i, name)
+                # Discard listings of the new member's ancestors.
+                while name:
+                    name = name.rpartition('/')[0]
+                    listings.pop(name, None)
+        self.links.clear()
+
+    def is_dir(self, name):
+        """Return true if any member is beneath the given name."""
+        if not name:
+            return True
+        prefix = name + '/'
+        names = self.names
+        i = bisect_left(names, prefix)
+        return i < len(names) and names[i].startswith(prefix)
+
+    def listdir(self, name):
+        """Return a tuple of the names of children of the given directory."""
+        try:
+            return self.listings[name]
+        except KeyError:
+            pass
+        prefix = name + '/' if name else ''
+        prefix_len = len(prefix)
+        names = self.names
+        children = {}
+        i = bisect_left(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            child, sep, _ = names[i][prefix_len:].partition('/')
+            if child:
+                children[child] = None
+            if sep:
+                # Skip over the rest of this child's descendants.
+                i = bisect_left(names, prefix + child + chr(ord('/') + 1), i + 1)
+            else:
+                i += 1
+        listing = self.listings[name] = tuple(children)
+        return listing
+
+
+def _archive_key(zip_file):
+    """Return a key that identifies the file behind a read-only ZipFile, or
+    None."""
+    if zip_file.mode != 'r' or not isinstance(zip_file.filename, str):
+        return None
+    try:
+        st = os.stat(zip_file.filename)
+    except OSError:
+        return None
+    return (os.path.abspath(zip_file.filename), st.st_dev, st.st_ino,
+            st.st_size, st.st_mtime_ns)
+
+
+def _get_index(zip_file):
+    """Return the up-to-date index for the given ZipFile."""
+    index = _indexes.get(zip_file)
+    if index is None:
+        key = _archive_key(zip_file)
+        with _shared_indexes_lock:
+            index = _indexes.get(zip_file)
+            if index is None:
+                if key is not None:
+                    index = _shared_indexes.pop(key, None)
+                if index is None:
+                    index = _ZipIndex()
+                if key is not None:
+                    _shared_indexes[key] = index
+                    while len(_shared_indexes) > _shared_indexes_maxsize:
+                        del _shared_indexes[next(iter(_shared_indexes))]
+                _indexes[zip_file] = index
+    if index.count != len(zip_file.filelist):
+        index.update(zip_file.filelist)
+    return index
+
+
+def _index_key(zip_file):
+    """Return a key that identifies the members of the given ZipFile, for
+    validating saved indexes."""
+    digest = hashlib.sha256()
+    for info in zip_file.filelist:
+        digest.update(info.filename.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return [len(zip_file.filelist), zip_file.start_dir, digest.hexdigest()]
+
+
+def _get_write_lock(zip_file):
+    """Return the lock that serializes writes to the given ZipFile."""
+    with _write_locks_lock:
+        lock = _write_locks.get(zip_file)
+        if lock is None:
+            lock = _write_locks[zip_file] = threading.RLock()
+        return lock
+
+
+def _get_kind(zip_file, index, name):
+    """Return a (kind, zip_info) tuple for the given member name, where kind
+    is one of 'file', 'dir', 'symlink', or None if the member is missing."""
+    if not name:
+        return 'dir', None
+    name_to_info = zip_file.NameToInfo
+    zip_info = name_to_info.get(name) or name_to_info.get(name + '/')
+    if zip_info is None:
+        if index.is_dir(name):
+            return 'dir', None
+        return None, None
+    mode = zip_info.external_attr >> 16
+    if stat.S_ISLNK(mode):
+        return 'symlink', zip_info
+    elif stat.S_ISDIR(mode) or zip_info.filename.endswith('/'):
+        return 'dir', zip_info
+    else:
+        return 'file', zip_info
+
+
+def _resolve(zip_file, path, follow_symlinks=True):
+    """Resolve the given path within the zip file. Return a (name, kind,
+    zip_info) tuple, where name is the resolved member name, or (None, None,
+    None) if it's missing."""
+    index = _get_index(zip_file)
+
+    def lookup(chain, name):
+        entry = _get_kind(zip_file, index, chain_path(chain, name))
+        return None if entry[0] is None else entry
+
+    def readlink(entry):
+        kind, zip_info = entry
+        if kind != 'symlink':
+            return None
+        target = index.links.get(zip_info.filename)
+        if target is None:
+            target = index.links[zip_info.filename] = zip_file.read(zip_info).decode()
+        return target
+
+    chain, name, entry = resolve_path(path, ('dir', None), lookup, _is_dir, readlink,
+                                      follow_symlinks)
+    if entry is None:
+        return None, None, None
+    return chain_path(chain, name), entry[0], entry[1]
+
+
+def _is_dir(entry):
+    return entry[0] == 'dir'
+
+
+class _ZipPathInfo:
+    """Implementation of pathlib_abc.PathInfo for zip file members."""
+    __slots__ = ('_zip_file', '_path', '_kind', '_lkind')
+
+    def __init__(self, zip_file, path):
+        self._zip_file = zip_file
+        self._path = path
+
+    def __repr__(self):
+        return "<ZipPath.info>"
+
+    def _get_kind(self, follow_symlinks=True):
+        if follow_symlinks:
+            try:
+                return self._kind
+            except AttributeError:
+                self._kind = _resolve(self._zip_file, self._path)[1]
+                return self._kind
+        else:
+            try:
+                return self._lkind
+            except AttributeError:
+                self._lkind = _resolve(self._zip_file, self._path, False)[1]
+                return self._lkind
+
+    def exists(self, *, follow_symlinks=True):
+        """Whether this path exists."""
+        return self._get_kind(follow_symlinks) is not None
+
+    def is_dir(self, *, follow_symlinks=True):
+        """Whether this path is a directory."""
+        return self._get_kind(follow_symlinks) == 'dir'
+
+    def is_file(self, *, follow_symlinks=True):
+        """Whether this path is a regular file."""
+        return self._get_kind(follow_symlinks) == 'file'
+
+    def is_symlink(self):
+        """Whether this path is a symbolic link."""
+        return self._get_kind(follow_symlinks=False) == 'symlink'
+
+    def _size(self, *, follow_symlinks=True):
+        """Return the size in bytes."""
+        name, kind, zip_info = _resolve(self._zip_file, self._path, follow_symlinks)
+        if kind is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", self._path)
+        return 0 if zip_info is None else zip_info.file_size
+
+
+class _ZipWriter(io.BufferedIOBase):
+    """Writer for a zip file member, which holds the zip file's write lock
+    until it's closed."""
+
+    def __init__(self, raw, lock):
+        self._raw = raw
+        self._lock = lock
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self._raw.write(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._raw.close()
+        finally:
+            super().close()
+            self._lock.release()
+
+
+class ZipPath(InternedPath, ReadablePath, WritablePath):
+    """Path object for a member of a zip file.
+
+    Members are looked up in the ZipFile's own name table. Directories
+    without an entry of their own, and the children of directories, are
+    found with an index of sorted member names, which is built on first use
+    and shared by all ZipPath objects for the same ZipFile, and by ZipFile
+    objects that read the same archive file. Members added to the ZipFile
+    are indexed incrementally.
+    """
+    __slots__ = ('zip_file', '_info')
+
+    def __init__(self, *pathsegments, zip_file):
+        super().__init__(*pathsegments)
+        self.zip_file = zip_file
+        self._info = None
+
+    def __reduce__(self):
+        raise TypeError(f"cannot pickle {type(self).__name__!r} object")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, ZipPath):
+            return NotImplemented
+        return vfspath(self) == vfspath(other) and self.zip_file is other.zip_file
+
+    def __repr__(self):
+        return f'{type(self).__name__}({vfspath(self)!r}, zip_file={self.zip_file!r})'
+
+    def with_segments(self, *pathsegments):
+        return type(self)(*pathsegments, zip_file=self.zip_file)
+
+    @property
+    def info(self):
+        info = self._info
+        if info is None:
+            info = self._info = _ZipPathInfo(self.zip_file, vfspath(self))
+        return info
+
+    def __open_reader__(self):
+        name, kind, zip_info = _resolve(self.zip_file, vfspath(self))
+        if kind is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif kind == 'dir':
+            raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+        return self.zip_file.open(zip_info)
+
+    def iterdir(self):
+        name, kind, _ = _resolve(self.zip_file, vfspath(self))
+        if kind is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif kind != 'dir':
+            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", vfspath(self))
+        listing = _get_index(self.zip_file).listdir(name)
+        return (self / child for child in listing)
+
+    def readlink(self):
+        name, kind, zip_info = _resolve(self.zip_file, vfspath(self), False)
+        if kind is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", vfspath(self))
+        elif kind != 'symlink':
+            raise OSError(errno.EINVAL, "Not a symlink", vfspath(self))
+        return self.with_segments(self.zip_file.read(zip_info).decode())
+
+    def _new_member_name(self):
+        """Return the member name for a new file, directory or symlink at
+        this path, raising FileExistsError if it exists."""
+        path = vfspath(self)
+        head, _, tail = path.rpartition('/')
+        name, kind, _ = _resolve(self.zip_file, head)
+        if kind != 'dir':
+            raise FileNotFoundError(errno.ENOENT, "File not found", path)
+        name = f'{name}/{tail}' if name else tail
+        if tail in ('', '.', '..') or _get_kind(self.zip_file, _get_index(self.zip_file), name)[0]:
+            raise FileExistsError(errno.EEXIST, "File exists", path)
+        return name
+
+    def __open_writer__(self, mode):
+        if mode == 'a':
+            raise io.UnsupportedOperation("zip file members can't be appended to")
+        lock = _get_write_lock(self.zip_file)
+        lock.acquire()
+        try:
+            name, kind, _ = _resolve(self.zip_file, vfspath(self))
+            if kind == 'dir':
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", vfspath(self))
+            elif kind is None:
+                name = self._new_member_name()
+            elif mode == 'x':
+                raise FileExistsError(errno.EEXIST, "File exists", vfspath(self))
+            return _ZipWriter(self.zip_file.open(name, 'w'), lock)
+        except BaseException:
+            lock.release()
+            raise
+
+    def mkdir(self):
+        """
+        Create a new directory at this given path.
+        """
+        with _get_write_lock(self.zip_file):
+            zip_info = zipfile.ZipInfo(self._new_member_name() + '/')
+            zip_info.external_attr |= stat.S_IFDIR << 16
+            zip_info.external_attr |= stat.FILE_ATTRIBUTE_DIRECTORY
+            self.zip_file.writestr(zip_info, '')
+
+    def symlink_to(self, target, target_is_directory=False):
+        """
+        Make this path a symlink pointing to the target path.
+        """
+        if not isinstance(target, str):
+            target = vfspath(target)
+        with _get_write_lock(self.zip_file):
+            zip_info = zipfile.ZipInfo(self._new_member_name())
+            zip_info.external_attr = stat.S_IFLNK << 16
+            if target_is_directory:
+                zip_info.external_attr |= stat.FILE_ATTRIBUTE_DIRECTORY
+            self.zip_file.writestr(zip_info, target)
+
+    def save_index(self, file):
+        """
+        Write the index of this path's zip file to the given file, so that
+        load_index() can skip building it when the archive is next opened.
+        """
+        zip_file = self.zip_file
+        index = _get_index(zip_file)
+        data = {
+            'format': _index_format,
+            'key': _index_key(zip_file),
+            'names': index.names,
+        }
+        with open(file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    def load_index(self, file):
+        """
+        Load an index of this path's zip file from the given file, which was
+        written by save_index(). Return true if the index was loaded, or
+        false if it was written for a different archive.
+        """
+        with open(file, encoding='utf-8') as f:
+            data = json.load(f)
+        zip_file = self.zip_file
+        key = _index_key(zip_file)
+        if data.get('format') != _index_format or data.get('key') != key:
+            return False
+        with _shared_indexes_lock:
+            _indexes[zip_file] = _ZipIndex(data['names'], key[0])
+        return True
@@ -0,0 +1,74 @@
+"""
+MemoryPathGround is defined here. It helps establish the "ground truth" about
+in-memory paths in tests.
+"""
+
+from . import is_pypi
+
+if is_pypi:
+    from pathlib_abc._memory import _MemoryDir
+
+
+class MemoryPathGround:
+    can_symlink = True
+
+    def __init__(self, path_cls):
+        self.path_cls = path_cls
+
+    def setup(self, local_suffix=""):
+        return self.path_cls()
+
+    def teardown(self, root):
+        pass
+
+    def _get_dir(self, p):
+        directory = p.fs.root
+        for name in p.parts:
+            directory = directory[name]
+        return directory
+
+    def _get(self, p):
+        return self._get_dir(p.parent).get(p.name)
+
+    def create_file(self, p, data=b''):
+        self._get_dir(p.parent)[p.name] = data
+
+    def create_dir(self, p):
+        self._get_dir(p.parent)[p.name] = _MemoryDir(owner=p.fs.token)
+
+    def create_symlink(self, p, target):
+        self._get_dir(p.parent)[p.name] = target
+
+    def create_hierarchy(self, p):
+        self.create_dir(p.joinpath('dirA'))
+        self.create_dir(p.joinpath('dirB'))
+        self.create_dir(p.joinpath('dirC'))
+        self.create_dir(p.joinpath('dirC', 'dirD'))
+        self.create_file(p.joinpath('fileA'), b'this is file A\n')
+        self.create_file(p.joinpath('dirB', 'fileB'), b'this is file B\n')
+        self.create_file(p.joinpath('dirC', 'fileC'), b'this is file C\n')
+        self.create_file(p.joinpath('dirC', 'novel.txt'), b'this is a novel\n')
+        self.create_file(p.joinpath('dirC', 'dirD', 'fileD'), b'this is file D\n')
+        self.create_symlink(p.joinpath('linkA'), 'fileA')
+        self.create_symlink(p.joinpath('brokenLink'), 'non-existing')
+        self.create_symlink(p.joinpath('linkB'), 'dirB')
+        self.create_symlink(p.joinpath('dirA', 'linkC'), '../dirB')
+        self.create_symlink(p.joinpath('brokenLinkLoop'), 'brokenLinkLoop')
+
+    def readtext(self, p):
+        return self.readbytes(p).decode('utf-8')
+
+    def readbytes(self, p):
+        return self._get(p)
+
+    def readlink(self, p):
+        return self._get(p)
+
+    def isdir(self, p):
+        return isinstance(self._get(p), _MemoryDir)
+
+    def isfile(self, p):
+        return isinstance(self._get(p), bytes)
+
+    def islink(self, p):
+        return isinstance(self._get(p), str)
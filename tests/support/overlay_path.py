@@ -0,0 +1,90 @@
+"""
+OverlayPathGround is defined here. It helps establish the "ground truth" about
+overlay paths in tests.
+
+The overlay has two in-memory layers. Directories are created in both layers,
+and files and symlinks are created in each layer in turn, so that every
+directory's contents are merged from both layers.
+"""
+
+from . import is_pypi
+
+if is_pypi:
+    from pathlib_abc import MemoryPath, vfspath
+
+
+class OverlayPathGround:
+    can_symlink = True
+
+    def __init__(self, path_cls):
+        self.path_cls = path_cls
+
+    def setup(self, local_suffix=""):
+        self.count = 0
+        return self.path_cls(layers=[MemoryPath(), MemoryPath()])
+
+    def teardown(self, root):
+        pass
+
+    def _layer_paths(self, p):
+        return [layer.joinpath(vfspath(p)) for layer in p.layers]
+
+    def _next_layer_path(self, p):
+        self.count += 1
+        return self._layer_paths(p)[self.count % 2]
+
+    def _get(self, p):
+        for layer_path in self._layer_paths(p):
+            if layer_path.info.exists(follow_symlinks=False):
+                return layer_path
+        return None
+
+    def create_file(self, p, data=b''):
+        self._next_layer_path(p).write_bytes(data)
+        p.clear_cache()
+
+    def create_dir(self, p):
+        for layer_path in self._layer_paths(p):
+            layer_path.mkdir()
+        p.clear_cache()
+
+    def create_symlink(self, p, target):
+        self._next_layer_path(p).symlink_to(target)
+        p.clear_cache()
+
+    def create_hierarchy(self, p):
+        self.create_dir(p.joinpath('dirA'))
+        self.create_dir(p.joinpath('dirB'))
+        self.create_dir(p.joinpath('dirC'))
+        self.create_dir(p.joinpath('dirC', 'dirD'))
+        self.create_file(p.joinpath('fileA'), b'this is file A\n')
+        self.create_file(p.joinpath('dirB', 'fileB'), b'this is file B\n')
+        self.create_file(p.joinpath('dirC', 'fileC'), b'this is file C\n')
+        self.create_file(p.joinpath('dirC', 'novel.txt'), b'this is a novel\n')
+        self.create_file(p.joinpath('dirC', 'dirD', 'fileD'), b'this is file D\n')
+        self.create_symlink(p.joinpath('linkA'), 'fileA')
+        self.create_symlink(p.joinpath('brokenLink'), 'non-existing')
+        self.create_symlink(p.joinpath('linkB'), 'dirB')
+        self.create_symlink(p.joinpath('dirA', 'linkC'), '../dirB')
+        self.create_symlink(p.joinpath('brokenLinkLoop'), 'brokenLinkLoop')
+
+    def readtext(self, p):
+        return self.readbytes(p).decode('utf-8')
+
+    def readbytes(self, p):
+        return self._get(p).read_bytes()
+
+    def readlink(self, p):
+        return vfspath(self._get(p).readlink())
+
+    def isdir(self, p):
+        layer_path = self._get(p)
+        return layer_path is not None and layer_path.info.is_dir(follow_symlinks=False)
+
+    def isfile(self, p):
+        layer_path = self._get(p)
+        return layer_path is not None and layer_path.info.is_file(follow_symlinks=False)
+
+    def islink(self, p):
+        layer_path = self._get(p)
+        return layer_path is not None and layer_path.info.is_symlink()
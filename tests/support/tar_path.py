@@ -0,0 +1,98 @@
+"""
+TarPathGround is defined here. It helps establish the "ground truth" about
+tar archive members in tests.
+"""
+
+import gzip
+import io
+import tarfile
+
+from . import is_pypi
+
+if is_pypi:
+    from pathlib_abc import vfspath
+    from pathlib_abc import _tar
+
+
+class TarPathGround:
+    can_symlink = True
+
+    def __init__(self, path_cls, compress=False):
+        self.path_cls = path_cls
+        self.compress = compress
+
+    def setup(self, local_suffix=""):
+        self.members = {}
+        return self.path_cls(fileobj=io.BytesIO())
+
+    def teardown(self, root):
+        pass
+
+    def _add(self, path, type, data=b'', linkname=''):
+        tarinfo = tarfile.TarInfo(vfspath(path))
+        tarinfo.type = type
+        tarinfo.size = len(data)
+        tarinfo.linkname = linkname
+        self.members[vfspath(path)] = tarinfo, data
+        # Rewrite the archive, and discard the stale index.
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode='w') as tar:
+            for tarinfo, data in self.members.values():
+                tar.addfile(tarinfo, io.BytesIO(data))
+        data = buf.getvalue()
+        if self.compress:
+            data = gzip.compress(data)
+        fileobj = path.fileobj
+        fileobj.seek(0)
+        fileobj.truncate()
+        fileobj.write(data)
+        _tar._indexes.pop(fileobj, None)
+
+    def create_file(self, p, data=b''):
+        self._add(p, tarfile.REGTYPE, data)
+
+    def create_dir(self, p):
+        self._add(p, tarfile.DIRTYPE)
+
+    def create_symlink(self, p, target):
+        self._add(p, tarfile.SYMTYPE, linkname=target)
+
+    def create_hierarchy(self, p):
+        self.create_dir(p.joinpath('dirA'))
+        self.create_dir(p.joinpath('dirB'))
+        self.create_dir(p.joinpath('dirC'))
+        self.create_dir(p.joinpath('dirC', 'dirD'))
+        self.create_file(p.joinpath('fileA'), b'this is file A\n')
+        self.create_file(p.joinpath('dirB', 'fileB'), b'this is file B\n')
+        self.create_file(p.joinpath('dirC', 'fileC'), b'this is file C\n')
+        self.create_file(p.joinpath('dirC', 'novel.txt'), b'this is a novel\n')
+        self.create_file(p.joinpath('dirC', 'dirD', 'fileD'), b'this is file D\n')
+        self.create_symlink(p.joinpath('linkA'), 'fileA')
+        self.create_symlink(p.joinpath('brokenLink'), 'non-existing')
+        self.create_symlink(p.joinpath('linkB'), 'dirB')
+        self.create_symlink(p.joinpath('dirA', 'linkC'), '../dirB')
+        self.create_symlink(p.joinpath('brokenLinkLoop'), 'brokenLinkLoop')
+
+    def _get(self, p):
+        return self.members.get(vfspath(p), (None, None))
+
+    def readtext(self, p):
+        return self.readbytes(p).decode('utf-8')
+
+    def readbytes(self, p):
+        return self._get(p)[1]
+
+    def readlink(self, p):
+        return self._get(p)[0].linkname
+
+    def isdir(self, p):
+        tarinfo = self._get(p)[0]
+        return tarinfo is not None and tarinfo.isdir()
+
+    def isfile(self, p):
+        tarinfo = self._get(p)[0]
+        return tarinfo is not None and tarinfo.isreg()
+
+    def islink(self, p):
+        tarinfo = self._get(p)[0]
+        return tarinfo is not None and tarinfo.issym()
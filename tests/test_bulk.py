@@ -0,0 +1,128 @@
+"""
+Tests for pathlib_abc.read_many()
+"""
+
+import io
+import tarfile
+import threading
+import unittest
+import zipfile
+
+from .support import is_pypi
+
+if is_pypi:
+    from pathlib_abc import MemoryPath, TarPath, ZipPath, read_many
+
+
+class FakeInfo:
+    def __init__(self, size):
+        self.size = size
+
+    def _size(self):
+        return self.size
+
+
+class FakePath:
+    """Stands in for a file, recording how many are read at once."""
+    lock = threading.Lock()
+    reading = 0
+    max_reading = 0
+
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+        self.info = FakeInfo(len(data or b''))
+
+    def read_bytes(self):
+        cls = type(self)
+        with cls.lock:
+            cls.reading += 1
+            cls.max_reading = max(cls.max_reading, cls.reading)
+        try:
+            if self.data is None:
+                raise FileNotFoundError(self.name)
+            return self.data
+        finally:
+            with cls.lock:
+                cls.reading -= 1
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class ReadManyTest(unittest.TestCase):
+    def test_read_many_zip(self):
+        with zipfile.ZipFile(io.BytesIO(), 'w') as zip_file:
+            root = ZipPath(zip_file=zip_file)
+            expected = {}
+            for i in range(50):
+                path = root / f'file{i}.json'
+                data = f'{{"id": {i}}}'.encode()
+                path.write_bytes(data)
+                expected[path] = data
+            result = dict(read_many(root.glob('*.json'), max_workers=4))
+            self.assertEqual(result, expected)
+
+    def test_read_many_empty(self):
+        self.assertEqual(list(read_many([])), [])
+
+    def test_read_many_max_bytes(self):
+        FakePath.max_reading = 0
+        paths = [FakePath(f'file{i}', bytes(100)) for i in range(20)]
+        result = list(read_many(paths, max_workers=8, max_bytes=250))
+        self.assertEqual(len(result), 20)
+        self.assertEqual({data for path, data in result}, {bytes(100)})
+        self.assertLessEqual(FakePath.max_reading, 2)
+
+    def test_read_many_max_bytes_large_file(self):
+        # A file larger than max_bytes is still read, on its own.
+        paths = [FakePath('big', bytes(1000)), FakePath('small', b'x')]
+        result = dict((path.name, data) for path, data in read_many(paths, max_bytes=10))
+        self.assertEqual(result, {'big': bytes(1000), 'small': b'x'})
+
+    def test_read_many_error(self):
+        paths = [FakePath('a', b'a'), FakePath('missing', None)]
+        with self.assertRaises(FileNotFoundError):
+            list(read_many(paths, max_workers=1))
+
+    def test_read_many_max_workers(self):
+        self.assertRaises(ValueError, list, read_many([], max_workers=0))
+
+    def test_read_many_memory_path(self):
+        root = MemoryPath()
+        (root / 'a').write_bytes(b'this is a\n')
+        (root / 'b').write_bytes(b'this is b\n')
+        calls = []
+
+        class RecordingMemoryPath(MemoryPath):
+            __slots__ = ()
+
+            @classmethod
+            def __read_many__(cls, paths):
+                calls.append(paths)
+                return super().__read_many__(paths)
+
+        root = RecordingMemoryPath(fs=root.fs)
+        paths = [root / 'a', root / 'b']
+        result = list(read_many(paths))
+        self.assertEqual(result, [(paths[0], b'this is a\n'), (paths[1], b'this is b\n')])
+        self.assertEqual(calls, [paths])
+
+    def test_read_many_tar_path(self):
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode='w') as tar:
+            for name in ('a', 'b', 'c'):
+                data = f'this is {name}\n'.encode()
+                tarinfo = tarfile.TarInfo(name)
+                tarinfo.size = len(data)
+                tar.addfile(tarinfo, io.BytesIO(data))
+        buf.seek(0)
+        root = TarPath(fileobj=buf)
+        # Files are read in archive order.
+        result = list(read_many([root / 'c', root / 'a', root / 'b']))
+        self.assertEqual(result, [(root / 'a', b'this is a\n'),
+                                  (root / 'b', b'this is b\n'),
+                                  (root / 'c', b'this is c\n')])
+        self.assertRaises(FileNotFoundError, list, read_many([root / 'd']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,18 @@ Tests for copying from pathlib.types._ReadablePath to _WritablePath.
 """
 
 import contextlib
+import errno
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
 import unittest
+from unittest import mock
 
 from .support import is_pypi
-from .support.local_path import LocalPathGround
+from .support.local_path import LocalPathGround, ReadableLocalPath, WritableLocalPath
 from .support.zip_path import ZipPathGround, ReadableZipPath, WritableZipPath
 
 
@@ -43,7 +51,8 @@ class CopyTestBase:
         target = self.target_root / 'copyA'
         self.target_ground.create_file(target, b'this is a copy\n')
         with contextlib.ExitStack() as stack:
-            if isinstance(target, WritableZipPath):
+            if hasattr(target, 'zip_file'):
+                # zipfile warns about the duplicate member name.
                 stack.enter_context(self.assertWarns(UserWarning))
             result = source.copy(target)
         self.assertEqual(result, target)
@@ -76,6 +85,224 @@ class CopyTestBase:
         self.assertTrue(self.target_ground.isfile(target / 'dirD' / 'fileD'))
         self.assertEqual(self.target_ground.readtext(target / 'dirD' / 'fileD'), 'this is file D\n')
 
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_max_workers(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        result = source.copy(target, max_workers=2)
+        self.assertEqual(result, target)
+        self.assertTrue(self.target_ground.isdir(target))
+        self.assertEqual(self.target_ground.readtext(target / 'fileC'), 'this is file C\n')
+        self.assertEqual(self.target_ground.readtext(target / 'novel.txt'), 'this is a novel\n')
+        self.assertTrue(self.target_ground.isdir(target / 'dirD'))
+        self.assertEqual(self.target_ground.readtext(target / 'dirD' / 'fileD'), 'this is file D\n')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_max_workers_error(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        error = OSError(errno.EIO, "I/O error")
+        with mock.patch('pathlib_abc.copyfileobj', side_effect=error):
+            with self.assertRaises(OSError) as cm:
+                source.copy(target, max_workers=2)
+        self.assertIs(cm.exception, error)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_dedup(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        self.source_ground.create_file(source / 'dup', b'this is file C\n')
+        dedup = {}
+        source.copy(target, dedup=dedup)
+        self.assertEqual(self.target_ground.readtext(target / 'fileC'), 'this is file C\n')
+        self.assertEqual(self.target_ground.readtext(target / 'dup'), 'this is file C\n')
+        self.assertEqual(self.target_ground.readtext(target / 'novel.txt'), 'this is a novel\n')
+        self.assertEqual(self.target_ground.readtext(target / 'dirD' / 'fileD'), 'this is file D\n')
+        self.assertEqual(len(dedup), 3)
+        self.assertIn(dedup[hashlib.sha256(b'this is file C\n').hexdigest()],
+                      {target / 'fileC', target / 'dup'})
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_file_dedup_skip(self):
+        source = self.source_root / 'fileA'
+        target = self.target_root / 'copyA'
+        dedup = {}
+        source.copy(target, dedup=dedup, dedup_link=None)
+        self.assertEqual(list(dedup.values()), [target])
+        with mock.patch('pathlib_abc.copyfileobj') as copyfileobj:
+            source.copy(target, dedup=dedup, dedup_link=None)
+        copyfileobj.assert_not_called()
+        self.assertEqual(self.target_ground.readtext(target), 'this is file A\n')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_file_dedup_read_once(self):
+        source = self.source_root / 'fileA'
+        target = self.target_root / 'copyA'
+        if not hasattr(target, 'info'):
+            self.skipTest('needs a target with info')
+        with mock.patch('pathlib_abc.vfsopen', wraps=vfsopen) as vfsopen_mock:
+            source.copy(target, dedup={})
+        self.assertEqual([call.args[1] for call in vfsopen_mock.call_args_list], ['wb', 'rb'])
+        self.assertEqual(self.target_ground.readtext(target), 'this is file A\n')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dedup_link_error(self):
+        source = self.source_root / 'fileA'
+        target = self.target_root / 'copyA'
+        self.assertRaises(ValueError, source.copy, target, dedup={}, dedup_link='symlink')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_progress(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        reports = []
+        progress = CopyProgress(reports.append, interval=0)
+        source.copy(target, progress=progress)
+        self.assertEqual(progress.files_started, 3)
+        self.assertEqual(progress.files_finished, 3)
+        self.assertEqual(progress.bytes_copied, 46)
+        self.assertIsNotNone(progress.strategy)
+        self.assertTrue(progress.finished)
+        self.assertGreaterEqual(progress.throughput, 0)
+        # Reported as each file is started and finished, and at the end.
+        self.assertGreater(len(reports), 6)
+        # Each report is a snapshot.
+        self.assertEqual(reports[0].files_finished, 0)
+        self.assertIsNot(reports[-1], progress)
+        self.assertTrue(reports[-1].finished)
+        self.assertEqual(reports[-1].files_finished, 3)
+        self.assertEqual(reports[-1].bytes_copied, 46)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_progress_reentrant(self):
+        # The callback is called without the lock held, so it can update
+        # the progress object itself.
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        updates = []
+
+        def callback(snapshot):
+            if not updates:
+                updates.append(snapshot.throughput)
+                progress.update(0, 'custom')
+
+        progress = CopyProgress(callback, interval=0)
+        source.copy(target, max_workers=2, progress=progress)
+        self.assertEqual(len(updates), 1)
+        self.assertTrue(progress.finished)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_progress_rate_limited(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        reports = []
+        source.copy(target, progress=CopyProgress(reports.append, interval=3600))
+        self.assertEqual(len(reports), 1)
+        self.assertTrue(reports[0].finished)
+        self.assertEqual(reports[0].files_finished, 3)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_progress_callback(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        reports = []
+        source.copy(target, max_workers=2, progress=reports.append)
+        self.assertEqual(reports[-1].files_finished, 3)
+        self.assertEqual(reports[-1].bytes_copied, 46)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_progress_abort(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+
+        def callback(progress):
+            if progress.files_started:
+                raise KeyboardInterrupt
+
+        progress = CopyProgress(callback, interval=0)
+        self.assertRaises(KeyboardInterrupt, source.copy, target, progress=progress)
+        self.assertFalse(progress.finished)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_limiter(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        calls = []
+        limiter = RateLimiter(bytes_per_second=10, ops_per_second=10)
+        limiter._sleep = calls.append
+        source.copy(target, limiter=limiter)
+        self.assertEqual(self.target_ground.readtext(target / 'fileC'), 'this is file C\n')
+        self.assertEqual(self.target_ground.readtext(target / 'dirD' / 'fileD'), 'this is file D\n')
+        # 46 bytes were copied, with a burst allowance of 10 bytes.
+        self.assertGreaterEqual(sum(calls), 3.5)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_file_limiter_ops(self):
+        # Copying a file in several chunks is one operation.
+        source = self.source_root / 'big'
+        target = self.target_root / 'copyBig'
+        data = bytes(range(256)) * (3 * 4096 + 1)
+        self.source_ground.create_file(source, data)
+        calls = []
+        limiter = RateLimiter(bytes_per_second=10**12, ops_per_second=1)
+        limiter._sleep = calls.append
+        source.copy(target, limiter=limiter)
+        self.assertEqual(self.target_ground.readbytes(target), data)
+        self.assertEqual(calls, [])
+
+    def make_journal_path(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        return os.path.join(tmpdir.name, 'journal')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_dir_journal_resume(self):
+        source = self.source_root / 'dirC'
+        target = self.target_root / 'copyC'
+        journal = self.make_journal_path()
+        copied = []
+
+        def copy_file(journal, source, target):
+            if len(copied) == 2:
+                raise OSError(errno.EIO, "I/O error")
+            copy_file_orig(journal, source, target)
+            if not journal.files.get(vfspath(target)):
+                copied.append(source.name)
+
+        copy_file_orig = _journal.CopyJournal.copy_file
+        with mock.patch.object(_journal.CopyJournal, 'copy_file', copy_file):
+            self.assertRaises(OSError, source.copy, target, journal=journal)
+            self.assertTrue(os.path.exists(journal))
+            del copied[:]
+            source.copy(target, journal=journal)
+        self.assertEqual(len(copied), 1)
+        self.assertFalse(os.path.exists(journal))
+        self.assertEqual(self.target_ground.readtext(target / 'fileC'), 'this is file C\n')
+        self.assertEqual(self.target_ground.readtext(target / 'novel.txt'), 'this is a novel\n')
+        self.assertEqual(self.target_ground.readtext(target / 'dirD' / 'fileD'), 'this is file D\n')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_file_journal_resume_partial(self):
+        if hasattr(self.target_root, 'zip_file'):
+            self.skipTest('needs a target that can be resumed')
+        source = self.source_root / 'fileA'
+        target = self.target_root / 'copyA'
+        journal = self.make_journal_path()
+        # Simulate a copy interrupted after five bytes.
+        self.target_ground.create_file(target, b'XXXXX')
+        with open(journal, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(['part', vfspath(target), 5]) + '\n["fi')
+        with mock.patch('pathlib_abc._journal._progress_interval', 4):
+            source.copy(target, journal=journal)
+        self.assertEqual(self.target_ground.readbytes(target), b'XXXXXis file A\n')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_copy_journal_dedup_error(self):
+        source = self.source_root / 'fileA'
+        target = self.target_root / 'copyA'
+        self.assertRaises(ValueError, source.copy, target, journal=self.make_journal_path(),
+                          dedup={})
+
     def test_copy_dir_follow_symlinks_true(self):
         if not self.source_ground.can_symlink:
             self.skipTest('needs symlink support on source')
@@ -152,6 +379,265 @@ class ZipToZipPathCopyTest(CopyTestBase, unittest.TestCase):
     target_ground = ZipPathGround(WritableZipPath)
 
 
+if is_pypi:
+    from pathlib_abc import CopyProgress, MemoryPath, OverlayPath, RateLimiter, TarPath, ZipPath, vfspath
+    from pathlib_abc import _journal
+    from pathlib_abc._os import PathInfo, copy_info, vfsopen
+    from .support.memory_path import MemoryPathGround
+    from .support.overlay_path import OverlayPathGround
+    from .support.tar_path import TarPathGround
+
+    class IndexedZipToIndexedZipPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = ZipPathGround(ZipPath)
+        target_ground = ZipPathGround(ZipPath)
+
+    class MemoryToIndexedZipPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = MemoryPathGround(MemoryPath)
+        target_ground = ZipPathGround(ZipPath)
+
+    class MemoryToMemoryPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = MemoryPathGround(MemoryPath)
+        target_ground = MemoryPathGround(MemoryPath)
+
+    class ZipToMemoryPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = ZipPathGround(ReadableZipPath)
+        target_ground = MemoryPathGround(MemoryPath)
+
+    class MemoryToZipPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = MemoryPathGround(MemoryPath)
+        target_ground = ZipPathGround(WritableZipPath)
+
+    class OverlayToMemoryPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = OverlayPathGround(OverlayPath)
+        target_ground = MemoryPathGround(MemoryPath)
+
+    class GzipTarToMemoryPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = TarPathGround(TarPath, compress=True)
+        target_ground = MemoryPathGround(MemoryPath)
+
+    class HardlinkLocalPath(WritableLocalPath):
+        __slots__ = ()
+
+        def hardlink_to(self, target):
+            os.link(target, self)
+
+    class MemoryToLocalPathCopyTest(CopyTestBase, unittest.TestCase):
+        source_ground = MemoryPathGround(MemoryPath)
+        target_ground = LocalPathGround(HardlinkLocalPath)
+
+        def test_copy_dir_dedup_hardlink(self):
+            source = self.source_root / 'dirC'
+            target = self.target_root / 'copyC'
+            self.source_ground.create_file(source / 'dup', b'this is file C\n')
+            source.copy(target, dedup={}, dedup_link='hardlink')
+            self.assertEqual(self.target_ground.readtext(target / 'dup'), 'this is file C\n')
+            self.assertTrue(os.path.samefile(target / 'fileC', target / 'dup'))
+            self.assertFalse(os.path.samefile(target / 'fileC', target / 'novel.txt'))
+
+    class MetadataLocalPath(ReadableLocalPath):
+        __slots__ = ()
+
+        def __init__(self, *pathsegments):
+            super().__init__(*pathsegments)
+            self.info = PathInfo(os.fspath(self))
+
+    class LocalPathPreserveCopyTest(unittest.TestCase):
+        def setUp(self):
+            self.ground = LocalPathGround(MetadataLocalPath)
+            self.source_root = self.ground.setup()
+            self.ground.create_hierarchy(self.source_root)
+            self.target_root = self.ground.setup(local_suffix="_target")
+            self.target_root = WritableLocalPath(self.target_root)
+
+        def tearDown(self):
+            self.ground.teardown(self.source_root)
+            self.ground.teardown(self.target_root)
+
+        def assertSameMetadata(self, source, target, follow_symlinks=True):
+            source_st = os.stat(source, follow_symlinks=follow_symlinks)
+            target_st = os.stat(target, follow_symlinks=follow_symlinks)
+            self.assertEqual(source_st.st_mode, target_st.st_mode)
+            self.assertEqual(source_st.st_mtime_ns, target_st.st_mtime_ns)
+
+        def test_copy_dir_preserve_metadata(self):
+            source = self.source_root / 'dirC'
+            target = self.target_root / 'copyC'
+            os.chmod(source / 'fileC', 0o640)
+            os.chmod(source / 'dirD', 0o750)
+            for i, path in enumerate([source / 'fileC', source / 'dirD' / 'fileD',
+                                      source / 'dirD', source]):
+                os.utime(path, ns=(10**18, 10**18 + i * 10**9))
+            with mock.patch('pathlib_abc.copy_info', wraps=copy_info) as mock_copy_info:
+                source.copy(target, preserve_metadata=True)
+            for path in ('fileC', 'novel.txt', 'dirD/fileD', 'dirD', ''):
+                self.assertSameMetadata(source / path, target / path)
+            # Regular files are updated through their file descriptors.
+            targets = [call.args[1] for call in mock_copy_info.call_args_list]
+            self.assertEqual(sum(isinstance(target, int) for target in targets), 3)
+
+        def test_copy_dir_preserve_metadata_symlinks(self):
+            source = self.source_root / 'dirA'
+            target = self.target_root / 'copyA'
+            os.utime(source / 'linkC', ns=(10**18, 10**18), follow_symlinks=False)
+            source.copy(target, follow_symlinks=False, preserve_metadata=True)
+            self.assertSameMetadata(source / 'linkC', target / 'linkC', follow_symlinks=False)
+            self.assertSameMetadata(source, target)
+
+        def test_copy_file_preserve_metadata_xattrs(self):
+            source = self.source_root / 'fileA'
+            target = self.target_root / 'copyA'
+            try:
+                os.setxattr(source, 'user.foo', b'42')
+            except (AttributeError, OSError):
+                self.skipTest('extended attributes are unsupported')
+            source.copy(target, preserve_metadata=True, max_workers=2)
+            self.assertEqual(os.getxattr(target, 'user.foo'), b'42')
+
+        def test_copy_dir_preserve_hardlinks(self):
+            source = self.source_root / 'dirC'
+            target = HardlinkLocalPath(self.target_root, 'copyC')
+            os.link(source / 'fileC', source / 'dirD' / 'linkC')
+            os.link(source / 'fileC', source / 'linkC')
+            for max_workers in (None, 2):
+                with self.subTest(max_workers=max_workers):
+                    source.copy(target, preserve_hardlinks=True, max_workers=max_workers)
+                    self.assertEqual(self.ground.readtext(target / 'linkC'), 'this is file C\n')
+                    self.assertEqual(os.stat(target / 'fileC').st_nlink, 3)
+                    self.assertTrue(os.path.samefile(target / 'fileC', target / 'dirD' / 'linkC'))
+                    self.assertFalse(os.path.samefile(target / 'fileC', target / 'novel.txt'))
+                    self.ground.teardown(target)
+
+        def test_copy_dir_preserve_hardlinks_unsupported_target(self):
+            source = self.source_root / 'dirC'
+            target = MemoryPath('copyC')
+            os.link(source / 'fileC', source / 'linkC')
+            source.copy(target, preserve_hardlinks=True)
+            self.assertEqual((target / 'linkC').read_bytes(), b'this is file C\n')
+
+        def test_copy_tar_preserve_hardlinks(self):
+            buf = io.BytesIO()
+            with tarfile.open(fileobj=buf, mode='w') as tar:
+                data = b'this is file A\n'
+                info = tarfile.TarInfo('fileA')
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+                info = tarfile.TarInfo('linkA')
+                info.type = tarfile.LNKTYPE
+                info.linkname = 'fileA'
+                tar.addfile(info)
+                info = tarfile.TarInfo('fileB')
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+            source = TarPath(fileobj=buf)
+            target = HardlinkLocalPath(self.target_root, 'copy')
+            progress = CopyProgress()
+            source.copy(target, preserve_hardlinks=True, progress=progress)
+            self.assertEqual(self.ground.readbytes(target / 'linkA'), data)
+            self.assertTrue(os.path.samefile(target / 'fileA', target / 'linkA'))
+            self.assertFalse(os.path.samefile(target / 'fileA', target / 'fileB'))
+            self.assertEqual(progress.files_finished, 2)
+
+        def test_copy_dir_preserve_metadata_unsupported_target(self):
+            source = self.source_root / 'dirC'
+            target = MemoryPath('copyC')
+            source.copy(target, preserve_metadata=True)
+            self.assertEqual((target / 'fileC').read_bytes(), b'this is file C\n')
+
+    @unittest.skipUnless(hasattr(os, 'SEEK_DATA'), "requires SEEK_DATA")
+    class SparseCopyTest(unittest.TestCase):
+        size = 16 * 1024 * 1024
+
+        def setUp(self):
+            tmpdir = tempfile.TemporaryDirectory()
+            self.addCleanup(tmpdir.cleanup)
+            self.source = MetadataLocalPath(tmpdir.name, 'source')
+            self.target = HardlinkLocalPath(tmpdir.name, 'target')
+            with open(self.source, 'wb') as f:
+                f.truncate(self.size)
+                f.seek(1024 * 1024)
+                f.write(b'data' * 1024)
+                f.seek(8 * 1024 * 1024)
+                f.write(b'more' * 1024)
+            if os.stat(self.source).st_blocks * 512 >= self.size:
+                self.skipTest('sparse files are unsupported')
+            with open(self.source, 'rb') as f:
+                self.data = f.read()
+
+        def assertSparseCopy(self):
+            with open(self.target, 'rb') as f:
+                self.assertEqual(f.read(), self.data)
+            self.assertLess(os.stat(self.target).st_blocks * 512, self.size // 2)
+
+        def test_copy_sparse(self):
+            progress = CopyProgress()
+            self.source.copy(self.target, progress=progress)
+            self.assertSparseCopy()
+            # Files are cloned where possible, which also preserves holes.
+            self.assertIn(progress.strategy, ('sparse', 'ficlone', 'fcopyfile'))
+            if progress.strategy == 'sparse':
+                self.assertLess(progress.bytes_copied, self.size // 2)
+
+        def test_copy_sparse_limiter(self):
+            # The OS copy functions are bypassed, but holes are still skipped.
+            limiter = RateLimiter(bytes_per_second=10**12)
+            self.source.copy(self.target, limiter=limiter)
+            self.assertSparseCopy()
+
+        def test_copy_sparse_trailing_hole(self):
+            with open(self.source, 'r+b') as f:
+                f.truncate(self.size * 2)
+                self.data = self.data + bytes(self.size)
+            self.source.copy(self.target)
+            self.assertEqual(os.path.getsize(self.target), self.size * 2)
+            self.assertSparseCopy()
+
+        def test_copy_dense_limiter(self):
+            # Dense files aren't copied by their extents.
+            with open(self.source, 'wb') as f:
+                f.write(b'dense' * 1024)
+            progress = CopyProgress()
+            limiter = RateLimiter(bytes_per_second=10**12)
+            with mock.patch('pathlib_abc._os._copy_sparse') as copy_sparse:
+                self.source.copy(self.target, progress=progress, limiter=limiter)
+            copy_sparse.assert_not_called()
+            self.assertEqual(progress.strategy, 'read_write')
+            with open(self.target, 'rb') as f:
+                self.assertEqual(f.read(), b'dense' * 1024)
+
+        def test_copy_sparse_limiter_strategy(self):
+            progress = CopyProgress()
+            limiter = RateLimiter(bytes_per_second=10**12)
+            self.source.copy(self.target, progress=progress, limiter=limiter)
+            self.assertEqual(progress.strategy, 'sparse')
+            self.assertSparseCopy()
+
+        def test_copy_sparse_to_memory(self):
+            target = MemoryPath('target')
+            self.source.copy(target)
+            self.assertEqual(target.read_bytes(), self.data)
+
+    class CopyJournalTest(unittest.TestCase):
+        def setUp(self):
+            tmpdir = tempfile.TemporaryDirectory()
+            self.addCleanup(tmpdir.cleanup)
+            self.path = os.path.join(tmpdir.name, 'journal')
+
+        def test_resume_after_truncated_line(self):
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write('["dir","a"]\n["fi')
+            journal = _journal.CopyJournal(self.path)
+            self.assertEqual(journal.created, {'a'})
+            journal.record('file', 'a/b', 1)
+            journal.close()
+            journal = _journal.CopyJournal(self.path)
+            self.assertEqual(journal.files, {'a/b': 1})
+            journal.record('file', 'a/c', 2)
+            journal.close()
+            journal = _journal.CopyJournal(self.path)
+            self.assertEqual(journal.files, {'a/b': 1, 'a/c': 2})
+            journal.close()
+
+
 if not is_pypi:
     from pathlib import Path
 
@@ -0,0 +1,185 @@
+"""
+Tests for pathlib_abc._glob
+"""
+
+import json
+import os
+import posixpath
+import tempfile
+import unittest
+from unittest import mock
+
+from .support import is_pypi
+from .support.lexical_path import LexicalPosixPath
+
+if is_pypi:
+    from pathlib_abc import (
+        compile_pattern_set, load_pattern_cache, pattern_cache_info, save_pattern_cache,
+        set_pattern_cache_size, warm_pattern_cache)
+    from pathlib_abc import _glob
+    from pathlib_abc._glob import _StringGlobber
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class PatternSetTest(unittest.TestCase):
+    patterns = [
+        'b.py', '*.py', 'a*/*.py', '/*.py', '/a/*.py', '**', '/**', '/a/**',
+        '**/*.py', '/**/*.py', '/a/**/*.py', '/a/b/**/*.py',
+        '/**/**/**/**/*.py', '**/a.py', 'c/**', '**/a', '**/a/b',
+        '**/a/b/c', '**/a/b/c.', '**/a/b/c./**', '/a/b/c.py/**',
+        '/**/a/b/c.py', '*', '**/*', '', '.', '?.py', '[ab]/*', '*.tar.gz',
+        'A/*.PY',
+    ]
+    paths = [
+        'b.py', 'a/b.py', '/a/b.py', 'a.py', 'b/py', '/a.py', 'b.py/c',
+        'b.pyc', 'b./py', 'ab/c.py', '/d/ab/c.py', '/dab/c.py', 'ab/c.py/d',
+        '/b.py', '/ab.py', '/a/b/c.py', 'a', 'c.py', 'a/b/c.py', '', '.', '/',
+        'foo', 'a/x.tar.gz', 'A/B.PY', 'a//b.py',
+    ]
+
+    def check(self, globber, paths, altsep=None):
+        match_set = globber.compile_set(self.patterns, altsep=altsep)
+        matches = [globber.compile(pat, altsep=altsep) for pat in self.patterns]
+        for path in paths:
+            with self.subTest(path=path):
+                expected = [idx for idx, match in enumerate(matches) if match(path)]
+                self.assertEqual(match_set(path), expected)
+
+    def test_case_sensitive(self):
+        self.check(_StringGlobber('/', True, recursive=True), self.paths)
+
+    def test_case_insensitive(self):
+        self.check(_StringGlobber('/', False, recursive=True), self.paths)
+
+    def test_altsep(self):
+        paths = self.paths + [path.replace('/', '\\') for path in self.paths]
+        self.check(_StringGlobber('/', False, recursive=True), paths, altsep='\\')
+
+    def test_empty(self):
+        match_set = _StringGlobber('/', True, recursive=True).compile_set([])
+        self.assertEqual(match_set('a/b'), [])
+
+    def test_char_class_matches_sep(self):
+        # Negated and ranged character classes can match a separator.
+        patterns = ['x[!a]y', '[!a]*', 'x[+-0]y', 'x[^a]y', 'x[ab]y', '*/y']
+        paths = ['x/y', '/', 'xby', 'x^y', 'a/y', 'xay']
+        for case_sensitive in (True, False):
+            globber = _StringGlobber('/', case_sensitive, recursive=True)
+            match_set = globber.compile_set(patterns)
+            matches = [globber.compile(pat) for pat in patterns]
+            for path in paths:
+                with self.subTest(path=path, case_sensitive=case_sensitive):
+                    expected = [idx for idx, match in enumerate(matches) if match(path)]
+                    self.assertEqual(match_set(path), expected)
+        self.assertEqual(match_set('x/y'), [0, 2, 5])
+
+    def test_case_insensitive_non_ascii(self):
+        # The re module folds some characters differently from str.lower().
+        patterns = ['İ', 'i', 's', 'ſ/*', 'K', 'k', '*.py', 'ß']
+        paths = ['i', 'İ', 'I', 'ſ', 's/x', 'S/x', 'K', 'k', 'ſ.PY', 'ss', 'ẞ']
+        globber = _StringGlobber('/', False, recursive=True)
+        match_set = globber.compile_set(patterns)
+        matches = [globber.compile(pat) for pat in patterns]
+        for path in paths:
+            with self.subTest(path=path):
+                expected = [idx for idx, match in enumerate(matches) if match(path)]
+                self.assertEqual(match_set(path), expected)
+        self.assertEqual(match_set('i'), [0, 1])
+
+    def test_case_insensitive_non_ascii_compiled_once(self):
+        # More patterns than the pattern cache holds.
+        patterns = [f'd{i}/*.x' for i in range(1000)]
+        globber = _StringGlobber('/', False, recursive=True)
+        match_set = globber.compile_set(patterns)
+        with mock.patch.object(_glob, '_compile_pattern') as compile_pattern:
+            self.assertEqual(match_set('D5/ß.X'), [5])
+            self.assertEqual(match_set('d7/é.x'), [7])
+        compile_pattern.assert_not_called()
+
+    def test_compile_pattern_set(self):
+        match = compile_pattern_set(['*.py', '**/b/*', 'A/*'], posixpath)
+        self.assertEqual(match('a/b/c.py'), [1])
+        self.assertEqual(match(LexicalPosixPath('b.py')), [0])
+        self.assertEqual(match('A/b.py'), [2])
+        match = compile_pattern_set(['A/*'], posixpath, case_sensitive=False)
+        self.assertEqual(match('a/b'), [0])
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class PatternCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.maxsizes = {name: info.maxsize
+                         for name, info in pattern_cache_info().items()}
+
+    def tearDown(self):
+        for name, maxsize in self.maxsizes.items():
+            set_pattern_cache_size(name, maxsize)
+
+    def test_info(self):
+        info = pattern_cache_info()
+        self.assertEqual(set(info), {'glob', 'fnmatch', 'escape'})
+        self.assertEqual(info['glob'].maxsize, 512)
+        self.assertEqual(info['fnmatch'].maxsize, 32768)
+        self.assertEqual(info['escape'].maxsize, 512)
+
+    def test_set_size(self):
+        set_pattern_cache_size('glob', 2)
+        info = pattern_cache_info()['glob']
+        self.assertEqual(info, (0, 0, 0, 2, 0))
+        p = LexicalPosixPath('a/b.py')
+        for pattern in ['a/*.py', '*/b.py', 'a/*.py', '**/*.py']:
+            p.full_match(pattern)
+        info = pattern_cache_info()['glob']
+        self.assertEqual(info, (1, 3, 1, 2, 2))
+
+    def test_set_size_unbounded(self):
+        set_pattern_cache_size('escape', None)
+        self.assertIsNone(pattern_cache_info()['escape'].maxsize)
+
+    def test_set_size_invalid(self):
+        self.assertRaises(ValueError, set_pattern_cache_size, 'foo', 10)
+
+    def test_warm(self):
+        set_pattern_cache_size('glob', 100)
+        patterns = ['*.py', 'a/**/*.py', 'a/b']
+        warm_pattern_cache(patterns, posixpath)
+        misses = pattern_cache_info()['glob'].misses
+        self.assertGreater(misses, 0)
+        p = LexicalPosixPath('a/b/c.py')
+        for pattern in patterns:
+            p.full_match(pattern)
+        self.assertEqual(pattern_cache_info()['glob'].misses, misses)
+
+    def test_save_load(self):
+        patterns = ['*.py', 'a/**/*.py', 'a/b', 'c/*/d']
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'patterns.json')
+            save_pattern_cache(filename, patterns, posixpath)
+            set_pattern_cache_size('glob', 512)
+            with mock.patch.dict(_glob._translations, clear=True):
+                self.assertEqual(load_pattern_cache(filename), 6)
+                with mock.patch.object(_glob, 'translate', side_effect=AssertionError):
+                    p = LexicalPosixPath('a/b/c.py')
+                    self.assertTrue(p.full_match('a/**/*.py'))
+                    self.assertFalse(p.full_match('c/*/d'))
+                    warm_pattern_cache(patterns, posixpath)
+                    # Different case sensitivity.
+                    self.assertRaises(AssertionError, warm_pattern_cache,
+                                      patterns, posixpath, case_sensitive=False)
+
+    def test_load_incompatible(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'patterns.json')
+            save_pattern_cache(filename, ['*.py'], posixpath)
+            with open(filename, encoding='utf-8') as f:
+                data = json.load(f)
+            data['format'] = -1
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            with mock.patch.dict(_glob._translations, clear=True):
+                self.assertEqual(load_pattern_cache(filename), 0)
+                self.assertEqual(_glob._translations, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
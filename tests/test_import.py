@@ -0,0 +1,59 @@
+"""
+Tests for the import time of pathlib_abc
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from .support import is_pypi
+
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_imported_modules(code):
+    """Run the given code in a fresh interpreter (without the site module),
+    and return the set of names of modules imported afterwards."""
+    code = (f'import sys; sys.path.insert(0, {root_dir!r})\n'
+            f'{code}\n'
+            f'print(*sys.modules)')
+    result = subprocess.run(
+        [sys.executable, '-S', '-c', code],
+        capture_output=True, text=True, encoding='utf-8', check=True)
+    return set(result.stdout.split())
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class ImportTest(unittest.TestCase):
+    lazy_modules = {'re', 'typing', 'pathlib_abc._glob', 'pathlib_abc._fnmatch',
+                    'pathlib_abc._protocols'}
+
+    def test_import(self):
+        modules = get_imported_modules('import pathlib_abc')
+        self.assertIn('pathlib_abc', modules)
+        self.assertFalse(self.lazy_modules & modules)
+
+    def test_import_joinable(self):
+        code = ('import pathlib_abc, posixpath\n'
+                'class P(pathlib_abc.JoinablePath):\n'
+                '    parser = posixpath\n'
+                '    def __init__(self, *args): self.args = args\n'
+                '    def __vfspath__(self): return posixpath.join(*self.args)\n'
+                '    def with_segments(self, *args): return P(*args)\n'
+                'P("a", "b.tar.gz").with_suffix(".xz").parent.parts')
+        modules = get_imported_modules(code)
+        self.assertFalse(self.lazy_modules & modules)
+
+    def test_import_lazy(self):
+        code = ('import pathlib_abc\n'
+                'pathlib_abc.PathInfo\n'
+                'pathlib_abc.pattern_cache_info')
+        modules = get_imported_modules(code)
+        self.assertIn('pathlib_abc._protocols', modules)
+        self.assertIn('pathlib_abc._glob', modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
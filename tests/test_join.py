@@ -359,6 +359,31 @@ class LexicalPathJoinTest(JoinTestBase, unittest.TestCase):
     cls = LexicalPath
 
 
+if is_pypi:
+    import pickle
+    import sys
+    from pathlib_abc import InternedPath, vfspath
+
+    class InternedPathJoinTest(JoinTestBase, unittest.TestCase):
+        cls = InternedPath
+
+        def test_interned(self):
+            P = self.cls
+            p = P('a/b', 'c')
+            q = P('a', 'b/c')
+            self.assertIs(vfspath(p), vfspath(q))
+            self.assertIs(vfspath(p), sys.intern('a/b/c'))
+            self.assertIs(vfspath(p.parent), vfspath(P('a/b/d').parent))
+            self.assertEqual(hash(p), hash(q))
+
+        def test_pickle(self):
+            p = self.cls('a/b')
+            q = pickle.loads(pickle.dumps(p))
+            self.assertEqual(p, q)
+            self.assertIs(vfspath(p), vfspath(q))
+            self.assertEqual(q.name, 'b')
+
+
 if not is_pypi:
     from pathlib import PurePath, Path
 
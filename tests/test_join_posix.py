@@ -36,6 +36,13 @@ class LexicalPosixPathJoinTest(JoinTestBase, unittest.TestCase):
     cls = LexicalPosixPath
 
 
+if is_pypi:
+    from pathlib_abc import InternedPath
+
+    class InternedPathJoinTest(JoinTestBase, unittest.TestCase):
+        cls = InternedPath
+
+
 if not is_pypi:
     from pathlib import PurePosixPath, PosixPath
 
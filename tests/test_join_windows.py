@@ -280,6 +280,18 @@ class LexicalWindowsPathJoinTest(JoinTestBase, unittest.TestCase):
     cls = LexicalWindowsPath
 
 
+if is_pypi:
+    import ntpath
+    from pathlib_abc import InternedPath
+
+    class InternedWindowsPath(InternedPath):
+        __slots__ = ()
+        parser = ntpath
+
+    class InternedWindowsPathJoinTest(JoinTestBase, unittest.TestCase):
+        cls = InternedWindowsPath
+
+
 if not is_pypi:
     from pathlib import PureWindowsPath, WindowsPath
 
@@ -0,0 +1,115 @@
+"""
+Tests for pathlib_abc.OverlayPath
+"""
+
+import pickle
+import unittest
+from unittest import mock
+
+from .support import is_pypi
+
+if is_pypi:
+    from pathlib_abc import MemoryPath, OverlayPath, vfspath
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class OverlayPathTest(unittest.TestCase):
+    def setUp(self):
+        self.base = base = MemoryPath()
+        (base / 'etc').mkdir()
+        (base / 'etc' / 'hosts').write_bytes(b'base hosts')
+        (base / 'etc' / 'passwd').write_bytes(b'base passwd')
+        (base / 'etc' / 'shadow').write_bytes(b'base shadow')
+        (base / 'opt').mkdir()
+        (base / 'opt' / 'old').write_bytes(b'old')
+        (base / 'var').mkdir()
+        (base / 'var' / 'log').write_bytes(b'log')
+        self.tenant = tenant = MemoryPath()
+        (tenant / 'etc').mkdir()
+        (tenant / 'etc' / 'hosts').write_bytes(b'tenant hosts')
+        (tenant / 'etc' / '.wh.shadow').write_bytes(b'')
+        (tenant / 'opt').mkdir()
+        (tenant / 'opt' / '.wh..wh..opq').write_bytes(b'')
+        (tenant / 'opt' / 'new').write_bytes(b'new')
+        (tenant / 'var').write_bytes(b'not a directory')
+        self.scratch = scratch = MemoryPath()
+        (scratch / 'etc').mkdir()
+        (scratch / 'etc' / 'shadow').write_bytes(b'scratch shadow')
+        (scratch / 'etc' / 'link').symlink_to('../opt/new')
+        self.root = OverlayPath(layers=[scratch, tenant, base])
+
+    def listdir(self, path):
+        return sorted(child.name for child in path.iterdir())
+
+    def test_listdir(self):
+        p = self.root
+        self.assertEqual(self.listdir(p), ['etc', 'opt', 'var'])
+        self.assertEqual(self.listdir(p / 'etc'), ['hosts', 'link', 'passwd', 'shadow'])
+        self.assertEqual(self.listdir(p / 'opt'), ['new'])
+        self.assertRaises(NotADirectoryError, (p / 'var').iterdir)
+
+    def test_listdir_file_between_dirs(self):
+        # A file in a middle layer hides directories beneath it.
+        upper, middle, lower = MemoryPath(), MemoryPath(), MemoryPath()
+        (upper / 'd').mkdir()
+        (upper / 'd' / 'u').write_bytes(b'u')
+        (middle / 'd').write_bytes(b'not a directory')
+        (lower / 'd').mkdir()
+        (lower / 'd' / 'secret').write_bytes(b'secret')
+        p = OverlayPath(layers=[upper, middle, lower])
+        self.assertEqual(self.listdir(p / 'd'), ['u'])
+        self.assertRaises(FileNotFoundError, (p / 'd' / 'secret').read_bytes)
+
+    def test_read(self):
+        p = self.root / 'etc'
+        self.assertEqual((p / 'hosts').read_bytes(), b'tenant hosts')
+        self.assertEqual((p / 'passwd').read_bytes(), b'base passwd')
+        self.assertEqual((p / 'shadow').read_bytes(), b'scratch shadow')
+        self.assertEqual((p / 'link').read_bytes(), b'new')
+        self.assertEqual((self.root / 'var').read_bytes(), b'not a directory')
+        self.assertRaises(FileNotFoundError, (self.root / 'opt' / 'old').read_bytes)
+        self.assertRaises(FileNotFoundError, (self.root / 'var' / 'log').read_bytes)
+
+    def test_info(self):
+        p = self.root
+        self.assertTrue((p / 'etc').info.is_dir())
+        self.assertTrue((p / 'var').info.is_file())
+        self.assertFalse((p / 'opt' / 'old').info.exists())
+        self.assertFalse((p / 'etc' / '.wh.shadow').info.exists())
+        self.assertTrue((p / 'etc' / 'link').info.is_symlink())
+        self.assertTrue((p / 'etc' / 'link').info.is_file())
+        self.assertEqual(vfspath((p / 'etc' / 'link').readlink()), '../opt/new')
+
+    def test_glob(self):
+        self.assertEqual(sorted(map(vfspath, self.root.glob('*/*'))),
+                         ['etc/hosts', 'etc/link', 'etc/passwd', 'etc/shadow', 'opt/new'])
+
+    def test_listing_cache(self):
+        calls = []
+        iterdir = MemoryPath.iterdir
+
+        def counting_iterdir(path):
+            calls.append(vfspath(path))
+            return iterdir(path)
+
+        with mock.patch.object(MemoryPath, 'iterdir', counting_iterdir):
+            list(self.root.walk())
+            list(self.root.glob('**/*'))
+            (self.root / 'etc' / 'passwd').read_bytes()
+        self.assertEqual(sorted(calls), ['', '', '', 'etc', 'etc', 'etc', 'opt'])
+
+    def test_clear_cache(self):
+        list(self.root.iterdir())
+        (self.tenant / 'srv').mkdir()
+        self.assertFalse((self.root / 'srv').info.exists())
+        self.root.clear_cache()
+        self.assertTrue((self.root / 'srv').info.is_dir())
+
+    def test_pickle(self):
+        p = pickle.loads(pickle.dumps(self.root / 'etc'))
+        self.assertEqual((p / 'hosts').read_bytes(), b'tenant hosts')
+        self.assertEqual(len(p.layers), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
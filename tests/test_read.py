@@ -4,21 +4,31 @@ Tests for pathlib.types._ReadablePath
 
 import collections.abc
 import io
+import pickle
 import sys
 import unittest
+from unittest import mock
 
 from .support import is_pypi
 from .support.local_path import ReadableLocalPath, LocalPathGround
 from .support.zip_path import ReadableZipPath, ZipPathGround
 
 if is_pypi:
-    from pathlib_abc import PathInfo, _ReadablePath
+    from pathlib_abc import PathInfo, RateLimiter, _ReadablePath
     from pathlib_abc._os import vfsopen
 else:
     from pathlib.types import PathInfo, _ReadablePath
     from pathlib._os import vfsopen
 
 
+class RecordingLimiter:
+    def __init__(self):
+        self.calls = []
+
+    def acquire(self, nbytes=0, ops=1):
+        self.calls.append((nbytes, ops))
+
+
 class ReadTestBase:
     def setUp(self):
         self.root = self.ground.setup()
@@ -39,8 +49,18 @@ class ReadTestBase:
     def test_open_r_buffering_error(self):
         p = self.root / 'fileA'
         self.assertRaises(ValueError, vfsopen, p, 'r', buffering=0)
-        self.assertRaises(ValueError, vfsopen, p, 'r', buffering=1)
-        self.assertRaises(ValueError, vfsopen, p, 'r', buffering=1024)
+        if not is_pypi:
+            self.assertRaises(ValueError, vfsopen, p, 'r', buffering=1)
+            self.assertRaises(ValueError, vfsopen, p, 'r', buffering=1024)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_open_r_buffering(self):
+        p = self.root / 'fileA'
+        for buffering in (1, 1024):
+            with vfsopen(p, 'r', buffering=buffering, encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'this is file A\n')
+        with vfsopen(p, 'rb', buffering=0) as f:
+            self.assertEqual(f.read(), b'this is file A\n')
 
     @unittest.skipIf(
         not getattr(sys.flags, 'warn_default_encoding', 0),
@@ -93,6 +113,46 @@ class ReadTestBase:
         # Check that `\r\n` character replaces `\n`
         self.assertEqual(p.read_text(encoding='utf-8', newline='\r\n'), 'abcde\r\nfghlk\n\rmnopq')
 
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_iter_text(self):
+        p = self.root / 'abc'
+        self.ground.create_file(p, 'äbc\r\ndéf\n'.encode('utf-8'))
+        it = p.iter_text(encoding='utf-8', chunk_chars=3)
+        self.assertIsInstance(it, collections.abc.Iterator)
+        self.assertEqual(list(it), ['äbc', '\ndé', 'f\n'])
+        self.assertEqual(list(p.iter_text(encoding='utf-8', newline='')),
+                         ['äbc\r\ndéf\n'])
+        self.assertEqual(list(p.iter_text(encoding='ascii', errors='replace')),
+                         ['\ufffd\ufffdbc\nd\ufffd\ufffdf\n'])
+        self.assertRaises(ValueError, p.iter_text, encoding='utf-8', chunk_chars=0)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_iter_lines(self):
+        p = self.root / 'abc'
+        self.ground.create_file(p, b'abcde\r\nfghlk\n\rmnopq')
+        self.assertEqual(list(p.iter_lines(encoding='utf-8')),
+                         ['abcde\n', 'fghlk\n', '\n', 'mnopq'])
+        self.assertEqual(list(p.iter_lines(encoding='utf-8', newline='')),
+                         ['abcde\r\n', 'fghlk\n', '\r', 'mnopq'])
+        self.assertEqual(list(p.iter_lines(encoding='utf-8', newline='\n')),
+                         ['abcde\r\n', 'fghlk\n', '\rmnopq'])
+        self.assertEqual(list((self.root / 'fileA').iter_lines(encoding='utf-8')),
+                         ['this is file A\n'])
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    @unittest.skipIf(
+        not getattr(sys.flags, 'warn_default_encoding', 0),
+        "Requires warn_default_encoding",
+    )
+    def test_iter_text_encoding_warning(self):
+        p = self.root / 'fileA'
+        with self.assertWarns(EncodingWarning) as wc:
+            p.iter_text()
+        self.assertEqual(wc.filename, __file__)
+        with self.assertWarns(EncodingWarning) as wc:
+            p.iter_lines()
+        self.assertEqual(wc.filename, __file__)
+
     def test_iterdir(self):
         expected = ['dirA', 'dirB', 'dirC', 'fileA']
         if self.ground.can_symlink:
@@ -161,6 +221,129 @@ class ReadTestBase:
         with self.assertRaisesRegex(ValueError, 'Unacceptable pattern'):
             list(p.glob(''))
 
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_glob_max_open_dirs(self):
+        p = self.root
+        patterns = ["*", "*/*", "**", "**/", "**/file*", "dir*/**/", "*/dirD/**",
+                    "**/../*", "**/./*", "**/*/../*"]
+        for pattern in patterns:
+            expected = set(p.glob(pattern))
+            for max_open_dirs in (1, 2, 64):
+                with self.subTest(pattern=pattern, max_open_dirs=max_open_dirs):
+                    it = p.glob(pattern, max_open_dirs=max_open_dirs)
+                    self.assertIsInstance(it, collections.abc.Iterator)
+                    self.assertEqual(set(it), expected)
+
+    def patch_iterdir(self):
+        """Patch iterdir() to count the directory iterators open at once."""
+        cls = type(self.root)
+        iterdir = cls.iterdir
+        counts = {'open': 0, 'max': 0}
+
+        def counting_iterdir(path):
+            counts['open'] += 1
+            counts['max'] = max(counts['max'], counts['open'])
+            try:
+                yield from iterdir(path)
+            finally:
+                counts['open'] -= 1
+
+        return mock.patch.object(cls, 'iterdir', counting_iterdir), counts
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_glob_max_open_dirs_bound(self):
+        patterns = ["*", "**", "**/", "**/file*", "dir*/**/", "*/dirD/**",
+                    "**/../*", "**/./*", "**/*/../*"]
+        for pattern in patterns:
+            for max_open_dirs in (1, 2):
+                with self.subTest(pattern=pattern, max_open_dirs=max_open_dirs):
+                    patcher, counts = self.patch_iterdir()
+                    with patcher:
+                        for path in self.root.glob(pattern, max_open_dirs=max_open_dirs):
+                            self.assertLessEqual(counts['open'], max_open_dirs)
+                    self.assertLessEqual(counts['max'], max_open_dirs)
+                    self.assertEqual(counts['open'], 0)
+        # Without a tight bound, the walk holds nested directories open.
+        patcher, counts = self.patch_iterdir()
+        with patcher:
+            list(self.root.glob("**", max_open_dirs=64))
+        self.assertGreater(counts['max'], 2)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_glob_max_open_dirs_close(self):
+        patcher, counts = self.patch_iterdir()
+        with patcher:
+            it = self.root.glob("**", max_open_dirs=4)
+            next(it)
+            next(it)
+            self.assertGreater(counts['open'], 0)
+            it.close()
+            self.assertEqual(counts['open'], 0)
+            self.assertRaises(StopIteration, next, it)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_glob_sort(self):
+        if not self.ground.can_symlink:
+            self.skipTest("requires symlinks")
+
+        p = self.root
+        def check(pattern, expected):
+            expected = [p.joinpath(name) for name in expected]
+            actual = list(p.glob(pattern, sort=True))
+            self.assertEqual(actual, expected)
+            actual = list(p.glob(pattern, sort=True, max_open_dirs=1))
+            self.assertEqual(actual, expected)
+
+        check("*", ["brokenLink", "brokenLinkLoop", "dirA", "dirB", "dirC",
+                    "fileA", "linkA", "linkB"])
+        check("*/file*", ["dirB/fileB", "dirC/fileC", "linkB/fileB"])
+        check("**/file*", ["dirA/linkC/fileB", "dirB/fileB", "dirC/dirD/fileD",
+                           "dirC/fileC", "fileA", "linkB/fileB"])
+        check("dir*/**/", ["dirA/", "dirA/linkC/", "dirB/", "dirC/", "dirC/dirD/"])
+        check("dirC/**", ["dirC/", "dirC/dirD", "dirC/dirD/fileD", "dirC/fileC",
+                          "dirC/novel.txt"])
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_read_bytes_limiter(self):
+        p = self.root / 'fileA'
+        limiter = RecordingLimiter()
+        self.assertEqual(p.read_bytes(limiter=limiter), b'this is file A\n')
+        self.assertEqual(sum(nbytes for nbytes, ops in limiter.calls), 15)
+        self.assertEqual(sum(ops for nbytes, ops in limiter.calls), 1)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_read_bytes_limiter_ops(self):
+        # Reading a file in several chunks is one operation.
+        p = self.root / 'big'
+        data = bytes(range(256)) * (3 * 4096 + 1)
+        self.ground.create_file(p, data)
+        sleeps = []
+        limiter = RateLimiter(bytes_per_second=10**12, ops_per_second=1)
+        limiter._sleep = sleeps.append
+        self.assertEqual(p.read_bytes(limiter=limiter), data)
+        self.assertEqual(sleeps, [])
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_walk_limiter(self):
+        limiter = RecordingLimiter()
+        self.assertEqual(len(list(self.root.walk(limiter=limiter))), 5)
+        self.assertEqual(limiter.calls, [(0, 1)] * 5)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_walk_sort(self):
+        expected = [
+            (self.root, ['dirA', 'dirB', 'dirC'],
+             ['brokenLink', 'brokenLinkLoop', 'fileA', 'linkA', 'linkB']
+             if self.ground.can_symlink else ['fileA']),
+            (self.root / 'dirA', [], ['linkC'] if self.ground.can_symlink else []),
+            (self.root / 'dirB', [], ['fileB']),
+            (self.root / 'dirC', ['dirD'], ['fileC', 'novel.txt']),
+            (self.root / 'dirC' / 'dirD', [], ['fileD']),
+        ]
+        self.assertEqual(list(self.root.walk(sort=True)), expected)
+        expected = [expected[i] for i in (1, 2, 4, 3, 0)]
+        self.assertEqual(list(self.root.walk(top_down=False, sort=True)), expected)
+
     def test_walk_top_down(self):
         it = self.root.walk()
 
@@ -338,6 +521,85 @@ class LocalPathReadTest(ReadTestBase, unittest.TestCase):
     ground = LocalPathGround(ReadableLocalPath)
 
 
+if is_pypi:
+    from pathlib_abc import MemoryPath, OverlayPath, TarPath, ZipPath
+    from .support.memory_path import MemoryPathGround
+    from .support.overlay_path import OverlayPathGround
+    from .support.tar_path import TarPathGround
+
+    class IndexedZipPathReadTest(ReadTestBase, unittest.TestCase):
+        ground = ZipPathGround(ZipPath)
+
+    class TarPathReadTest(ReadTestBase, unittest.TestCase):
+        ground = TarPathGround(TarPath)
+
+    class GzipTarPathReadTest(ReadTestBase, unittest.TestCase):
+        ground = TarPathGround(TarPath, compress=True)
+
+    class OverlayPathReadTest(ReadTestBase, unittest.TestCase):
+        ground = OverlayPathGround(OverlayPath)
+
+    class MemoryPathReadTest(ReadTestBase, unittest.TestCase):
+        ground = MemoryPathGround(MemoryPath)
+
+        def test_open_r_raw_buffering(self):
+            class RawReader(io.RawIOBase):
+                def __init__(self, data):
+                    self.file = io.BytesIO(data)
+                    self.reads = 0
+
+                def readable(self):
+                    return True
+
+                def readinto(self, buf):
+                    self.reads += 1
+                    return self.file.readinto(buf)
+
+            class RawMemoryPath(MemoryPath):
+                __slots__ = ()
+
+                def __open_reader__(self):
+                    return RawReader(self.read_bytes())
+
+            p = RawMemoryPath(fs=self.root.fs) / 'big'
+            data = 'line\n' * 100000
+            p.write_bytes(data.encode('ascii'))
+            with vfsopen(p, 'r', buffering=256 * 1024, encoding='ascii') as f:
+                self.assertIsInstance(f.buffer, io.BufferedReader)
+                self.assertEqual(sum(1 for line in f), 100000)
+                self.assertLessEqual(f.buffer.raw.reads, 4)
+            with vfsopen(p, 'r', encoding='ascii') as f:
+                self.assertIsInstance(f.buffer, io.BufferedReader)
+                self.assertEqual(f.read(), data)
+            with vfsopen(p, 'rb', buffering=0) as f:
+                self.assertIsInstance(f, RawReader)
+            with self.assertWarns(RuntimeWarning):
+                vfsopen(p, 'rb', buffering=1).close()
+
+        def test_read_bytes_zero_copy(self):
+            p = self.root / 'fileA'
+            self.assertIs(p.read_bytes(), self.ground.readbytes(p))
+
+        def test_snapshot(self):
+            snapshot = self.root.snapshot()
+            (self.root / 'fileA').write_bytes(b'changed')
+            (self.root / 'dirC' / 'dirD' / 'fileE').write_bytes(b'new')
+            (snapshot / 'dirB' / 'newdir').mkdir()
+            self.assertEqual((snapshot / 'fileA').read_bytes(), b'this is file A\n')
+            self.assertFalse((snapshot / 'dirC' / 'dirD' / 'fileE').info.exists())
+            self.assertEqual((self.root / 'fileA').read_bytes(), b'changed')
+            self.assertFalse((self.root / 'dirB' / 'newdir').info.exists())
+            self.assertTrue((snapshot / 'dirB' / 'newdir').info.is_dir())
+            # Unmodified directories are shared.
+            self.assertIs(self.ground._get_dir(self.root / 'dirA'),
+                          self.ground._get_dir(snapshot / 'dirA'))
+
+        def test_pickle(self):
+            p = pickle.loads(pickle.dumps(self.root / 'dirC'))
+            self.assertEqual((p / 'fileC').read_bytes(), b'this is file C\n')
+            self.assertEqual(p.parent.joinpath('linkA').read_bytes(), b'this is file A\n')
+
+
 if not is_pypi:
     from pathlib import Path
 
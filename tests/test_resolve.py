@@ -0,0 +1,67 @@
+"""
+Tests for pathlib_abc._resolve
+"""
+
+import unittest
+
+from .support import is_pypi
+
+if is_pypi:
+    from pathlib_abc._resolve import chain_path, resolve_path
+
+
+def lookup(chain, name):
+    return chain[-1][1].get(name)
+
+
+def is_dir(entry):
+    return isinstance(entry, dict)
+
+
+def readlink(entry):
+    return entry if isinstance(entry, str) else None
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class ResolvePathTest(unittest.TestCase):
+    def setUp(self):
+        # Directories are dicts, files are bytes and symlinks are strings.
+        self.root = {
+            'a': {'b': b'file b', 'c': '../d', 'up': '..'},
+            'd': {'e': b'file e'},
+            'abs': '/a/b',
+            'loop': 'loop',
+        }
+
+    def resolve(self, path, follow_symlinks=True):
+        chain, name, entry = resolve_path(path, self.root, lookup, is_dir, readlink,
+                                          follow_symlinks)
+        if chain is None:
+            return None
+        return chain_path(chain, name), entry
+
+    def test_resolve(self):
+        self.assertEqual(self.resolve(''), ('', self.root))
+        self.assertEqual(self.resolve('a/b'), ('a/b', b'file b'))
+        self.assertEqual(self.resolve('a/./b'), ('a/b', b'file b'))
+        self.assertEqual(self.resolve('a/../a/b'), ('a/b', b'file b'))
+        self.assertEqual(self.resolve('../a/b'), ('a/b', b'file b'))
+        self.assertEqual(self.resolve('a/x'), ('a/x', None))
+        self.assertIsNone(self.resolve('a/x/y'))
+        self.assertIsNone(self.resolve('a/b/c'))
+
+    def test_resolve_symlinks(self):
+        self.assertEqual(self.resolve('a/c/e'), ('d/e', b'file e'))
+        self.assertEqual(self.resolve('a/c'), ('d', self.root['d']))
+        self.assertEqual(self.resolve('a/c', follow_symlinks=False), ('a/c', '../d'))
+        self.assertEqual(self.resolve('a/up/d/e'), ('d/e', b'file e'))
+        self.assertEqual(self.resolve('abs'), ('a/b', b'file b'))
+
+    def test_resolve_symlink_loop(self):
+        self.assertIsNone(self.resolve('loop'))
+        self.assertEqual(self.resolve('loop', follow_symlinks=False), ('loop', 'loop'))
+        self.assertIsNone(self.resolve('loop/x', follow_symlinks=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
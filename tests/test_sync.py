@@ -0,0 +1,181 @@
+"""
+Tests for ReadablePath.sync()
+"""
+
+import io
+import os
+import unittest
+import zipfile
+
+from .support import is_pypi
+from .support.local_path import ReadableLocalPath, WritableLocalPath, LocalPathGround
+from .support.zip_path import ZipPathGround
+
+if is_pypi:
+    from pathlib_abc import MemoryPath, ZipPath
+    from pathlib_abc._os import PathInfo
+    from .support.memory_path import MemoryPathGround
+
+    class LocalPath(ReadableLocalPath, WritableLocalPath):
+        __slots__ = ()
+
+        def __init__(self, *pathsegments):
+            super().__init__(*pathsegments)
+            self.info = PathInfo(os.fspath(self))
+
+        def unlink(self):
+            os.unlink(self)
+
+        def rmdir(self):
+            os.rmdir(self)
+
+
+class SyncTestBase:
+    def setUp(self):
+        self.source_root = self.source_ground.setup()
+        self.source_ground.create_hierarchy(self.source_root)
+        self.target_root = self.target_ground.setup(local_suffix="_target")
+        self.source = self.source_root / 'dirC'
+        self.target = self.target_root / 'syncC'
+
+    def tearDown(self):
+        self.source_ground.teardown(self.source_root)
+        self.target_ground.teardown(self.target_root)
+
+    def assertSynced(self):
+        target = self.target
+        self.assertEqual(self.target_ground.readtext(target / 'fileC'), 'this is file C\n')
+        self.assertEqual(self.target_ground.readtext(target / 'novel.txt'), 'this is a novel\n')
+        self.assertEqual(self.target_ground.readtext(target / 'dirD' / 'fileD'), 'this is file D\n')
+
+    def test_sync_new(self):
+        result = self.source.sync(self.target)
+        self.assertEqual(result, (3, 0, 0))
+        self.assertEqual(result.copied, 3)
+        self.assertSynced()
+
+    def test_sync_checksum(self):
+        self.source.sync(self.target)
+        result = self.source.sync(self.target, checksum=True)
+        self.assertEqual(result, (0, 3, 0))
+        self.target_ground.create_file(self.target / 'fileC', b'this is file c\n')
+        self.target_ground.create_file(self.target / 'novel.txt', b'short\n')
+        result = self.source.sync(self.target, checksum=True)
+        self.assertEqual(result, (2, 1, 0))
+        self.assertSynced()
+
+    def test_sync_delete(self):
+        self.source.sync(self.target)
+        self.target_ground.create_file(self.target / 'extra', b'extra\n')
+        self.target_ground.create_dir(self.target / 'dirE')
+        self.target_ground.create_file(self.target / 'dirE' / 'fileE', b'extra\n')
+        result = self.source.sync(self.target, checksum=True)
+        self.assertEqual(result, (0, 3, 0))
+        self.assertTrue(self.target_ground.isfile(self.target / 'extra'))
+        result = self.source.sync(self.target, checksum=True, delete=True)
+        self.assertEqual(result, (0, 3, 3))
+        self.assertFalse(self.target_ground.isfile(self.target / 'extra'))
+        self.assertFalse(self.target_ground.isdir(self.target / 'dirE'))
+        self.assertSynced()
+
+    def test_sync_replace_type(self):
+        self.target_ground.create_dir(self.target)
+        self.target_ground.create_dir(self.target / 'fileC')
+        self.target_ground.create_file(self.target / 'fileC' / 'x', b'x')
+        self.target_ground.create_file(self.target / 'dirD', b'not a directory\n')
+        result = self.source.sync(self.target)
+        self.assertEqual(result, (3, 0, 3))
+        self.assertSynced()
+
+    def test_sync_symlinks(self):
+        source = self.source_root / 'dirA'
+        target = self.target_root / 'syncA'
+        result = source.sync(target, follow_symlinks=False)
+        self.assertEqual(result, (1, 0, 0))
+        self.assertEqual(self.target_ground.readlink(target / 'linkC'), '../dirB')
+        result = source.sync(target, follow_symlinks=False)
+        self.assertEqual(result, (0, 1, 0))
+
+
+if is_pypi:
+    class ZipToMemoryPathSyncTest(SyncTestBase, unittest.TestCase):
+        source_ground = ZipPathGround(ZipPath)
+        target_ground = MemoryPathGround(MemoryPath)
+
+    class MemoryToMemoryPathSyncTest(SyncTestBase, unittest.TestCase):
+        source_ground = MemoryPathGround(MemoryPath)
+        target_ground = MemoryPathGround(MemoryPath)
+
+        def test_sync_no_times(self):
+            # Without modification times, files are always copied unless
+            # they're compared by checksum.
+            self.source.sync(self.target)
+            self.assertEqual(self.source.sync(self.target), (3, 0, 0))
+
+    class LocalToLocalPathSyncTest(SyncTestBase, unittest.TestCase):
+        source_ground = LocalPathGround(LocalPath)
+        target_ground = LocalPathGround(LocalPath)
+
+        def test_sync_times(self):
+            self.source.sync(self.target)
+            self.assertEqual(self.source.sync(self.target), (0, 3, 0))
+            # Make the source file newer than the target file.
+            source_file = self.source / 'fileC'
+            st = os.stat(self.target / 'fileC')
+            os.utime(source_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10 * 10**9))
+            self.assertEqual(self.source.sync(self.target), (1, 2, 0))
+            self.assertEqual(os.stat(self.target / 'fileC').st_mtime_ns,
+                             os.stat(source_file).st_mtime_ns)
+            self.assertSynced()
+
+        def test_sync_times_older(self):
+            # A same-size change with an older modification time, as when the
+            # source is restored from a backup, is still propagated.
+            self.source.sync(self.target)
+            source_file = self.source / 'fileC'
+            with open(source_file, 'wb') as f:
+                f.write(b'this is file c\n')
+            st = os.stat(source_file)
+            os.utime(source_file, ns=(st.st_atime_ns, st.st_mtime_ns - 3600 * 10**9))
+            self.assertEqual(self.source.sync(self.target), (1, 2, 0))
+            self.assertEqual(self.target_ground.readtext(self.target / 'fileC'),
+                             'this is file c\n')
+            self.assertEqual(self.source.sync(self.target), (0, 3, 0))
+
+        def test_sync_read_only(self):
+            source_file = self.source / 'fileC'
+            os.chmod(source_file, 0o444)
+            self.source.sync(self.target)
+            target_file = self.target / 'fileC'
+            self.assertEqual(os.stat(target_file).st_mode & 0o777, 0o444)
+            # The target file is replaced, not rewritten in place.
+            os.link(target_file, self.target_root / 'fileC.link')
+            os.chmod(source_file, 0o644)
+            with open(source_file, 'wb') as f:
+                f.write(b'this is file C, changed\n')
+            os.chmod(source_file, 0o444)
+            self.assertEqual(self.source.sync(self.target), (1, 2, 0))
+            self.assertEqual(self.target_ground.readtext(target_file),
+                             'this is file C, changed\n')
+            self.assertEqual(self.target_ground.readtext(self.target_root / 'fileC.link'),
+                             'this is file C\n')
+
+        def test_sync_times_tolerance(self):
+            self.source.sync(self.target)
+            target_file = self.target / 'fileC'
+            st = os.stat(target_file)
+            os.utime(target_file, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9 // 2))
+            self.assertEqual(self.source.sync(self.target), (0, 3, 0))
+
+    class SyncDeleteUnsupportedTest(unittest.TestCase):
+        def test_sync_delete_unsupported(self):
+            source = MemoryPath()
+            (source / 'fileA').write_bytes(b'this is file A\n')
+            with zipfile.ZipFile(io.BytesIO(), 'w') as zip_file:
+                target = ZipPath(zip_file=zip_file)
+                (target / 'extra').write_bytes(b'')
+                self.assertRaises(TypeError, source.sync, target, delete=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+"""
+Tests for pathlib_abc.TarPath
+"""
+
+import gzip
+import io
+import os
+import random
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+from .support import is_pypi
+
+if is_pypi:
+    from pathlib_abc import TarPath
+    from pathlib_abc import _tar
+
+
+def make_tar(members, compress=False):
+    """Return the bytes of a tar archive with the given (TarInfo, data)
+    members."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tar:
+        for tarinfo, data in members:
+            tarinfo.size = len(data)
+            tar.addfile(tarinfo, io.BytesIO(data))
+    data = buf.getvalue()
+    if compress:
+        data = gzip.compress(data)
+    return data
+
+
+def tar_info(name, type=tarfile.REGTYPE, linkname=''):
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.type = type
+    tarinfo.linkname = linkname
+    return tarinfo
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class TarPathIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.fileobj = io.BytesIO(make_tar([
+            (tar_info('./c.txt'), b'c'),
+            (tar_info('c/x'), b'x'),
+            (tar_info('c/y/z'), b'z'),
+            (tar_info('d/', tarfile.DIRTYPE), b''),
+            (tar_info('f/g/h'), b'h' * 10000),
+            (tar_info('f/link', tarfile.LNKTYPE, 'c/x'), b''),
+            (tar_info('fifo', tarfile.FIFOTYPE), b''),
+            (tar_info('../evil'), b'e'),
+            (tar_info('c/x'), b'x2'),
+        ]))
+        self.root = TarPath(fileobj=self.fileobj)
+
+    def listdir(self, path):
+        return sorted(child.name for child in path.iterdir())
+
+    def test_listdir(self):
+        p = self.root
+        self.assertEqual(self.listdir(p), ['c', 'c.txt', 'd', 'evil', 'f', 'fifo'])
+        self.assertEqual(self.listdir(p / 'c'), ['x', 'y'])
+        self.assertEqual(self.listdir(p / 'd'), [])
+        self.assertEqual(self.listdir(p / 'f'), ['g', 'link'])
+        self.assertRaises(NotADirectoryError, (p / 'c.txt').iterdir)
+        self.assertRaises(FileNotFoundError, (p / 'x').iterdir)
+
+    def test_implied_dirs(self):
+        p = self.root
+        self.assertTrue((p / 'f').info.is_dir())
+        self.assertTrue((p / 'f' / 'g').info.is_dir())
+        self.assertTrue((p / 'f' / 'g' / 'h').info.is_file())
+        self.assertFalse((p / 'f' / 'h').info.exists())
+
+    def test_read(self):
+        p = self.root
+        self.assertEqual((p / 'c.txt').read_bytes(), b'c')
+        self.assertEqual((p / 'f' / 'g' / 'h').read_bytes(), b'h' * 10000)
+        self.assertEqual((p / 'evil').read_bytes(), b'e')
+        with (p / 'f' / 'g' / 'h').__open_reader__() as f:
+            f.seek(9998)
+            self.assertEqual(f.read(), b'hh')
+
+    def test_duplicate(self):
+        self.assertEqual((self.root / 'c' / 'x').read_bytes(), b'x2')
+
+    def test_hardlink(self):
+        p = self.root / 'f' / 'link'
+        self.assertTrue(p.info.is_file())
+        self.assertFalse(p.info.is_symlink())
+        self.assertEqual(p.read_bytes(), b'x')
+
+    def test_other(self):
+        p = self.root / 'fifo'
+        self.assertTrue(p.info.exists())
+        self.assertFalse(p.info.is_file())
+        self.assertFalse(p.info.is_dir())
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class GzipTarPathTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.contents = {
+            f'file{i}': rng.randbytes(rng.randrange(20000))
+            for i in range(30)
+        }
+        members = [(tar_info(name), data) for name, data in self.contents.items()]
+        self.fileobj = io.BytesIO(make_tar(members, compress=True))
+        patcher = mock.patch.object(_tar, '_checkpoint_interval', 50000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_random_access(self):
+        root = TarPath(fileobj=self.fileobj)
+        names = list(self.contents)
+        random.Random(1).shuffle(names)
+        for name in names:
+            self.assertEqual((root / name).read_bytes(), self.contents[name])
+        source = _tar._get_index(self.fileobj).source
+        self.assertGreater(len(source.checkpoints), 3)
+        self.assertEqual(source.offsets, sorted(source.offsets))
+
+    def test_seek(self):
+        root = TarPath(fileobj=self.fileobj)
+        data = self.contents['file20']
+        with (root / 'file20').__open_reader__() as f:
+            f.seek(len(data) // 2)
+            self.assertEqual(f.read(), data[len(data) // 2:])
+            f.seek(10)
+            self.assertEqual(f.read(10), data[10:20])
+
+    def test_multiple_members(self):
+        data = self.fileobj.getvalue()
+        raw = gzip.decompress(data)
+        # Split the archive into two gzip members, with trailing padding.
+        self.fileobj = io.BytesIO(gzip.compress(raw[:30000]) +
+                                  gzip.compress(raw[30000:]) + b'\0' * 10)
+        root = TarPath(fileobj=self.fileobj)
+        for name, data in self.contents.items():
+            self.assertEqual((root / name).read_bytes(), data)
+
+    def test_truncated(self):
+        data = self.fileobj.getvalue()
+        fileobj = io.BytesIO(data[:len(data) // 2])
+        with self.assertRaises((EOFError, tarfile.TarError)):
+            TarPath(fileobj=fileobj).iterdir()
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class TarPathFileTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.filename = os.path.join(tmpdir.name, 'test.tar.gz')
+        self.index_filename = os.path.join(tmpdir.name, 'test.tar.gz.idx')
+        with open(self.filename, 'wb') as f:
+            f.write(make_tar([(tar_info('a/b'), b'b'), (tar_info('a/c'), b'c')],
+                             compress=True))
+
+    def test_save_load_index(self):
+        with open(self.filename, 'rb') as f:
+            TarPath(fileobj=f).save_index(self.index_filename)
+        with open(self.filename, 'rb') as f:
+            p = TarPath('a', fileobj=f)
+            self.assertTrue(p.load_index(self.index_filename))
+            with mock.patch.object(_tar, '_build_index') as build_index:
+                self.assertEqual(sorted(p.name for p in p.iterdir()), ['b', 'c'])
+                self.assertEqual((p / 'c').read_bytes(), b'c')
+            build_index.assert_not_called()
+        with open(self.filename, 'ab') as f:
+            f.write(b'\0')
+        with open(self.filename, 'rb') as f:
+            p = TarPath(fileobj=f)
+            self.assertFalse(p.load_index(self.index_filename))
+
+    def test_load_index_other_archive(self):
+        # Tar archives are padded to 10240-byte records, so unrelated
+        # archives often have the same size.
+        data1 = make_tar([(tar_info('a'), b'abc'), (tar_info('b'), b'XYZ')])
+        data2 = make_tar([(tar_info('long_name'), b'XYZ\0\0'), (tar_info('a'), b'abc')])
+        self.assertEqual(len(data1), len(data2))
+        TarPath(fileobj=io.BytesIO(data1)).save_index(self.index_filename)
+        root = TarPath(fileobj=io.BytesIO(data2))
+        self.assertFalse(root.load_index(self.index_filename))
+        self.assertEqual((root / 'a').read_bytes(), b'abc')
+        # The same archive in another file object is accepted.
+        root = TarPath(fileobj=io.BytesIO(data1))
+        self.assertTrue(root.load_index(self.index_filename))
+        self.assertEqual((root / 'b').read_bytes(), b'XYZ')
+        # Members with the same offsets and sizes, but different names.
+        data3 = make_tar([(tar_info('c'), b'abc'), (tar_info('d'), b'XYZ')])
+        root = TarPath(fileobj=io.BytesIO(data3))
+        self.assertFalse(root.load_index(self.index_filename))
+
+    def test_load_index_long_names(self):
+        long_name = 'd/' + 'x' * 200
+        data = make_tar([(tar_info(long_name), b'long'), (tar_info('a'), b'a'),
+                         (tar_info('h', tarfile.LNKTYPE, long_name), b'')])
+        TarPath(fileobj=io.BytesIO(data)).save_index(self.index_filename)
+        root = TarPath(fileobj=io.BytesIO(data))
+        self.assertTrue(root.load_index(self.index_filename))
+        self.assertEqual((root / long_name).read_bytes(), b'long')
+        self.assertEqual((root / 'h').read_bytes(), b'long')
+
+
+if __name__ == "__main__":
+    unittest.main()
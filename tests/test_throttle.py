@@ -0,0 +1,91 @@
+"""
+Tests for pathlib_abc.RateLimiter
+"""
+
+import threading
+import unittest
+
+from .support import is_pypi
+
+if is_pypi:
+    from pathlib_abc import RateLimiter
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class RateLimiterTest(unittest.TestCase):
+    def make_limiter(self, *args, **kwargs):
+        limiter = RateLimiter(*args, **kwargs)
+        self.now = 0.0
+        self.sleeps = []
+
+        def sleep(delay):
+            self.sleeps.append(delay)
+            self.now += delay
+
+        limiter._clock = lambda: self.now
+        limiter._sleep = sleep
+        limiter._last_time = 0.0
+        return limiter
+
+    def test_burst(self):
+        limiter = self.make_limiter(bytes_per_second=1000)
+        limiter.acquire(600)
+        limiter.acquire(400)
+        self.assertEqual(self.sleeps, [])
+        limiter.acquire(500)
+        self.assertEqual(self.sleeps, [0.5])
+
+    def test_refill(self):
+        limiter = self.make_limiter(bytes_per_second=1000, burst=0.5)
+        limiter.acquire(500)
+        self.now += 10
+        # The bucket holds only half a second's worth of tokens.
+        limiter.acquire(1000)
+        self.assertEqual(self.sleeps, [0.5])
+
+    def test_debt(self):
+        limiter = self.make_limiter(bytes_per_second=1000)
+        limiter.acquire(3000)
+        self.assertEqual(self.sleeps, [2.0])
+        limiter.acquire(1000)
+        self.assertEqual(self.sleeps, [2.0, 1.0])
+
+    def test_ops(self):
+        limiter = self.make_limiter(ops_per_second=10)
+        for _ in range(10):
+            limiter.acquire(10**9)
+        self.assertEqual(self.sleeps, [])
+        limiter.acquire(ops=2)
+        self.assertEqual(self.sleeps, [0.2])
+
+    def test_both(self):
+        limiter = self.make_limiter(bytes_per_second=1000, ops_per_second=1)
+        limiter.acquire(1000)
+        limiter.acquire(1500)
+        self.assertEqual(self.sleeps, [1.5])
+
+    def test_unlimited(self):
+        limiter = self.make_limiter()
+        limiter.acquire(10**12, 10**6)
+        self.assertEqual(self.sleeps, [])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, RateLimiter, 0)
+        self.assertRaises(ValueError, RateLimiter, ops_per_second=-1)
+        self.assertRaises(ValueError, RateLimiter, 1000, burst=0)
+
+    def test_threads(self):
+        limiter = self.make_limiter(bytes_per_second=1000)
+        sleeps = []
+        limiter._sleep = sleeps.append
+        threads = [threading.Thread(target=limiter.acquire, args=(500,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The debt is shared, so each thread waits for those before it.
+        self.assertEqual(sorted(sleeps), [0.5, 1.0, 1.5, 2.0, 2.5, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for pathlib_abc.PathTrie
+"""
+
+import unittest
+
+from .support import is_pypi
+from .support.lexical_path import LexicalPosixPath, LexicalWindowsPath
+
+if is_pypi:
+    from pathlib_abc import PathTrie, vfspath
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class PathTrieTest(unittest.TestCase):
+    cls = LexicalPosixPath
+    paths = ['/a', '/a/b/c.py', '/a/b/d.txt', '/a/e.py', 'x/y.py', 'x/z/w.py']
+
+    def setUp(self):
+        P = self.cls
+        self.trie = PathTrie(P(path) for path in self.paths)
+
+    def assertPaths(self, paths, expected):
+        P = self.cls
+        self.assertEqual(sorted(map(vfspath, paths)), sorted(vfspath(P(p)) for p in expected))
+
+    def test_len_iter(self):
+        self.assertEqual(len(self.trie), 6)
+        self.assertPaths(self.trie, self.paths)
+        self.assertIn('PathTrie(', repr(self.trie))
+
+    def test_contains(self):
+        P = self.cls
+        self.assertIn(P('/a'), self.trie)
+        self.assertIn(P('x/y.py'), self.trie)
+        self.assertNotIn(P('/a/b'), self.trie)
+        self.assertNotIn(P('x'), self.trie)
+        self.assertNotIn(P('/x/y.py'), self.trie)
+        self.assertNotIn('/a', self.trie)
+
+    def test_add(self):
+        P = self.cls
+        p = P('/a/b')
+        self.trie.add(p)
+        self.trie.add(P('/a/b'))
+        self.assertEqual(len(self.trie), 7)
+        self.assertIn(p, self.trie)
+        self.assertRaises(TypeError, self.trie.add, '/a/b')
+
+    def test_discard(self):
+        P = self.cls
+        self.trie.discard(P('/a/b/c.py'))
+        self.trie.discard(P('/a/b'))
+        self.trie.discard(P('/nope'))
+        self.assertEqual(len(self.trie), 5)
+        self.assertNotIn(P('/a/b/c.py'), self.trie)
+        self.trie.discard(P('/a/b/d.txt'))
+        self.assertPaths(self.trie.children(P('/a')), ['/a/e.py'])
+        self.assertRaises(KeyError, self.trie.remove, P('/a/b/d.txt'))
+        self.trie.clear()
+        self.assertEqual(len(self.trie), 0)
+        self.assertEqual(list(self.trie), [])
+
+    def test_subtree(self):
+        P = self.cls
+        self.assertPaths(self.trie.subtree(P('/a/b')), ['/a/b/c.py', '/a/b/d.txt'])
+        self.assertPaths(self.trie.subtree(P('/a')),
+                         ['/a', '/a/b/c.py', '/a/b/d.txt', '/a/e.py'])
+        self.assertPaths(self.trie.subtree(P('/a/e.py')), ['/a/e.py'])
+        self.assertPaths(self.trie.subtree(P('/b')), [])
+
+    def test_children(self):
+        P = self.cls
+        self.assertPaths(self.trie.children(P('/a')), ['/a/b', '/a/e.py'])
+        self.assertPaths(self.trie.children(P('x')), ['x/y.py', 'x/z'])
+        self.assertPaths(self.trie.children(P('x/y.py')), [])
+        self.assertPaths(self.trie.children(P('/b')), [])
+
+    def test_longest_prefix(self):
+        P = self.cls
+        self.assertEqual(self.trie.longest_prefix(P('/a/b/c.py')), P('/a/b/c.py'))
+        self.assertEqual(self.trie.longest_prefix(P('/a/b/q')), P('/a'))
+        self.assertEqual(self.trie.longest_prefix(P('/a')), P('/a'))
+        self.assertIsNone(self.trie.longest_prefix(P('/b')))
+        self.assertIsNone(self.trie.longest_prefix(P('x/y')))
+
+    def test_glob(self):
+        P = self.cls
+        self.assertPaths(self.trie.glob('/a/**/*.py'), ['/a/b/c.py', '/a/e.py'])
+        self.assertPaths(self.trie.glob('**/*.py'), ['x/y.py', 'x/z/w.py'])
+        self.assertPaths(self.trie.glob('/*'), ['/a'])
+        self.assertPaths(self.trie.glob('/a/b'), [])
+        self.assertPaths(self.trie.glob('x/z/w.py'), ['x/z/w.py'])
+        self.assertPaths(self.trie.glob('x/*/'), [])
+        self.assertPaths(self.trie.glob('/a/b/*'), ['/a/b/c.py', '/a/b/d.txt'])
+        self.assertPaths(self.trie.glob(P('/a/*/*.txt')), ['/a/b/d.txt'])
+        self.assertPaths(self.trie.glob('/**'), ['/a', '/a/b/c.py', '/a/b/d.txt', '/a/e.py'])
+        self.assertRaises(ValueError, self.trie.glob, '')
+
+    def test_glob_mixed_anchors(self):
+        # Relative patterns don't match anchored paths.
+        self.assertPaths(self.trie.glob('*'), [])
+        self.assertPaths(self.trie.glob('*/*'), ['x/y.py'])
+        self.assertPaths(self.trie.glob('**'), ['x/y.py', 'x/z/w.py'])
+        self.assertPaths(self.trie.glob('**/*.txt'), [])
+        self.assertPaths(self.trie.glob('/**/*.txt'), ['/a/b/d.txt'])
+
+    def test_glob_empty(self):
+        self.assertEqual(list(PathTrie().glob('**/*')), [])
+
+    def test_glob_case_insensitive(self):
+        P = LexicalWindowsPath
+        trie = PathTrie(P(p) for p in ['C:/Foo/Bar.PY', 'C:/foo/baz.txt', 'qux'])
+        self.assertEqual(list(trie.glob('C:/foo/*.py')), [P('C:/Foo/Bar.PY')])
+        self.assertEqual(set(trie.glob('c:/FOO/*')),
+                         {P('C:/Foo/Bar.PY'), P('C:/foo/baz.txt')})
+        self.assertEqual(list(trie.glob('QUX')), [P('qux')])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,13 +13,15 @@ from .support.zip_path import WritableZipPath, ZipPathGround
 
 if is_pypi:
     from pathlib_abc import _WritablePath
-    from pathlib_abc._os import vfsopen
+    from pathlib_abc._os import _open_atomic_writer, vfsopen
 else:
     from pathlib.types import _WritablePath
     from pathlib._os import vfsopen
 
 
 class WriteTestBase:
+    can_write_atomic = True
+
     def setUp(self):
         self.root = self.ground.setup()
 
@@ -39,8 +41,21 @@ class WriteTestBase:
     def test_open_w_buffering_error(self):
         p = self.root / 'fileA'
         self.assertRaises(ValueError, vfsopen, p, 'w', buffering=0)
-        self.assertRaises(ValueError, vfsopen, p, 'w', buffering=1)
-        self.assertRaises(ValueError, vfsopen, p, 'w', buffering=1024)
+        if not is_pypi:
+            self.assertRaises(ValueError, vfsopen, p, 'w', buffering=1)
+            self.assertRaises(ValueError, vfsopen, p, 'w', buffering=1024)
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_open_w_buffering(self):
+        p = self.root / 'fileA'
+        with vfsopen(p, 'w', buffering=1024, encoding='utf-8') as f:
+            f.write('this is file A\n')
+        self.assertEqual(self.ground.readtext(p), 'this is file A\n')
+        p = self.root / 'fileB'
+        with vfsopen(p, 'w', buffering=1, encoding='utf-8') as f:
+            self.assertTrue(f.line_buffering)
+            f.write('this is file B\n')
+        self.assertEqual(self.ground.readtext(p), 'this is file B\n')
 
     @unittest.skipIf(
         not getattr(sys.flags, 'warn_default_encoding', 0),
@@ -113,6 +128,31 @@ class WriteTestBase:
                          b'abcde' + os_linesep_byte +
                          b'fghlk' + os_linesep_byte + b'\rmnopq')
 
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_write_bytes_atomic(self):
+        p = self.root / 'fileA'
+        if not self.can_write_atomic:
+            self.assertRaises(TypeError, p.write_bytes, b'abcdefg', atomic=True)
+            return
+        self.assertEqual(p.write_bytes(b'abcdefg', atomic=True), 7)
+        self.assertEqual(self.ground.readbytes(p), b'abcdefg')
+        p.write_bytes(bytearray(b'hij'), atomic=True)
+        self.assertEqual(self.ground.readbytes(p), b'hij')
+        self.assertRaises(TypeError, p.write_bytes, 'somestr', atomic=True)
+        self.assertEqual(self.ground.readbytes(p), b'hij')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_write_text_atomic(self):
+        p = self.root / 'fileA'
+        if not self.can_write_atomic:
+            self.skipTest('needs atomic writes')
+        p.write_text('abcde\nfghlk', encoding='utf-8', newline='\r\n', atomic=True)
+        self.assertEqual(self.ground.readbytes(p), b'abcde\r\nfghlk')
+        # Check that a failed write leaves the file untouched.
+        self.assertRaises(UnicodeEncodeError, p.write_text, 'äbc' * 10000,
+                          encoding='ascii', atomic=True)
+        self.assertEqual(self.ground.readbytes(p), b'abcde\r\nfghlk')
+
     def test_mkdir(self):
         p = self.root / 'newdirA'
         self.assertFalse(self.ground.isdir(p))
@@ -130,11 +170,97 @@ class WriteTestBase:
 
 class ZipPathWriteTest(WriteTestBase, unittest.TestCase):
     ground = ZipPathGround(WritableZipPath)
+    can_write_atomic = False
 
 
 class LocalPathWriteTest(WriteTestBase, unittest.TestCase):
     ground = LocalPathGround(WritableLocalPath)
 
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_write_bytes_atomic_mode(self):
+        p = self.root / 'fileA'
+        self.ground.create_file(p, b'abc')
+        os.chmod(p, 0o640)
+        p.write_bytes(b'defg', atomic=True)
+        self.assertEqual(os.stat(p).st_mode & 0o777, 0o640)
+        self.assertEqual(os.listdir(self.root), ['fileA'])
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_write_bytes_atomic_symlink(self):
+        p = self.root / 'fileA'
+        link = self.root / 'linkA'
+        self.ground.create_file(p, b'abc')
+        self.ground.create_symlink(link, 'fileA')
+        link.write_bytes(b'defg', atomic=True)
+        self.assertTrue(self.ground.islink(link))
+        self.assertEqual(self.ground.readbytes(p), b'defg')
+
+    @unittest.skipUnless(is_pypi, "requires pathlib_abc")
+    def test_write_atomic_error(self):
+        p = self.root / 'fileA'
+        self.ground.create_file(p, b'abc')
+        with self.assertRaises(ZeroDivisionError):
+            with _open_atomic_writer(p) as f:
+                f.write(b'partial')
+                1/0
+        self.assertEqual(self.ground.readbytes(p), b'abc')
+        self.assertEqual(os.listdir(self.root), ['fileA'])
+        self.assertRaises(IsADirectoryError, self.root.write_bytes, b'', atomic=True)
+        self.assertRaises(FileNotFoundError, self.root.joinpath('a', 'b').write_bytes, b'', atomic=True)
+
+
+if is_pypi:
+    from pathlib_abc import MemoryPath, ZipPath
+    from .support.memory_path import MemoryPathGround
+
+    class IndexedZipPathWriteTest(WriteTestBase, unittest.TestCase):
+        ground = ZipPathGround(ZipPath)
+        can_write_atomic = False
+
+    class MemoryPathWriteTest(WriteTestBase, unittest.TestCase):
+        ground = MemoryPathGround(MemoryPath)
+
+        def test_open_x(self):
+            p = self.root / 'fileA'
+            with vfsopen(p, 'xb') as f:
+                f.write(b'abc')
+            self.assertRaises(FileExistsError, vfsopen, p, 'xb')
+            with vfsopen(p, 'ab') as f:
+                f.write(b'def')
+            self.assertEqual(self.ground.readbytes(p), b'abcdef')
+
+        def test_open_w_dir(self):
+            p = self.root / 'dirA'
+            p.mkdir()
+            self.assertRaises(IsADirectoryError, vfsopen, p, 'wb')
+            self.assertRaises(IsADirectoryError, p.write_bytes, b'')
+            self.assertRaises(FileExistsError, p.mkdir)
+            self.assertRaises(FileNotFoundError, p.joinpath('a', 'b').mkdir)
+            self.assertRaises(FileNotFoundError, p.joinpath('a', 'b').write_bytes, b'')
+
+        def test_write_atomic_error(self):
+            p = self.root / 'fileA'
+            p.write_bytes(b'abc')
+            with self.assertRaises(ZeroDivisionError):
+                with vfsopen(p, 'wb') as f:
+                    f.write(b'partial')
+                    1/0
+            self.assertEqual(self.ground.readbytes(p), b'partial')
+            with self.assertRaises(ZeroDivisionError):
+                with _open_atomic_writer(p) as f:
+                    f.write(b'discarded')
+                    1/0
+            self.assertEqual(self.ground.readbytes(p), b'partial')
+            self.assertRaises(IsADirectoryError, self.root.write_text, '',
+                              encoding='utf-8', atomic=True)
+
+        def test_write_symlink(self):
+            (self.root / 'dirA').mkdir()
+            link = self.root / 'linkA'
+            link.symlink_to('dirA')
+            (link / 'fileA').write_bytes(b'abc')
+            self.assertEqual(self.ground.readbytes(self.root / 'dirA' / 'fileA'), b'abc')
+
 
 if not is_pypi:
     from pathlib import Path
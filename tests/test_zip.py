@@ -0,0 +1,135 @@
+"""
+Tests for pathlib_abc.ZipPath
+"""
+
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+from .support import is_pypi
+
+if is_pypi:
+    from pathlib_abc import ZipPath
+    from pathlib_abc import _zip
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class ZipPathIndexTest(unittest.TestCase):
+    names = ['c.txt', 'c/x', 'c/y/z', 'c/y.txt', 'c0', 'd/', 'd/e', 'f/g/h']
+
+    def setUp(self):
+        self.zip_file = zipfile.ZipFile(io.BytesIO(), 'w')
+        for name in self.names:
+            self.zip_file.writestr(name, b'')
+        self.root = ZipPath(zip_file=self.zip_file)
+
+    def tearDown(self):
+        self.zip_file.close()
+
+    def listdir(self, path):
+        return sorted(child.name for child in path.iterdir())
+
+    def test_listdir(self):
+        p = self.root
+        self.assertEqual(self.listdir(p), ['c', 'c.txt', 'c0', 'd', 'f'])
+        self.assertEqual(self.listdir(p / 'c'), ['x', 'y', 'y.txt'])
+        self.assertEqual(self.listdir(p / 'c' / 'y'), ['z'])
+        self.assertEqual(self.listdir(p / 'd'), ['e'])
+        self.assertEqual(self.listdir(p / 'f'), ['g'])
+        self.assertRaises(NotADirectoryError, (p / 'c.txt').iterdir)
+        self.assertRaises(FileNotFoundError, (p / 'x').iterdir)
+
+    def test_listdir_lazy(self):
+        list((self.root / 'c').iterdir())
+        index = _zip._indexes[self.zip_file]
+        self.assertEqual(set(index.listings), {'c'})
+
+    def test_implied_dirs(self):
+        p = self.root
+        self.assertTrue((p / 'f').info.is_dir())
+        self.assertTrue((p / 'f' / 'g').info.is_dir())
+        self.assertTrue((p / 'f' / 'g' / 'h').info.is_file())
+        self.assertFalse((p / 'f' / 'h').info.exists())
+        self.assertFalse((p / 'c.tx').info.exists())
+
+    def test_update(self):
+        p = self.root
+        self.assertEqual(self.listdir(p / 'c'), ['x', 'y', 'y.txt'])
+        (p / 'c' / 'w').write_bytes(b'w')
+        (p / 'c' / 'y' / 'v').mkdir()
+        self.assertEqual(self.listdir(p / 'c'), ['w', 'x', 'y', 'y.txt'])
+        self.assertEqual(self.listdir(p / 'c' / 'y'), ['v', 'z'])
+        self.assertEqual(self.listdir(p), ['c', 'c.txt', 'c0', 'd', 'f'])
+        self.assertEqual((p / 'c' / 'w').read_bytes(), b'w')
+        self.assertRaises(FileExistsError, (p / 'c' / 'y').mkdir)
+        self.assertRaises(FileNotFoundError, (p / 'x' / 'y').mkdir)
+
+
+@unittest.skipUnless(is_pypi, "requires pathlib_abc")
+class ZipPathFileTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.filename = os.path.join(tmpdir.name, 'test.zip')
+        self.index_filename = os.path.join(tmpdir.name, 'test.zip.idx')
+        with zipfile.ZipFile(self.filename, 'w') as zip_file:
+            zip_file.writestr('a/b', b'')
+
+    def test_save_load_index(self):
+        with zipfile.ZipFile(self.filename) as zip_file:
+            ZipPath(zip_file=zip_file).save_index(self.index_filename)
+        _zip._shared_indexes.clear()
+        with zipfile.ZipFile(self.filename) as zip_file:
+            p = ZipPath('a', zip_file=zip_file)
+            self.assertTrue(p.load_index(self.index_filename))
+            self.assertEqual(_zip._indexes[zip_file].names, ['a/b'])
+            self.assertEqual([p.name for p in p.iterdir()], ['b'])
+        with zipfile.ZipFile(self.filename, 'a') as zip_file:
+            p = ZipPath('a', zip_file=zip_file)
+            self.assertTrue(p.load_index(self.index_filename))
+            zip_file.writestr('a/c', b'')
+            self.assertEqual(sorted(p.name for p in p.iterdir()), ['b', 'c'])
+        with zipfile.ZipFile(self.filename) as zip_file:
+            p = ZipPath(zip_file=zip_file)
+            self.assertFalse(p.load_index(self.index_filename))
+
+    def test_load_index_other_archive(self):
+        # Archives with the same number of members and the same central
+        # directory offset, but different member names.
+        other_filename = os.path.join(os.path.dirname(self.filename), 'other.zip')
+        with zipfile.ZipFile(self.filename, 'w') as zip_file:
+            zip_file.writestr('aa/f', b'')
+            zip_file.writestr('bb/g', b'')
+        with zipfile.ZipFile(other_filename, 'w') as zip_file:
+            zip_file.writestr('cc/f', b'')
+            zip_file.writestr('dd/g', b'')
+        with zipfile.ZipFile(self.filename) as zip_file, \
+             zipfile.ZipFile(other_filename) as other_zip_file:
+            self.assertEqual(zip_file.start_dir, other_zip_file.start_dir)
+            ZipPath(zip_file=zip_file).save_index(self.index_filename)
+            root = ZipPath(zip_file=other_zip_file)
+            self.assertFalse(root.load_index(self.index_filename))
+            self.assertEqual(sorted(p.name for p in root.iterdir()), ['cc', 'dd'])
+            self.assertTrue((root / 'cc').info.is_dir())
+            self.assertFalse((root / 'aa').info.is_dir())
+
+    def test_shared_index(self):
+        filename = self.filename
+        with zipfile.ZipFile(filename) as zip_file1, \
+             zipfile.ZipFile(filename) as zip_file2:
+            p1 = ZipPath('a', zip_file=zip_file1)
+            p2 = ZipPath('a', zip_file=zip_file2)
+            self.assertEqual([p.name for p in p1.iterdir()], ['b'])
+            self.assertEqual([p.name for p in p2.iterdir()], ['b'])
+            self.assertIs(_zip._indexes[zip_file1], _zip._indexes[zip_file2])
+        with zipfile.ZipFile(filename, 'a') as zip_file:
+            zip_file.writestr('a/c', b'')
+        with zipfile.ZipFile(filename) as zip_file:
+            p = ZipPath('a', zip_file=zip_file)
+            self.assertEqual(sorted(p.name for p in p.iterdir()), ['b', 'c'])
+
+
+if __name__ == "__main__":
+    unittest.main()